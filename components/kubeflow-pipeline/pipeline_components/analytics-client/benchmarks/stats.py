@@ -0,0 +1,50 @@
+"""Scaling benchmark of the sufficient statistics kernel.
+
+Run with 'python -m benchmarks.stats' from the analytics-client directory.
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from flwr_analytics_client.stats import sufficient_statistics
+
+
+def _measure(rows: int, features: int, repeat: int) -> float:
+    data = np.random.default_rng(4242).normal(size=(rows, features))
+    return min(
+        timeit.repeat(
+            lambda: sufficient_statistics(data), number=1, repeat=repeat
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument(
+        "--features",
+        type=int,
+        nargs="+",
+        default=[10, 60, 250],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'features':>10} {'seconds':>10} {'Mrows/s':>10}")
+    for features in args.features:
+        for rows in args.rows:
+            seconds = _measure(rows, features, args.repeat)
+            print(
+                f"{rows:>10} {features:>10} {seconds:>10.4f}"
+                f" {rows / seconds / 1e6:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
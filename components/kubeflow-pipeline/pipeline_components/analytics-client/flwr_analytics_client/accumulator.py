@@ -0,0 +1,203 @@
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+import numpy as np
+from flwr.common import Config, Scalar
+from numpy.typing import NDArray
+
+from flwr_analytics_client.codec import decode_array
+
+# Result of an accumulator. Arrays are encoded as requested by the server.
+Values = Dict[str, Union[Scalar, NDArray[Any]]]
+
+# Config key of the encoded indices of the columns to compute, all columns
+# if missing.
+CONFIG_FEATURES = "features"
+
+# Fewest rows of a chunk worth dealing to a worker thread of its own.
+MIN_WORKER_ROWS = 4096
+
+
+class Accumulator(ABC):
+    @abstractmethod
+    def update(self, chunk: NDArray[Any]) -> None:
+        pass
+
+    @abstractmethod
+    def result(self) -> Values:
+        pass
+
+
+class MergeableAccumulator(Accumulator):
+    """Accumulator whose partial results can be merged.
+
+    Chunks can then be folded into several accumulators in parallel.
+    """
+
+    @abstractmethod
+    def merge(self, other: "MergeableAccumulator") -> None:
+        """Fold the chunks accumulated by 'other' into this accumulator."""
+        pass
+
+
+class ProjectedAccumulator(Accumulator):
+    """Fold only the selected 'columns' of every chunk into 'accumulator'.
+
+    One dimensional data is a single column.
+    """
+
+    def __init__(
+        self, accumulator: Accumulator, columns: NDArray[np.int64]
+    ) -> None:
+        self._accumulator = accumulator
+        self._columns = columns
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+
+        self._accumulator.update(chunk[:, self._columns])
+
+    def result(self) -> Values:
+        return self._accumulator.result()
+
+
+class MergeableProjectedAccumulator(
+    ProjectedAccumulator, MergeableAccumulator
+):
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, MergeableProjectedAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+
+        cast(MergeableAccumulator, self._accumulator).merge(
+            cast(MergeableAccumulator, other._accumulator)
+        )
+
+
+def projected(accumulator: Accumulator, config: Config) -> Accumulator:
+    """Restrict 'accumulator' to the columns selected by 'config'."""
+    features = config.get(CONFIG_FEATURES)
+    if features is None:
+        return accumulator
+
+    columns = decode_array(cast(bytes, features)).astype(np.int64)
+    if isinstance(accumulator, MergeableAccumulator):
+        return MergeableProjectedAccumulator(accumulator, columns)
+
+    return ProjectedAccumulator(accumulator, columns)
+
+
+def accumulate(
+    chunks: Iterable[NDArray[Any]],
+    new_accumulators: Callable[[], List[Accumulator]],
+    workers: int = 1,
+) -> List[Accumulator]:
+    """Fold all chunks into the accumulators made by 'new_accumulators'.
+
+    With several 'workers' and mergeable accumulators, every worker thread
+    folds chunks into its own accumulators, which are merged at the end.
+    NumPy releases the GIL in its kernels, so workers run on several cores.
+    Chunks are split into one piece per worker, as long as pieces keep at
+    least MIN_WORKER_ROWS rows, so that chunks smaller than the number of
+    workers times the chunk size are still folded in parallel. Pieces are
+    dealt to the workers in turn and merged in the same order, hence
+    results don't depend on the timing of the threads. Integer
+    counts equal those of a single worker, floating point sums only differ
+    by rounding.
+    """
+    accumulators = new_accumulators()
+    if workers <= 1 or not all(
+        isinstance(a, MergeableAccumulator) for a in accumulators
+    ):
+        for chunk in chunks:
+            for accumulator in accumulators:
+                accumulator.update(chunk)
+        return accumulators
+
+    partials = [accumulators] + [
+        new_accumulators() for _ in range(workers - 1)
+    ]
+    # Bounded queues keep at most two chunks per worker in memory.
+    queues: List["queue.Queue[Optional[NDArray[Any]]]"] = [
+        queue.Queue(maxsize=2) for _ in range(workers)
+    ]
+    errors: List[BaseException] = []
+
+    def work(
+        source: "queue.Queue[Optional[NDArray[Any]]]",
+        own: Sequence[Accumulator],
+    ) -> None:
+        while True:
+            chunk = source.get()
+            if chunk is None:
+                return
+            # After a failure, chunks are still drained to not block the
+            # reading thread.
+            if errors:
+                continue
+            try:
+                for accumulator in own:
+                    accumulator.update(chunk)
+            except BaseException as e:
+                errors.append(e)
+
+    threads = [
+        threading.Thread(target=work, args=(source, own), daemon=True)
+        for source, own in zip(queues, partials)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for i, chunk in enumerate(split_chunks(chunks, workers)):
+            if errors:
+                break
+            queues[i % workers].put(chunk)
+    finally:
+        for source in queues:
+            source.put(None)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+    for own in partials[1:]:
+        for accumulator, other in zip(accumulators, own):
+            cast(MergeableAccumulator, accumulator).merge(
+                cast(MergeableAccumulator, other)
+            )
+
+    return accumulators
+
+
+def split_chunks(
+    chunks: Iterable[NDArray[Any]], workers: int
+) -> Iterator[NDArray[Any]]:
+    """Split every chunk into up to 'workers' pieces of similar size.
+
+    Pieces are views of at least MIN_WORKER_ROWS rows of the chunk.
+    """
+    for chunk in chunks:
+        rows = chunk.shape[0]
+        pieces = min(workers, rows // MIN_WORKER_ROWS)
+        if pieces <= 1:
+            yield chunk
+            continue
+
+        size = -(-rows // pieces)
+        for start in range(0, rows, size):
+            yield chunk[start : start + size]
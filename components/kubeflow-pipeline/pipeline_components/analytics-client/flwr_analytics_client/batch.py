@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flwr.common import Config, Properties
+
+from flwr_analytics_client.accumulator import accumulate
+from flwr_analytics_client.provider import (
+    AnalyticsProvider,
+    DatasetProvider,
+    encode_values,
+)
+
+# Key of the request config listing the providers of a batched request.
+# Config and properties of every provider are prefixed with its name and
+# 'SEPARATOR', e.g. "histogram/nbins".
+PROVIDERS_KEY = "providers"
+SEPARATOR = "/"
+
+
+def provider_config(config: Config, name: str) -> Config:
+    """Return the config of provider 'name' in a batched request.
+
+    Keys without a provider prefix, such as the codec options, are shared
+    by all providers.
+    """
+    prefix = f"{name}{SEPARATOR}"
+    return {
+        **{
+            key: value
+            for key, value in config.items()
+            if SEPARATOR not in key and key != PROVIDERS_KEY
+        },
+        **{
+            key[len(prefix) :]: value
+            for key, value in config.items()
+            if key.startswith(prefix)
+        },
+    }
+
+
+def prefix_properties(name: str, properties: Properties) -> Properties:
+    return {
+        f"{name}{SEPARATOR}{key}": value for key, value in properties.items()
+    }
+
+
+def batch_properties(
+    requests: Sequence[Tuple[AnalyticsProvider, Config]]
+) -> List[Properties]:
+    """Compute the properties of several providers.
+
+    Dataset providers reading the same dataset share a single pass over it:
+    every chunk is folded into all of their accumulators before the next
+    chunk is read. Other providers are computed on their own.
+    """
+    results: List[Optional[Properties]] = [None] * len(requests)
+    passes: Dict[int, List[Tuple[int, DatasetProvider, Config]]] = {}
+    for i, (provider, config) in enumerate(requests):
+        if isinstance(provider, DatasetProvider):
+            passes.setdefault(id(provider.dataset), []).append(
+                (i, provider, config)
+            )
+
+    for shared in passes.values():
+        if len(shared) > 1:
+            for (i, _, _), properties in zip(shared, _shared_pass(shared)):
+                results[i] = properties
+
+    for i, (provider, config) in enumerate(requests):
+        if results[i] is None:
+            results[i] = provider.get_properties(config)
+
+    return [properties for properties in results if properties is not None]
+
+
+def _shared_pass(
+    shared: Sequence[Tuple[int, DatasetProvider, Config]]
+) -> List[Properties]:
+    _, first, _ = shared[0]
+    accumulators = accumulate(
+        first.dataset.chunks(),
+        lambda: [
+            provider.request_accumulator(config)
+            for _, provider, config in shared
+        ],
+        first.workers,
+    )
+
+    return [
+        encode_values(accumulator.result(), config)
+        for accumulator, (_, _, config) in zip(accumulators, shared)
+    ]
@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from flwr.common import Config, Properties
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+class ResultCache:
+    """LRU cache of provider results bounded by their size in bytes.
+
+    Entries are optionally persisted to 'directory', which allows a
+    restarted client to serve results computed by a previous instance.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[Union[str, "os.PathLike[str]"]] = None,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._directory = Path(directory) if directory is not None else None
+        self._entries: "OrderedDict[str, Tuple[Properties, int]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> Optional[Properties]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        properties = self._load(key)
+        if properties is not None:
+            self._insert(key, properties)
+
+        return properties
+
+    def put(self, key: str, properties: Properties) -> None:
+        self._insert(key, properties)
+        self._store(key, properties)
+
+    def _insert(self, key: str, properties: Properties) -> None:
+        # A previous result of the key is stale even if this one isn't kept.
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= previous[1]
+
+        size = properties_size(properties)
+        if size > self._max_bytes:
+            return
+
+        self._entries[key] = (properties, size)
+        self._size += size
+
+        while self._size > self._max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def _load(self, key: str) -> Optional[Properties]:
+        if self._directory is None:
+            return None
+
+        try:
+            with open(self._directory / f"{key}.pickle", "rb") as f:
+                properties: Properties = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            log.warning(f"Failed to load cached result {key}: {e}")
+            return None
+
+        return properties
+
+    def _store(self, key: str, properties: Properties) -> None:
+        if self._directory is None:
+            return
+
+        # Write to a temporary file first, so that concurrent readers never
+        # observe a partially written entry.
+        path = self._directory / f"{key}.pickle"
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(properties, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning(f"Failed to persist cached result {key}: {e}")
+
+
+def cache_key(provider: str, config: Config, fingerprint: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(provider.encode())
+    for name, value in sorted(config.items()):
+        digest.update(f"\0{name}={type(value).__name__}:{value!r}".encode())
+    digest.update(f"\0{fingerprint}".encode())
+
+    return digest.hexdigest()
+
+
+def properties_size(properties: Properties) -> int:
+    size = 0
+    for name, value in properties.items():
+        size += len(name)
+        if isinstance(value, (bytes, str)):
+            size += len(value)
+        else:
+            size += 8
+
+    return size
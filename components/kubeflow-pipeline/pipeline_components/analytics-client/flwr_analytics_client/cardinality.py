@@ -0,0 +1,117 @@
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from flwr.common import Config
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.hashing import hash_values
+from flwr_analytics_client.provider import DatasetProvider
+
+# Registers of a HyperLogLog sketch are 2^precision bytes, 4 KB per feature
+# by default, with a standard error of 1.04 / sqrt(2^precision), i.e. 1.6%.
+DEFAULT_PRECISION = 12
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+
+class CardinalityProvider(DatasetProvider):
+    """Number of distinct values of every feature.
+
+    Every feature gets a HyperLogLog sketch of 'precision' sent by the
+    server. Categorical values such as identifiers must be encoded as
+    numbers, the same value always with the same number on all clients.
+    """
+
+    @property
+    def name(self) -> str:
+        return "cardinality"
+
+    def accumulator(self, config: Config) -> Accumulator:
+        return HyperLogLogAccumulator(
+            precision=int(config.get("precision", DEFAULT_PRECISION))
+        )
+
+
+class HyperLogLogAccumulator(MergeableAccumulator):
+    """HyperLogLog registers of every feature, NaNs are left out.
+
+    The first 'precision' bits of the hash of a value select a register,
+    which keeps the maximal rank, i.e. the position of the first set bit,
+    of the remaining bits. Values are hashed the same on all clients, hence
+    sketches are merged by their element-wise maximum.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(
+                f"Precision must be between {MIN_PRECISION} and "
+                f"{MAX_PRECISION}, got {precision}"
+            )
+
+        self._precision = precision
+        self._registers: Optional[NDArray[np.uint8]] = None
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+
+        num_registers = 1 << self._precision
+        if self._registers is None:
+            self._registers = np.zeros(
+                (chunk.shape[1], num_registers), dtype=np.uint8
+            )
+
+        rows, features = np.nonzero(~np.isnan(chunk))
+        index, rank = hash_registers(chunk[rows, features], self._precision)
+        np.maximum.at(
+            self._registers.reshape(-1),
+            features * num_registers + index,
+            rank,
+        )
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, HyperLogLogAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+        if other._precision != self._precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        if other._registers is None:
+            return
+
+        if self._registers is None:
+            self._registers = other._registers.copy()
+        else:
+            np.maximum(self._registers, other._registers, out=self._registers)
+
+    def result(self) -> Values:
+        if self._registers is None:
+            raise ValueError("Cannot sketch an empty dataset")
+
+        return {"registers": self._registers}
+
+
+def hash_registers(
+    values: NDArray[np.float64], precision: int
+) -> Tuple[NDArray[np.int64], NDArray[np.uint8]]:
+    """Register index and rank of every value."""
+    z = hash_values(values)
+    index = (z >> np.uint64(64 - precision)).astype(np.int64)
+    remaining = z & np.uint64((1 << (64 - precision)) - 1)
+    rank = (64 - precision) - _bit_length(remaining) + 1
+
+    return index, rank.astype(np.uint8)
+
+
+def _bit_length(values: NDArray[np.uint64]) -> NDArray[np.int64]:
+    # Halves of 32 bits convert to floats exactly.
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+
+    lengths = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+    return lengths.astype(np.int64)
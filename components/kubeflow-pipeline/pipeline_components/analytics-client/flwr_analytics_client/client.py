@@ -1,8 +1,10 @@
-from typing import Iterable
+import logging
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 from flwr.client import Client
 from flwr.common import (
     Code,
+    Config,
     EvaluateIns,
     EvaluateRes,
     FitIns,
@@ -12,36 +14,113 @@ from flwr.common import (
     GetPropertiesIns,
     GetPropertiesRes,
     Parameters,
+    Properties,
     Status,
 )
 
+from flwr_analytics_client.batch import (
+    PROVIDERS_KEY,
+    batch_properties,
+    prefix_properties,
+    provider_config,
+)
+from flwr_analytics_client.cache import ResultCache, cache_key
+from flwr_analytics_client.incremental import CONFIG_WINDOW_SECONDS
 from flwr_analytics_client.provider import AnalyticsProvider
+from flwr_analytics_client.sample import is_sampled
+
+log = logging.getLogger(__name__)
 
 
 # TODO: remove 'type: ignore' once
 # https://github.com/adap/flower/pull/1377 has been merged
 class AnalyticsClient(Client):  # type: ignore
-    def __init__(self, providers: Iterable[AnalyticsProvider]) -> None:
+    def __init__(
+        self,
+        providers: Iterable[AnalyticsProvider],
+        cache: Optional[ResultCache] = None,
+        cache_private_results: bool = False,
+        window_providers: Iterable[AnalyticsProvider] = (),
+    ) -> None:
+        """Client serving the properties of analytics providers.
+
+        If a 'cache' is given, results of providers that fingerprint their
+        data are reused for identical requests. Differentially private
+        results are only cached if 'cache_private_results' is set: a cached
+        result is answered again instead of spending more privacy budget
+        on a fresh, independently noised one. Results of a random sample of
+        the rows are never cached, every request draws a new sample.
+
+        Requests over a time window are served by 'window_providers', which
+        keep their results in time buckets. Window requests to other
+        providers are answered with an error status.
+        """
         self._providers = {p.name: p for p in providers}
+        self._window_providers = {p.name: p for p in window_providers}
+        self._cache = cache
+        self._cache_private_results = cache_private_results
 
     def get_properties(self, ins: GetPropertiesIns) -> GetPropertiesRes:
-        provider_name = ins.config.get("provider")
-        if provider_name is None:
-            # TODO
-            return GetPropertiesRes(
-                status=Status(Code.GET_PARAMETERS_NOT_IMPLEMENTED, ""),
-                properties={},
+        # A batched request lists several providers, which are computed
+        # with shared passes over the data.
+        providers = ins.config.get(PROVIDERS_KEY)
+        if providers is not None:
+            names = str(providers).split(",")
+        else:
+            provider_name = ins.config.get("provider")
+            if provider_name is None:
+                # TODO
+                return GetPropertiesRes(
+                    status=Status(Code.GET_PARAMETERS_NOT_IMPLEMENTED, ""),
+                    properties={},
+                )
+            names = [str(provider_name)]
+
+        requests: List[Tuple[AnalyticsProvider, Config]] = []
+        for name in names:
+            config = (
+                provider_config(ins.config, name)
+                if providers is not None
+                else ins.config
             )
+            if CONFIG_WINDOW_SECONDS in config:
+                provider = self._window_providers.get(name)
+                if provider is None:
+                    return GetPropertiesRes(
+                        status=Status(
+                            Code.GET_PROPERTIES_NOT_IMPLEMENTED,
+                            f"{name} isn't kept in time buckets",
+                        ),
+                        properties={},
+                    )
+            else:
+                provider = self._providers.get(name)
+            if provider is None:
+                # TODO
+                return GetPropertiesRes(
+                    status=Status(Code.GET_PARAMETERS_NOT_IMPLEMENTED, ""),
+                    properties={},
+                )
+
+            requests.append((provider, config))
 
-        provider = self._providers.get(str(provider_name))
-        if provider is None:
-            # TODO
+        try:
+            results = self._cached_properties(requests)
+        except (TypeError, ValueError) as e:
+            # Requests the providers can't serve, e.g. buckets which aren't
+            # made of the buckets kept, are dropped by the server.
+            log.warning(f"Failed to serve {', '.join(names)}: {e}")
             return GetPropertiesRes(
-                status=Status(Code.GET_PARAMETERS_NOT_IMPLEMENTED, ""),
+                status=Status(Code.GET_PROPERTIES_NOT_IMPLEMENTED, str(e)),
                 properties={},
             )
 
-        properties = provider.get_properties(ins.config)
+        if providers is not None:
+            properties: Properties = {}
+            for (provider, _), result in zip(requests, results):
+                properties.update(prefix_properties(provider.name, result))
+        else:
+            properties = results[0]
 
         res = GetPropertiesRes(
             status=Status(Code.OK, "OK"),
@@ -50,6 +129,50 @@ class AnalyticsClient(Client):  # type: ignore
 
         return res
 
+    def _cached_properties(
+        self, requests: Sequence[Tuple[AnalyticsProvider, Config]]
+    ) -> List[Properties]:
+        keys = [self._cache_key(p, config) for p, config in requests]
+
+        results: List[Optional[Properties]] = []
+        for (provider, _), key in zip(requests, keys):
+            properties = None
+            if self._cache is not None and key is not None:
+                properties = self._cache.get(key)
+            if properties is not None:
+                log.debug(f"serving cached {provider.name} result {key}")
+            results.append(properties)
+
+        missing = [
+            i for i, properties in enumerate(results) if properties is None
+        ]
+        computed = batch_properties([requests[i] for i in missing])
+        for i, properties in zip(missing, computed):
+            key = keys[i]
+            if self._cache is not None and key is not None:
+                self._cache.put(key, properties)
+            results[i] = properties
+
+        return [properties for properties in results if properties is not None]
+
+    def _cache_key(
+        self, provider: AnalyticsProvider, config: Config
+    ) -> Optional[str]:
+        """Return the cache key of a request, None if it isn't cached."""
+        if self._cache is None or (
+            provider.is_private(config) and not self._cache_private_results
+        ):
+            return None
+        # Every sampled request draws a new sample.
+        if is_sampled(config):
+            return None
+
+        fingerprint = provider.fingerprint()
+        if fingerprint is None:
+            return None
+
+        return cache_key(provider.name, config, fingerprint)
+
     def get_parameters(self, ins: GetParametersIns) -> GetParametersRes:
         return GetParametersRes(
             status=Status(Code.OK, "OK"),
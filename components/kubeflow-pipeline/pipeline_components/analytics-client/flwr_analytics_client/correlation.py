@@ -1,35 +1,81 @@
-from typing import Any
+from typing import Any, Optional
 
-import numpy as np
-from flwr.common import Config, Properties
+from flwr.common import Config
 from numpy.typing import NDArray
 
-from flwr_analytics_client.provider import AnalyticsProvider, numpy_to_scalar
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.provider import DatasetProvider
+from flwr_analytics_client.stats import (
+    SufficientStatistics,
+    sufficient_statistics,
+    unpack_triangle,
+)
 
+# Config key through which the server asks for the packed upper triangle
+# of 'multiply_sums'. Without it, the dense matrix is sent.
+CONFIG_PACKED = "packed"
 
-class CorrelationProvider(AnalyticsProvider):
-    def __init__(self, data: NDArray[Any]) -> None:
-        self._data = data
 
+class CorrelationProvider(DatasetProvider):
     @property
     def name(self) -> str:
         return "correlation"
 
-    def get_properties(self, _: Config) -> Properties:
-        entries = self._data.shape[0]
-        features = self._data.shape[1]
-        sums = np.sum(self._data, axis=0)
-        variances = np.var(self._data, axis=0)
-        multiply_sums = np.zeros((features, features))
-        for i in range(0, entries):
-            for j in range(0, features):
-                for k in range(0, features):
-                    multiply_sums[j][k] += self._data[i][j] * self._data[i][k]
+    def accumulator(self, config: Config) -> Accumulator:
+        return CorrelationAccumulator(packed=bool(config.get(CONFIG_PACKED)))
+
+
+class RegressionProvider(CorrelationProvider):
+    """Statistics of the correlation, from which the server fits a regression.
+
+    Served under a name of its own, so that both can be batched.
+    """
+
+    @property
+    def name(self) -> str:
+        return "regression"
+
+
+class CorrelationAccumulator(MergeableAccumulator):
+    def __init__(self, packed: bool = False) -> None:
+        self._packed = packed
+        self._statistics: Optional[SufficientStatistics] = None
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        statistics = sufficient_statistics(chunk)
+        if self._statistics is not None:
+            statistics = self._statistics.merge(statistics)
+        self._statistics = statistics
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, CorrelationAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+        if other._statistics is None:
+            return
+
+        if self._statistics is None:
+            self._statistics = other._statistics
+        else:
+            self._statistics = self._statistics.merge(other._statistics)
+
+    def result(self) -> Values:
+        if self._statistics is None:
+            raise ValueError("Cannot compute correlation of an empty dataset")
+
+        multiply_sums = self._statistics.multiply_sums
+        if not self._packed:
+            multiply_sums = unpack_triangle(
+                multiply_sums, self._statistics.features
+            )
 
         return {
-            "features": features,
-            "entries": entries,
-            "sums": numpy_to_scalar(sums),
-            "multiply_sums": numpy_to_scalar(multiply_sums),
-            "variances": numpy_to_scalar(variances),
+            "features": self._statistics.features,
+            "entries": self._statistics.entries,
+            "sums": self._statistics.sums,
+            "multiply_sums": multiply_sums,
+            "variances": self._statistics.variances,
         }
@@ -1,10 +1,23 @@
-from typing import Any
+from typing import Iterable, Tuple
 
-import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike
+
+from flwr_analytics_client.dataset import DataSource
 
 
 # This stub will be overwritten with
 # client-specific implementations.
-def data() -> NDArray[Any]:
+# It may return the whole dataset as a single array or an iterable of
+# row chunks, in which case the data is streamed on every request.
+# Files can be mapped without copying them into memory with the helpers
+# in 'flwr_analytics_client.memmap'.
+def data() -> DataSource:
+    raise NotImplementedError
+
+
+# Clients answering requests over time windows, i.e. run with
+# 'ANALYTICS_BUCKET_SECONDS', also implement this stub. It yields the rows
+# arriving from now on, chunk by chunk, along with their timestamp in
+# seconds since the epoch, and may block until rows arrive.
+def stream() -> Iterable[Tuple[ArrayLike, float]]:
     raise NotImplementedError
@@ -0,0 +1,97 @@
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Rows per chunk when streaming over an in-memory array.
+DEFAULT_CHUNK_SIZE = 65536
+
+# Number of evenly spaced rows hashed into the fingerprint of an array.
+FINGERPRINT_ROWS = 64
+
+# What a client's 'data()' function may return: either the whole table or
+# an iterable of row chunks sharing the same columns.
+DataSource = Union[NDArray[Any], Iterable[NDArray[Any]]]
+
+
+class Dataset(ABC):
+    @abstractmethod
+    def chunks(self) -> Iterator[NDArray[Any]]:
+        """Iterate over the rows of the dataset in chunks.
+
+        Every call starts a new pass over the data.
+        """
+        pass
+
+    def fingerprint(self) -> Optional[str]:
+        """Cheap identifier of the content of the dataset.
+
+        Returns None if the content can't be identified without a full pass.
+        """
+        return None
+
+
+class ArrayDataset(Dataset):
+    def __init__(
+        self, data: NDArray[Any], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        self._data = data
+        self._chunk_size = chunk_size
+
+    def chunks(self) -> Iterator[NDArray[Any]]:
+        for start in range(0, self._data.shape[0], self._chunk_size):
+            yield self._data[start : start + self._chunk_size]
+
+    def fingerprint(self) -> Optional[str]:
+        # Hashing a sample of rows is not proof against in-place updates of
+        # single values, but is independent of the size of the array.
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self._data.shape}{self._data.dtype}".encode())
+
+        filename = getattr(self._data, "filename", None)
+        if filename is not None:
+            stat = os.stat(filename)
+            digest.update(
+                f"{filename}{stat.st_size}{stat.st_mtime_ns}".encode()
+            )
+
+        entries = self._data.shape[0]
+        if entries > 0:
+            rows = np.linspace(0, entries - 1, num=FINGERPRINT_ROWS, dtype=int)
+            digest.update(np.ascontiguousarray(self._data[rows]).tobytes())
+
+        return digest.hexdigest()
+
+
+class ChunkedDataset(Dataset):
+    def __init__(self, source: Callable[[], Iterable[NDArray[Any]]]) -> None:
+        self._source = source
+
+    def chunks(self) -> Iterator[NDArray[Any]]:
+        for chunk in self._source():
+            yield np.asarray(chunk)
+
+
+def as_dataset(data: Union[Dataset, NDArray[Any]]) -> Dataset:
+    if isinstance(data, Dataset):
+        return data
+
+    return ArrayDataset(data)
+
+
+def load_dataset(data: Callable[[], DataSource]) -> Dataset:
+    """Wrap the result of a client's 'data()' function in a dataset.
+
+    Iterators can only be consumed once, hence 'data()' is called again
+    for every pass over an iterator. Nothing is read before the first pass.
+    """
+    source = data()
+    if isinstance(source, np.ndarray):
+        return ArrayDataset(source)
+    if isinstance(source, Iterator):
+        return ChunkedDataset(data)
+
+    return ChunkedDataset(lambda: source)
@@ -1,7 +1,27 @@
+from flwr.common import Config
+
+from flwr_analytics_client.accumulator import Accumulator
 from flwr_analytics_client.fedhist import HistogramProvider
+from flwr_analytics_client.quantiles import QuantilesAccumulator
+from flwr_analytics_client.sketch import DEFAULT_K
+
+METHOD_HISTOGRAM = "histogram"
+METHOD_SKETCH = "sketch"
 
 
 class BoxPlotProvider(HistogramProvider):
+    """Provider of the quartiles of a box plot.
+
+    The server chooses between a quantile sketch per feature and a
+    histogram of all values. Servers not choosing get a histogram.
+    """
+
     @property
     def name(self) -> str:
         return "boxplot"
+
+    def accumulator(self, config: Config) -> Accumulator:
+        if config.get("method", METHOD_HISTOGRAM) == METHOD_SKETCH:
+            return QuantilesAccumulator(k=int(config.get("k", DEFAULT_K)))
+
+        return super().accumulator(config)
@@ -1,41 +1,227 @@
-from typing import Any, cast
+from typing import Any, Optional, Tuple, cast
 
 import numpy as np
 from diffprivlib.tools import histogram as histogram_dp
-from flwr.common import Config, Properties
+from flwr.common import Config
 from numpy.typing import NDArray
 
-from flwr_analytics_client.provider import AnalyticsProvider, numpy_to_scalar
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.codec import decode_array
+from flwr_analytics_client.provider import DatasetProvider
 
+# Number of values binned at once by per feature histograms, as in
+# 'np.histogram'.
+BLOCK_SIZE = 65536
 
-class HistogramProvider(AnalyticsProvider):
-    def __init__(self, data: NDArray[Any]) -> None:
-        self._data = data
 
+class HistogramProvider(DatasetProvider):
     @property
     def name(self) -> str:
         return "histogram"
 
-    def get_properties(self, config: Config) -> Properties:
-        nbins = config["nbins"]
-        hrange = float(config["hmin"]), float(config["hmax"])
-
+    def accumulator(self, config: Config) -> Accumulator:
         epsilon = config.get("epsilon")
-        if epsilon is not None:
-            counts, bins = histogram_dp(
-                self._data,
-                bins=nbins,
-                range=hrange,
-                epsilon=epsilon,
+
+        if config.get("per_feature"):
+            # Ranges are either shared by all features or given per feature
+            # as encoded arrays.
+            if "hmins" in config:
+                hmins = decode_array(cast(bytes, config["hmins"]))
+                hmaxs = decode_array(cast(bytes, config["hmaxs"]))
+            else:
+                hmins = np.array([float(config["hmin"])])
+                hmaxs = np.array([float(config["hmax"])])
+
+            return FeatureHistogramAccumulator(
+                nbins=int(config["nbins"]),
+                hmins=hmins,
+                hmaxs=hmaxs,
+                epsilon=float(epsilon) if epsilon is not None else None,
             )
-        else:
-            counts, bins = np.histogram(
-                self._data,
-                bins=nbins,
-                range=hrange,
+
+        return HistogramAccumulator(
+            nbins=int(config["nbins"]),
+            hrange=(float(config["hmin"]), float(config["hmax"])),
+            epsilon=float(epsilon) if epsilon is not None else None,
+        )
+
+
+class HistogramAccumulator(MergeableAccumulator):
+    def __init__(
+        self,
+        nbins: int,
+        hrange: Tuple[float, float],
+        epsilon: Optional[float] = None,
+    ) -> None:
+        self._nbins = nbins
+        self._hrange = hrange
+        self._epsilon = epsilon
+        self._bins = np.histogram_bin_edges([], bins=nbins, range=hrange)
+        self._counts = np.zeros(nbins, dtype=np.int64)
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        counts, _ = np.histogram(chunk, bins=self._nbins, range=self._hrange)
+        self._counts += counts
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, HistogramAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+
+        self._counts += other._counts
+
+    def result(self) -> Values:
+        counts = self._counts
+        if self._epsilon is not None:
+            counts = privatize_counts(counts, self._epsilon)
+
+        return {
+            "counts": counts,
+            "bins": self._bins,
+        }
+
+
+class FeatureHistogramAccumulator(MergeableAccumulator):
+    """Histogram of every feature, i.e. of every column of the data.
+
+    Ranges of a single feature apply to all features. Counts are a
+    (features x nbins) matrix, counted with one 'bincount' per block of rows.
+    """
+
+    def __init__(
+        self,
+        nbins: int,
+        hmins: NDArray[Any],
+        hmaxs: NDArray[Any],
+        epsilon: Optional[float] = None,
+    ) -> None:
+        self._nbins = nbins
+        self._hmins = np.asarray(hmins, dtype=np.float64)
+        self._hmaxs = np.asarray(hmaxs, dtype=np.float64)
+        self._epsilon = epsilon
+        self._counts: Optional[NDArray[np.int64]] = None
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+
+        features = chunk.shape[1]
+        if self._counts is None:
+            if len(self._hmins) == 1:
+                self._hmins = np.repeat(self._hmins, features)
+                self._hmaxs = np.repeat(self._hmaxs, features)
+            if len(self._hmins) != features:
+                raise ValueError(
+                    f"Expected ranges of {features} features, "
+                    f"got {len(self._hmins)}"
+                )
+            self._bins = feature_bin_edges(
+                self._nbins, self._hmins, self._hmaxs
             )
+            self._counts = np.zeros((features, self._nbins), dtype=np.int64)
+
+        # Blocks of rows keep the temporaries of 'bin_indices' in cache.
+        offsets = np.arange(features) * self._nbins
+        rows = max(1, BLOCK_SIZE // features)
+        for start in range(0, chunk.shape[0], rows):
+            indices, keep = bin_indices(
+                chunk[start : start + rows], self._bins
+            )
+            # Offset the bins of every feature to count all of them at once.
+            indices += offsets
+            counts = np.bincount(indices[keep], minlength=self._counts.size)
+            self._counts += counts.reshape(features, self._nbins)
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, FeatureHistogramAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+        if other._counts is None:
+            return
+
+        if self._counts is None:
+            self._bins = other._bins
+            self._counts = other._counts.copy()
+        else:
+            self._counts += other._counts
+
+    def result(self) -> Values:
+        if self._counts is None:
+            raise ValueError("Cannot compute histograms of an empty dataset")
+
+        counts = self._counts
+        if self._epsilon is not None:
+            counts = privatize_counts(counts, self._epsilon)
 
         return {
-            "counts": numpy_to_scalar(counts),
-            "bins": numpy_to_scalar(bins),
+            "counts": counts,
+            "bins": self._bins,
         }
+
+
+def feature_bin_edges(
+    nbins: int, hmins: NDArray[Any], hmaxs: NDArray[Any]
+) -> NDArray[Any]:
+    """Equal width bin edges of every feature, as 'np.histogram' uses them.
+
+    Like 'np.histogram', empty ranges are extended by 0.5 on both sides.
+    """
+    empty = hmins == hmaxs
+    hmins = np.where(empty, hmins - 0.5, hmins)
+    hmaxs = np.where(empty, hmaxs + 0.5, hmaxs)
+
+    return np.linspace(hmins, hmaxs, nbins + 1, axis=1)
+
+
+def bin_indices(
+    data: NDArray[Any], bins: NDArray[Any]
+) -> Tuple[NDArray[np.intp], NDArray[np.bool_]]:
+    """Bin of every value of a (rows x features) table.
+
+    'bins' holds the edges of every feature. Mirrors the equal width bins
+    fast path of 'np.histogram': the bin is computed from the value and
+    corrected by comparing against the edges. Values outside of the
+    range, as well as NaNs, aren't kept.
+    """
+    nbins = bins.shape[1] - 1
+    first, last = bins[:, 0], bins[:, -1]
+    values = np.asarray(data, dtype=np.float64)
+
+    keep = (values >= first) & (values <= last)
+    # Bins of values that aren't kept, e.g. NaNs, are meaningless.
+    with np.errstate(invalid="ignore"):
+        indices = ((values - first) * (nbins / (last - first))).astype(np.intp)
+    np.clip(indices, 0, nbins - 1, out=indices)
+
+    # The computed bin can be off by one due to rounding.
+    edges = bins.ravel()
+    flat = indices + np.arange(bins.shape[0]) * (nbins + 1)
+    decrement = values < np.take(edges, flat)
+    indices[decrement] -= 1
+    flat[decrement] -= 1
+    increment = (values >= np.take(edges, flat + 1)) & (indices != nbins - 1)
+    indices[increment] += 1
+
+    return indices, keep
+
+
+def privatize_counts(counts: NDArray[Any], epsilon: float) -> NDArray[Any]:
+    """Add geometric noise to exact histogram counts.
+
+    The counts accumulated over all chunks are fed to
+    'diffprivlib.tools.histogram' as the weights of one value per cell, so
+    that its mechanism and budget accounting apply to them as they are.
+    """
+    cells = counts.size
+    noisy_counts, _ = histogram_dp(
+        np.arange(cells),
+        epsilon=epsilon,
+        bins=cells,
+        range=(0, cells),
+        weights=counts.ravel(),
+    )
+
+    return cast(NDArray[Any], noisy_counts.reshape(counts.shape))
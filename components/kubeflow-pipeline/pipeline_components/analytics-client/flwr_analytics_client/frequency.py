@@ -0,0 +1,168 @@
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+from flwr.common import Config
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.hashing import bucket_values
+from flwr_analytics_client.provider import DatasetProvider
+
+# Count-min sketches of 'depth' rows of 'width' counters overestimate counts
+# by at most e / width of all values with a probability of 1 - exp(-depth).
+DEFAULT_WIDTH = 1024
+DEFAULT_DEPTH = 4
+# Misra-Gries summaries of k candidates hold every value making up more
+# than 1 / (k + 1) of all values.
+DEFAULT_CANDIDATES = 64
+
+# Values of a Misra-Gries summary and their counts.
+Summary = Tuple[NDArray[np.float64], NDArray[np.int64]]
+
+
+class FrequencyProvider(DatasetProvider):
+    """Counts of the most frequent values of every feature.
+
+    Every feature is summarized by a count-min sketch of its value counts
+    and a Misra-Gries summary of its most frequent values, both of a size
+    chosen by the server. Categorical values must be encoded as numbers,
+    the same value always with the same number on all clients.
+    """
+
+    @property
+    def name(self) -> str:
+        return "frequency"
+
+    def accumulator(self, config: Config) -> Accumulator:
+        return FrequencyAccumulator(
+            width=int(config.get("width", DEFAULT_WIDTH)),
+            depth=int(config.get("depth", DEFAULT_DEPTH)),
+            candidates=int(config.get("candidates", DEFAULT_CANDIDATES)),
+        )
+
+
+class FrequencyAccumulator(MergeableAccumulator):
+    """Count-min sketch and Misra-Gries summary of every feature.
+
+    Row d of a sketch counts the values by the bucket of their hash of seed
+    d. Summaries are merged by adding their counts and subtracting the
+    (k + 1)-th largest count from all of them (Agarwal et al., "Mergeable
+    Summaries", 2012), which keeps the error bound of a single summary.
+    NaNs are left out.
+    """
+
+    def __init__(
+        self,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        candidates: int = DEFAULT_CANDIDATES,
+    ) -> None:
+        if width < 1 or depth < 1 or candidates < 1:
+            raise ValueError("Sketches and summaries can't be empty")
+
+        self._width = width
+        self._depth = depth
+        self._candidates = candidates
+        self._sketch: Optional[NDArray[np.int64]] = None
+        self._summaries: List[Summary] = []
+        self._rows: Optional[NDArray[np.int64]] = None
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+
+        if self._sketch is None or self._rows is None:
+            self._init(chunk.shape[1])
+            assert self._sketch is not None and self._rows is not None
+
+        for f, column in enumerate(chunk.T):
+            values, counts = np.unique(
+                column[~np.isnan(column)], return_counts=True
+            )
+            for d in range(self._depth):
+                np.add.at(
+                    self._sketch[f, d],
+                    bucket_values(values, self._width, seed=d),
+                    counts,
+                )
+            self._rows[f] += counts.sum()
+            self._summaries[f] = self._fold(self._summaries[f], values, counts)
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, FrequencyAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+        if (other._width, other._depth, other._candidates) != (
+            self._width,
+            self._depth,
+            self._candidates,
+        ):
+            raise ValueError("Cannot merge sketches of different sizes")
+        if other._sketch is None or other._rows is None:
+            return
+
+        if self._sketch is None or self._rows is None:
+            self._init(other._sketch.shape[0])
+            assert self._sketch is not None and self._rows is not None
+
+        self._sketch += other._sketch
+        self._rows += other._rows
+        self._summaries = [
+            self._fold(summary, *other_summary)
+            for summary, other_summary in zip(
+                self._summaries, other._summaries
+            )
+        ]
+
+    def result(self) -> Values:
+        if self._sketch is None or self._rows is None:
+            raise ValueError("Cannot sketch an empty dataset")
+
+        # Summaries are padded with NaN values of count 0.
+        candidates = np.full((len(self._summaries), self._candidates), np.nan)
+        candidate_counts = np.zeros(candidates.shape, dtype=np.int64)
+        for f, (values, counts) in enumerate(self._summaries):
+            candidates[f, : len(values)] = values
+            candidate_counts[f, : len(counts)] = counts
+
+        return {
+            "sketch": self._sketch,
+            "rows": self._rows,
+            "candidates": candidates,
+            "candidate_counts": candidate_counts,
+        }
+
+    def _init(self, num_features: int) -> None:
+        self._sketch = np.zeros(
+            (num_features, self._depth, self._width), dtype=np.int64
+        )
+        self._rows = np.zeros(num_features, dtype=np.int64)
+        self._summaries = [
+            (np.empty(0), np.empty(0, dtype=np.int64))
+            for _ in range(num_features)
+        ]
+
+    def _fold(
+        self,
+        summary: Summary,
+        values: NDArray[np.float64],
+        counts: NDArray[np.int64],
+    ) -> Summary:
+        values, inverse = np.unique(
+            np.concatenate([summary[0], values]), return_inverse=True
+        )
+        counts = np.bincount(
+            inverse, weights=np.concatenate([summary[1], counts])
+        ).astype(np.int64)
+        if len(values) <= self._candidates:
+            return values, counts
+
+        # Only counts above the (k + 1)-th largest one are kept.
+        k = self._candidates
+        counts = counts - np.partition(counts, -k - 1)[-k - 1]
+        kept = counts > 0
+        return values[kept], counts[kept]
@@ -0,0 +1,39 @@
+"""Hashes of values that are the same on all clients and the server.
+
+Values are hashed by their float64 bits, hence an integer hashes like the
+same float, and -0.0 like 0.0. The hash is the SplitMix64 finalizer, with a
+'seed' for independent hash functions.
+
+This module is kept identical in the analytics client and server.
+"""
+
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# Increment of SplitMix64, the golden ratio.
+GAMMA = 0x9E3779B97F4A7C15
+
+
+def hash_values(values: ArrayLike, seed: int = 0) -> NDArray[np.uint64]:
+    """64 bit hash of every value."""
+    # Adding 0.0 turns -0.0 into 0.0.
+    bits = (np.asarray(values, dtype=np.float64) + 0.0).view(np.uint64)
+
+    # The additions and multiplications wrap around.
+    z = bits + np.uint64(((seed + 1) * GAMMA) % (1 << 64))
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    hashes: NDArray[np.uint64] = z ^ (z >> np.uint64(31))
+
+    return hashes
+
+
+def bucket_values(
+    values: ArrayLike, buckets: int, seed: int = 0
+) -> NDArray[np.int64]:
+    """Bucket in [0, buckets) of every value."""
+    index: NDArray[Any] = hash_values(values, seed) % np.uint64(buckets)
+
+    return index.astype(np.int64)
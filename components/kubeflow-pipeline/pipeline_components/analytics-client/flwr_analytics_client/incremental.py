@@ -0,0 +1,285 @@
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+from flwr.common import Config, Properties
+from numpy.typing import ArrayLike, NDArray
+
+from flwr_analytics_client.accumulator import MergeableAccumulator, accumulate
+from flwr_analytics_client.batch import SEPARATOR
+from flwr_analytics_client.cache import cache_key
+from flwr_analytics_client.codec import (
+    CONFIG_COMPRESSION,
+    CONFIG_FLOAT32,
+    CONFIG_VERSION,
+)
+from flwr_analytics_client.provider import (
+    AnalyticsProvider,
+    DatasetProvider,
+    encode_values,
+)
+
+# Config keys only changing how results are encoded, not what is computed.
+ENCODING_KEYS = (CONFIG_VERSION, CONFIG_COMPRESSION, CONFIG_FLOAT32)
+
+# Config keys of a request for the buckets of a time window, see
+# 'IncrementalProvider.get_properties'.
+CONFIG_WINDOW_SECONDS = "window_seconds"
+CONFIG_WINDOW_END = "window_end"
+CONFIG_BUCKET_SECONDS = "bucket_seconds"
+WINDOW_KEYS = (CONFIG_WINDOW_SECONDS, CONFIG_WINDOW_END, CONFIG_BUCKET_SECONDS)
+
+
+@dataclass
+class Window:
+    """Partial results of the rows appended within a window.
+
+    Windows of time buckets 'start' at a multiple of the bucket length.
+    The appended 'chunks' are kept to seed the partials of configs first
+    requested after them.
+    """
+
+    rows: int = 0
+    start: float = 0.0
+    partials: Dict[str, MergeableAccumulator] = field(default_factory=dict)
+    chunks: List[NDArray[Any]] = field(default_factory=list)
+
+
+class IncrementalProvider(AnalyticsProvider):
+    """Maintain the results of 'provider' while rows keep arriving.
+
+    New rows are folded with 'append' into a running accumulator per
+    distinct request config. A request then only merges these partials,
+    which costs O(features^2) regardless of the length of the history. The
+    first request of a config is answered with a single pass over the
+    dataset of 'provider', which must hold the rows appended so far.
+
+    With 'window_rows', partials are kept per window of that many appended
+    rows, in a ring of the last 'max_windows' windows, and requests only
+    cover the rows of these windows. With 'bucket_seconds', windows are
+    time buckets instead, aligned to multiples of their length, and rows
+    are appended with their timestamp. Rows preceding the first window,
+    i.e. the dataset of 'provider', are left out of windowed results. The
+    rows of the windows in the ring are kept, hence configs first requested
+    later on are seeded from them and cover all windows of the ring.
+    """
+
+    def __init__(
+        self,
+        provider: DatasetProvider,
+        window_rows: Optional[int] = None,
+        max_windows: int = 1,
+        bucket_seconds: Optional[float] = None,
+    ) -> None:
+        if window_rows is not None and window_rows < 1:
+            raise ValueError("Windows must hold at least one row")
+        if bucket_seconds is not None and bucket_seconds <= 0:
+            raise ValueError("Buckets must have a positive length")
+        if window_rows is not None and bucket_seconds is not None:
+            raise ValueError("Windows are either rows or time buckets")
+
+        self._provider = provider
+        self._window_rows = window_rows
+        self._bucket_seconds = bucket_seconds
+        self._configs: Dict[str, Config] = {}
+        self._windows: Deque[Window] = deque(
+            [Window()], maxlen=max_windows if self._windowed else 1
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def _windowed(self) -> bool:
+        return (
+            self._window_rows is not None or self._bucket_seconds is not None
+        )
+
+    @property
+    def name(self) -> str:
+        return self._provider.name
+
+    def is_private(self, config: Config) -> bool:
+        return self._provider.is_private(config)
+
+    def track(self, config: Config) -> None:
+        """Start maintaining the results of 'config'."""
+        key = _config_key(self.name, config)
+        with self._lock:
+            if key in self._configs:
+                return
+
+            # Seeding holds the lock, rows can't be appended meanwhile.
+            for window in self._windows:
+                [partial] = accumulate(
+                    window.chunks
+                    if self._windowed
+                    else self._provider.dataset.chunks(),
+                    lambda: [self._accumulator(config)],
+                    self._provider.workers,
+                )
+                window.partials[key] = _mergeable(partial)
+
+            self._configs[key] = config
+
+    def append(
+        self, rows: ArrayLike, timestamp: Optional[float] = None
+    ) -> None:
+        """Fold newly arrived rows into the partials of all configs.
+
+        With time buckets, the rows go to the bucket of 'timestamp', in
+        seconds since the epoch, by default the current time. Rows of
+        buckets that already dropped out of the ring are ignored.
+        """
+        rows = np.asarray(rows)
+        if self._bucket_seconds is not None:
+            self._append_bucket(
+                rows, time.time() if timestamp is None else timestamp
+            )
+            return
+
+        with self._lock:
+            start = 0
+            while start < rows.shape[0]:
+                window = self._windows[-1]
+                end = rows.shape[0]
+                if self._window_rows is not None:
+                    if window.rows == self._window_rows:
+                        window = self._open_window()
+                    end = min(end, start + self._window_rows - window.rows)
+
+                for partial in window.partials.values():
+                    partial.update(rows[start:end])
+                if self._windowed:
+                    # Callers may reuse the buffer of the rows.
+                    window.chunks.append(np.array(rows[start:end]))
+                window.rows += end - start
+                start = end
+
+    def get_properties(self, config: Config) -> Properties:
+        """Merge the partials of all windows.
+
+        A request with 'window_seconds' instead asks for the partials of
+        every bucket of 'bucket_seconds' starting within the given number of
+        seconds before 'window_end'. The start of the buckets is returned
+        as 'buckets', the properties of bucket i are prefixed with "i/".
+        Empty buckets are left out.
+        """
+        if CONFIG_WINDOW_SECONDS in config:
+            return self._bucket_properties(config)
+
+        self.track(config)
+
+        key = _config_key(self.name, config)
+        total = self._accumulator(config)
+        with self._lock:
+            for window in self._windows:
+                # Windows preceding the first request of 'config' lack it.
+                partial = window.partials.get(key)
+                if partial is not None:
+                    total.merge(partial)
+
+        return encode_values(total.result(), config)
+
+    def _append_bucket(self, rows: NDArray[Any], timestamp: float) -> None:
+        assert self._bucket_seconds is not None
+        bucket = self._bucket_seconds
+        start = math.floor(timestamp / bucket) * bucket
+        with self._lock:
+            last = self._windows[-1]
+            if last.rows == 0:
+                # The first bucket.
+                last.start = start
+                window = last
+            elif start > last.start:
+                window = self._open_window(start)
+            else:
+                # Late rows of a bucket still in the ring.
+                found = [w for w in self._windows if w.start == start]
+                if not found:
+                    return
+                window = found[0]
+
+            for partial in window.partials.values():
+                partial.update(rows)
+            window.chunks.append(np.array(rows))
+            window.rows += rows.shape[0]
+
+    def _bucket_properties(self, config: Config) -> Properties:
+        if self._bucket_seconds is None:
+            raise ValueError(f"{self.name} isn't kept in time buckets")
+
+        bucket = float(config.get(CONFIG_BUCKET_SECONDS, self._bucket_seconds))
+        if not math.isclose(
+            bucket / self._bucket_seconds, round(bucket / self._bucket_seconds)
+        ):
+            raise ValueError(
+                f"Buckets of {bucket}s can't be made of buckets of "
+                f"{self._bucket_seconds}s"
+            )
+        end = float(config.get(CONFIG_WINDOW_END, time.time()))
+        begin = end - float(config[CONFIG_WINDOW_SECONDS])
+        inner = {k: v for k, v in config.items() if k not in WINDOW_KEYS}
+
+        self.track(inner)
+        key = _config_key(self.name, inner)
+        # Client buckets are merged into the possibly longer requested ones.
+        totals: Dict[float, MergeableAccumulator] = {}
+        with self._lock:
+            for window in self._windows:
+                partial = window.partials.get(key)
+                if partial is None or window.rows == 0:
+                    continue
+                start = math.floor(window.start / bucket) * bucket
+                if not begin <= start < end:
+                    continue
+                if start not in totals:
+                    totals[start] = self._accumulator(inner)
+                totals[start].merge(partial)
+
+        starts = sorted(totals)
+        properties = encode_values(
+            {"buckets": np.array(starts, dtype=np.float64)}, config
+        )
+        # Buckets are encoded on their own, as their values are named alike.
+        for i, start in enumerate(starts):
+            for name, value in encode_values(
+                totals[start].result(), config
+            ).items():
+                properties[f"{i}{SEPARATOR}{name}"] = value
+
+        return properties
+
+    def _open_window(self, start: float = 0.0) -> Window:
+        # The oldest window drops out of the ring.
+        window = Window(
+            start=start,
+            partials={
+                key: self._accumulator(config)
+                for key, config in self._configs.items()
+            },
+        )
+        self._windows.append(window)
+        return window
+
+    def _accumulator(self, config: Config) -> MergeableAccumulator:
+        return _mergeable(self._provider.request_accumulator(config))
+
+
+def _mergeable(accumulator: Any) -> MergeableAccumulator:
+    if not isinstance(accumulator, MergeableAccumulator):
+        raise TypeError(
+            f"{type(accumulator).__name__} can't be maintained incrementally"
+        )
+
+    return accumulator
+
+
+def _config_key(name: str, config: Config) -> str:
+    return cache_key(
+        name,
+        {k: v for k, v in config.items() if k not in ENCODING_KEYS},
+        "",
+    )
@@ -0,0 +1,136 @@
+from typing import Any, cast
+
+import numpy as np
+from flwr.common import Config
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.codec import decode_array
+from flwr_analytics_client.fedhist import (
+    BLOCK_SIZE,
+    bin_indices,
+    feature_bin_edges,
+)
+from flwr_analytics_client.provider import DatasetProvider
+
+
+class JointHistogramProvider(DatasetProvider):
+    """Histograms of the joint distribution of groups of features.
+
+    The server sends the 'groups' of features, e.g. pairs, as an encoded
+    (groups x dimensions) array along with the range of every axis of every
+    group in 'hmins' and 'hmaxs' of the same shape.
+    """
+
+    @property
+    def name(self) -> str:
+        return "joint"
+
+    def accumulator(self, config: Config) -> Accumulator:
+        return JointHistogramAccumulator(
+            groups=decode_array(cast(bytes, config["groups"])),
+            nbins=int(config["nbins"]),
+            hmins=decode_array(cast(bytes, config["hmins"])),
+            hmaxs=decode_array(cast(bytes, config["hmaxs"])),
+            sparse=bool(config.get("sparse", False)),
+        )
+
+
+class JointHistogramAccumulator(MergeableAccumulator):
+    """Histogram of 'nbins' per axis of every group of features.
+
+    The bins of the values of a row are flattened into a single index per
+    group, offset by the group, so that all groups are counted by one
+    'bincount' per block of rows. Dense counts are a (groups x nbins x ...)
+    array. 'sparse' histograms only hold the flat indices of the non-empty
+    bins and their counts, for groups of many dimensions.
+    """
+
+    def __init__(
+        self,
+        groups: NDArray[Any],
+        nbins: int,
+        hmins: NDArray[Any],
+        hmaxs: NDArray[Any],
+        sparse: bool = False,
+    ) -> None:
+        groups = np.atleast_2d(np.asarray(groups, dtype=np.int64))
+        if np.shape(hmins) != groups.shape or np.shape(hmaxs) != groups.shape:
+            raise ValueError("Expected a range per axis of every group")
+
+        self._groups = groups
+        self._nbins = nbins
+        self._bins = feature_bin_edges(
+            nbins,
+            np.asarray(hmins, dtype=np.float64).ravel(),
+            np.asarray(hmaxs, dtype=np.float64).ravel(),
+        )
+        self._sparse = sparse
+        self._size = nbins ** groups.shape[1]
+        # Sparse counts are those of the bins of '_indices'.
+        self._indices = np.empty(0, dtype=np.int64)
+        self._counts = np.zeros(
+            0 if sparse else len(groups) * self._size, dtype=np.int64
+        )
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+
+        num_groups, dimensions = self._groups.shape
+        # Flat index of bin (i, j, ...) of group g.
+        strides = self._nbins ** np.arange(dimensions - 1, -1, -1)
+        offsets = np.arange(num_groups) * self._size
+        rows = max(1, BLOCK_SIZE // self._groups.size)
+        for start in range(0, chunk.shape[0], rows):
+            values = chunk[start : start + rows][:, self._groups.ravel()]
+            indices, keep = bin_indices(values, self._bins)
+            shape = (len(values), num_groups, dimensions)
+            flat = indices.reshape(shape) @ strides + offsets
+            # Rows are only counted in a group if all of its values are.
+            flat = flat[keep.reshape(shape).all(axis=2)]
+            if self._sparse:
+                self._add_sparse(*np.unique(flat, return_counts=True))
+            else:
+                self._counts += np.bincount(flat, minlength=len(self._counts))
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, JointHistogramAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+
+        if self._sparse:
+            self._add_sparse(other._indices, other._counts)
+        else:
+            self._counts += other._counts
+
+    def result(self) -> Values:
+        num_groups, dimensions = self._groups.shape
+        bins = self._bins.reshape(num_groups, dimensions, self._nbins + 1)
+        if self._sparse:
+            return {
+                "indices": self._indices,
+                "counts": self._counts,
+                "bins": bins,
+            }
+
+        return {
+            "counts": self._counts.reshape(
+                num_groups, *[self._nbins] * dimensions
+            ),
+            "bins": bins,
+        }
+
+    def _add_sparse(
+        self, indices: NDArray[np.int64], counts: NDArray[np.int64]
+    ) -> None:
+        self._indices, inverse = np.unique(
+            np.concatenate([self._indices, indices]), return_inverse=True
+        )
+        self._counts = np.bincount(
+            inverse, weights=np.concatenate([self._counts, counts])
+        ).astype(np.int64)
@@ -0,0 +1,45 @@
+import os
+from typing import Any, Union, cast
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def open_npy(path: PathLike) -> NDArray[Any]:
+    """Open a '.npy' file as a read-only memory map.
+
+    Nothing is copied into the heap, rows are paged in from the file while
+    the providers stream over them. The mapping stays open for the lifetime
+    of the client, hence repeated requests are served from the page cache.
+    """
+    return cast(NDArray[Any], np.load(path, mmap_mode="r"))
+
+
+def open_raw(
+    path: PathLike,
+    dtype: DTypeLike,
+    features: int,
+    offset: int = 0,
+) -> NDArray[Any]:
+    """Open a raw binary file of row-major records as a read-only memory map.
+
+    The file holds a (entries x features) table of 'dtype' values starting
+    at 'offset' bytes.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    size = os.path.getsize(path) - offset
+    if size % (itemsize * features) != 0:
+        raise ValueError(
+            f"Size of {path} is not a multiple of {features} features "
+            f"of {itemsize} bytes"
+        )
+
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=(size // (itemsize * features), features),
+    )
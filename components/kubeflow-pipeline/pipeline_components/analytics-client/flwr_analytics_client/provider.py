@@ -1,11 +1,27 @@
 import io
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional, Union
 
 import numpy as np
 from flwr.common import Config, Properties, Scalar
 from numpy.typing import NDArray
 
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    Values,
+    accumulate,
+    projected,
+)
+from flwr_analytics_client.codec import (
+    COMPRESSION_NONE,
+    CONFIG_COMPRESSION,
+    CONFIG_FLOAT32,
+    CONFIG_VERSION,
+    encode_array,
+)
+from flwr_analytics_client.dataset import Dataset, as_dataset
+from flwr_analytics_client.sample import sampled
+
 
 class AnalyticsProvider(ABC):
     @property
@@ -17,8 +33,99 @@ class AnalyticsProvider(ABC):
     def get_properties(self, _: Config) -> Properties:
         pass
 
+    def fingerprint(self) -> Optional[str]:
+        """Identifier of the data the properties are computed from.
+
+        Results are only cached for providers returning a fingerprint.
+        """
+        return None
+
+    def is_private(self, config: Config) -> bool:
+        """Whether the properties for 'config' are differentially private."""
+        return config.get("epsilon") is not None
+
+
+class DatasetProvider(AnalyticsProvider):
+    """Provider computing its properties in a single pass over a dataset.
+
+    Chunks are folded into an accumulator one at a time, so memory usage is
+    bounded by the chunk size rather than by the size of the dataset. With
+    several 'workers', chunks of mergeable accumulators are folded in
+    parallel, see 'accumulate'.
+    """
+
+    def __init__(
+        self, data: Union[Dataset, NDArray[Any]], workers: int = 1
+    ) -> None:
+        self._data = as_dataset(data)
+        self._workers = workers
+
+    @abstractmethod
+    def accumulator(self, config: Config) -> Accumulator:
+        pass
+
+    def request_accumulator(self, config: Config) -> Accumulator:
+        """Accumulator of a request.
+
+        It is restricted to the selected features and to the requested
+        sample of rows.
+        """
+        return projected(sampled(self.accumulator(config), config), config)
+
+    @property
+    def dataset(self) -> Dataset:
+        return self._data
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def fingerprint(self) -> Optional[str]:
+        return self._data.fingerprint()
+
+    def get_properties(self, config: Config) -> Properties:
+        [accumulator] = accumulate(
+            self._data.chunks(),
+            lambda: [self.request_accumulator(config)],
+            self._workers,
+        )
+
+        return encode_values(accumulator.result(), config)
+
+
+# Aggregate statistics which tolerate the loss of precision of float32, the
+# only ones downcast if the server asks for it. Sufficient statistics, e.g.
+# the sums of the correlation, lose their precision to cancellation on the
+# server. Values of the data, e.g. bin edges and sketch items, must stay
+# exact for the ones of different clients to agree.
+FLOAT32_KEYS = frozenset({"variances"})
+
+
+def encode_values(values: Values, config: Config) -> Properties:
+    return {
+        key: numpy_to_scalar(value, config, float32=key in FLOAT32_KEYS)
+        if isinstance(value, np.ndarray)
+        else value
+        for key, value in values.items()
+    }
+
+
+def numpy_to_scalar(
+    input: NDArray[Any], config: Optional[Config] = None, float32: bool = False
+) -> Scalar:
+    """Encode 'input' as the server asks for in 'config'.
+
+    Float64 arrays are only downcast if 'float32' is set and the server
+    asks for it.
+    """
+    if config is not None and config.get(CONFIG_VERSION):
+        return encode_array(
+            input,
+            compression=str(config.get(CONFIG_COMPRESSION, COMPRESSION_NONE)),
+            float32=float32 and bool(config.get(CONFIG_FLOAT32, False)),
+        )
 
-def numpy_to_scalar(input: NDArray[Any]) -> Scalar:
+    # Servers not asking for the codec expect arrays written by 'np.save'.
     buf = io.BytesIO()
 
     np.save(buf, input)
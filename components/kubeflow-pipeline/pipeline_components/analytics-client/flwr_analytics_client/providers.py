@@ -0,0 +1,66 @@
+from typing import Iterable, List, Tuple
+
+from numpy.typing import ArrayLike
+
+from flwr_analytics_client.cardinality import CardinalityProvider
+from flwr_analytics_client.correlation import (
+    CorrelationProvider,
+    RegressionProvider,
+)
+from flwr_analytics_client.dataset import Dataset
+from flwr_analytics_client.fedbox import BoxPlotProvider
+from flwr_analytics_client.fedhist import HistogramProvider
+from flwr_analytics_client.frequency import FrequencyProvider
+from flwr_analytics_client.incremental import IncrementalProvider
+from flwr_analytics_client.joint import JointHistogramProvider
+from flwr_analytics_client.provider import DatasetProvider
+from flwr_analytics_client.quantiles import QuantilesProvider
+from flwr_analytics_client.range import RangeProvider
+
+# Default ring of time buckets, e.g. a day of hourly buckets.
+DEFAULT_MAX_BUCKETS = 24
+
+
+def dataset_providers(
+    dataset: Dataset, workers: int = 1
+) -> List[DatasetProvider]:
+    """All providers served by a client, over 'dataset'."""
+    return [
+        CorrelationProvider(dataset, workers=workers),
+        HistogramProvider(dataset, workers=workers),
+        BoxPlotProvider(dataset, workers=workers),
+        QuantilesProvider(dataset, workers=workers),
+        RangeProvider(dataset, workers=workers),
+        CardinalityProvider(dataset, workers=workers),
+        FrequencyProvider(dataset, workers=workers),
+        JointHistogramProvider(dataset, workers=workers),
+        RegressionProvider(dataset, workers=workers),
+    ]
+
+
+def window_providers(
+    providers: Iterable[DatasetProvider],
+    bucket_seconds: float,
+    max_buckets: int = DEFAULT_MAX_BUCKETS,
+) -> List[IncrementalProvider]:
+    """Keep the results of 'providers' in a ring of time buckets.
+
+    Only rows fed to the returned providers are kept, see 'feed'.
+    """
+    return [
+        IncrementalProvider(
+            p, max_windows=max_buckets, bucket_seconds=bucket_seconds
+        )
+        for p in providers
+    ]
+
+
+def feed(
+    providers: Iterable[IncrementalProvider],
+    stream: Iterable[Tuple[ArrayLike, float]],
+) -> None:
+    """Append the chunks of rows of 'stream' along with their timestamp."""
+    providers = list(providers)
+    for rows, timestamp in stream:
+        for provider in providers:
+            provider.append(rows, timestamp)
@@ -0,0 +1,68 @@
+from typing import Any, List, Optional
+
+import numpy as np
+from flwr.common import Config
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.provider import DatasetProvider
+from flwr_analytics_client.sketch import (
+    DEFAULT_K,
+    QuantileSketch,
+    sketch_values,
+)
+
+
+class QuantilesProvider(DatasetProvider):
+    @property
+    def name(self) -> str:
+        return "quantiles"
+
+    def accumulator(self, config: Config) -> Accumulator:
+        return QuantilesAccumulator(k=int(config.get("k", DEFAULT_K)))
+
+
+class QuantilesAccumulator(MergeableAccumulator):
+    """Quantile sketch of every feature, i.e. of every column of the data.
+
+    One dimensional data is a single feature.
+    """
+
+    def __init__(self, k: int = DEFAULT_K) -> None:
+        self._k = k
+        self._sketches: Optional[List[QuantileSketch]] = None
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+
+        if self._sketches is None:
+            self._sketches = [
+                QuantileSketch(self._k) for _ in range(chunk.shape[1])
+            ]
+        for sketch, column in zip(self._sketches, chunk.T):
+            sketch.update(column)
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, QuantilesAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+        if other._sketches is None:
+            return
+
+        # Sketches are merged into new ones to leave those of 'other' as
+        # they are.
+        if self._sketches is None:
+            self._sketches = [QuantileSketch(self._k) for _ in other._sketches]
+        for sketch, other_sketch in zip(self._sketches, other._sketches):
+            sketch.merge(other_sketch)
+
+    def result(self) -> Values:
+        if self._sketches is None:
+            raise ValueError("Cannot compute quantiles of an empty dataset")
+
+        return sketch_values(self._sketches)
@@ -0,0 +1,78 @@
+from typing import Any, Optional
+
+import numpy as np
+from flwr.common import Config
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.provider import DatasetProvider
+from flwr_analytics_client.quantiles import QuantilesAccumulator
+
+
+class RangeProvider(DatasetProvider):
+    """Range of every feature, used to choose the bins of histograms.
+
+    If the server asks for robust ranges by sending 'k', quantile sketches
+    are returned, which also hold the exact minimum and maximum.
+    """
+
+    @property
+    def name(self) -> str:
+        return "range"
+
+    def accumulator(self, config: Config) -> Accumulator:
+        k = config.get("k")
+        if k is not None:
+            return QuantilesAccumulator(k=int(k))
+
+        return RangeAccumulator()
+
+
+class RangeAccumulator(MergeableAccumulator):
+    def __init__(self) -> None:
+        self._minimums: Optional[NDArray[np.float64]] = None
+        self._maximums: Optional[NDArray[np.float64]] = None
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+        if chunk.shape[0] == 0:
+            return
+
+        # NaNs are ignored, features without any value have an empty range
+        # from +inf to -inf.
+        self._fold(
+            np.fmin.reduce(chunk, axis=0, initial=np.inf),
+            np.fmax.reduce(chunk, axis=0, initial=-np.inf),
+        )
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, RangeAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+        if other._minimums is None or other._maximums is None:
+            return
+
+        self._fold(other._minimums, other._maximums)
+
+    def _fold(
+        self, minimums: NDArray[np.float64], maximums: NDArray[np.float64]
+    ) -> None:
+        if self._minimums is None or self._maximums is None:
+            self._minimums, self._maximums = minimums, maximums
+        else:
+            self._minimums = np.fmin(self._minimums, minimums)
+            self._maximums = np.fmax(self._maximums, maximums)
+
+    def result(self) -> Values:
+        if self._minimums is None or self._maximums is None:
+            raise ValueError("Cannot compute the range of an empty dataset")
+
+        return {
+            "minimums": self._minimums,
+            "maximums": self._maximums,
+        }
@@ -0,0 +1,148 @@
+from typing import Any, Optional
+
+import numpy as np
+from flwr.common import Config
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+
+# Config keys of a request computed on a uniform sample of the rows. Either
+# every row is kept with probability 'sample_fraction' or a sample of at
+# most 'sample_rows' rows is drawn.
+CONFIG_SAMPLE_FRACTION = "sample_fraction"
+CONFIG_SAMPLE_ROWS = "sample_rows"
+
+
+class BernoulliAccumulator(MergeableAccumulator):
+    """Fold every row into 'accumulator' with probability 'fraction'.
+
+    The result reports the number of sampled rows as 'sample_size' and the
+    number of rows seen as 'population'.
+    """
+
+    def __init__(
+        self,
+        accumulator: MergeableAccumulator,
+        fraction: float,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._accumulator = accumulator
+        self._fraction = fraction
+        self._rng = np.random.default_rng(seed)
+        self._sample_size = 0
+        self._population = 0
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk)
+        keep = self._rng.random((chunk.shape[0],)) < self._fraction
+        self._accumulator.update(chunk[keep])
+        self._sample_size += int(np.count_nonzero(keep))
+        self._population += chunk.shape[0]
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, BernoulliAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+
+        self._accumulator.merge(other._accumulator)
+        self._sample_size += other._sample_size
+        self._population += other._population
+
+    def result(self) -> Values:
+        return {
+            **self._accumulator.result(),
+            "sample_size": self._sample_size,
+            "population": self._population,
+        }
+
+
+class ReservoirAccumulator(MergeableAccumulator):
+    """Fold a uniform sample of at most 'rows' rows into 'accumulator'.
+
+    Every row gets a uniformly distributed random key and the rows with the
+    smallest keys are kept, which is a uniform sample without replacement
+    of any number of rows. Samples are merged by keeping the smallest keys
+    of both. The sample is folded into 'accumulator' by 'result'.
+    """
+
+    def __init__(
+        self,
+        accumulator: MergeableAccumulator,
+        rows: int,
+        seed: Optional[int] = None,
+    ) -> None:
+        if rows < 1:
+            raise ValueError("A sample needs at least one row")
+
+        self._accumulator = accumulator
+        self._size = rows
+        self._rng = np.random.default_rng(seed)
+        self._keys: NDArray[np.float64] = np.empty(0)
+        self._rows: Optional[NDArray[Any]] = None
+        self._population = 0
+        self._folded = False
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        chunk = np.asarray(chunk)
+        self._population += chunk.shape[0]
+        self._keep(self._rng.random((chunk.shape[0],)), chunk)
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        if not isinstance(other, ReservoirAccumulator):
+            raise TypeError(f"Cannot merge {type(other).__name__}")
+
+        self._population += other._population
+        if other._rows is not None:
+            self._keep(other._keys, other._rows)
+
+    def result(self) -> Values:
+        if self._rows is not None and not self._folded:
+            self._accumulator.update(self._rows)
+            self._folded = True
+
+        return {
+            **self._accumulator.result(),
+            "sample_size": len(self._keys),
+            "population": self._population,
+        }
+
+    def _keep(self, keys: NDArray[np.float64], rows: NDArray[Any]) -> None:
+        if self._rows is not None and len(self._keys) == self._size:
+            # Only rows with smaller keys than the largest kept one enter a
+            # full sample.
+            candidates = keys < self._keys.max()
+            keys, rows = keys[candidates], rows[candidates]
+
+        if self._rows is not None:
+            keys = np.concatenate([self._keys, keys])
+            rows = np.concatenate([self._rows, rows])
+        if len(keys) > self._size:
+            smallest = np.argpartition(keys, self._size)[: self._size]
+            keys, rows = keys[smallest], rows[smallest]
+
+        self._keys, self._rows = keys, rows
+
+
+def is_sampled(config: Config) -> bool:
+    """Whether 'config' asks for a result of a random sample of the rows."""
+    return CONFIG_SAMPLE_FRACTION in config or CONFIG_SAMPLE_ROWS in config
+
+
+def sampled(accumulator: Accumulator, config: Config) -> Accumulator:
+    """Restrict 'accumulator' to the sample of rows asked for by 'config'."""
+    if not is_sampled(config):
+        return accumulator
+
+    if not isinstance(accumulator, MergeableAccumulator):
+        raise TypeError(f"{type(accumulator).__name__} can't be sampled")
+    if CONFIG_SAMPLE_ROWS in config:
+        return ReservoirAccumulator(
+            accumulator, rows=int(config[CONFIG_SAMPLE_ROWS])
+        )
+
+    return BernoulliAccumulator(
+        accumulator, fraction=float(config[CONFIG_SAMPLE_FRACTION])
+    )
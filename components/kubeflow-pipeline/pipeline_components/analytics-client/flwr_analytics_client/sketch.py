@@ -0,0 +1,167 @@
+"""Mergeable quantile sketches.
+
+'QuantileSketch' is a KLL sketch (Karnin, Lang and Liberty, "Optimal
+Quantile Approximation in Streams", 2016). Values are kept in a hierarchy
+of compactors, the items of level h each stand for 2^h values. A level over
+its capacity is sorted and every other item, starting at a random offset,
+is promoted to the next level. The rank error is bounded by O(1/k) of the
+number of values, regardless of how many values or sketches are merged.
+
+Sketches of several features are exchanged as flat arrays, see
+'sketch_values' and 'sketches_from_arrays'.
+
+This module is kept identical in the analytics client and server.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+DEFAULT_K = 200
+
+# Capacities shrink geometrically from the top level downwards.
+_CAPACITY_DECAY = 2 / 3
+_MIN_CAPACITY = 2
+
+
+class QuantileSketch:
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None) -> None:
+        self.k = k
+        self.levels: List[NDArray[np.float64]] = [np.empty(0)]
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def count(self) -> int:
+        """Number of values added to the sketch."""
+        return sum(len(items) << h for h, items in enumerate(self.levels))
+
+    def update(self, values: ArrayLike) -> None:
+        """Add values, NaNs are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+
+        self.minimum = min(self.minimum, float(np.min(values)))
+        self.maximum = max(self.maximum, float(np.max(values)))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the values summarized by 'other'."""
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress()
+
+    def quantiles(self, q: ArrayLike) -> NDArray[np.float64]:
+        """Estimate the quantiles 'q', NaN for an empty sketch.
+
+        The 0 and 1 quantiles are the exact minimum and maximum.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        count = self.count
+        if count == 0:
+            return np.full(q.shape, np.nan)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [
+                np.full(len(level), 1 << h)
+                for h, level in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+
+        indices = np.searchsorted(cumulative, q * count, side="left")
+        result = items[order][np.clip(indices, 0, len(items) - 1)]
+        result = np.where(q <= 0, self.minimum, result)
+        result = np.where(q >= 1, self.maximum, result)
+
+        return result
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(_MIN_CAPACITY, math.ceil(self.k * _CAPACITY_DECAY**depth))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) <= self._capacity(level):
+                level += 1
+                continue
+
+            added_level = level + 1 == len(self.levels)
+            if added_level:
+                self.levels.append(np.empty(0))
+
+            items = np.sort(self.levels[level])
+            # An odd item stays on its level.
+            end = len(items) - len(items) % 2
+            promoted = items[:end][self._rng.integers(2) :: 2]
+            self.levels[level] = items[end:]
+            self.levels[level + 1] = np.concatenate(
+                [self.levels[level + 1], promoted]
+            )
+
+            # A new level lowers the capacities of all levels below it.
+            level = 0 if added_level else level + 1
+
+
+def sketch_values(sketches: Sequence[QuantileSketch]) -> Dict[str, Any]:
+    """Flatten the sketches of several features into arrays.
+
+    'sizes' holds the number of items per feature and level, 'items' the
+    items of all features and levels in that order.
+    """
+    num_levels = max(len(s.levels) for s in sketches)
+    sizes = np.zeros((len(sketches), num_levels), dtype=np.int64)
+    for i, sketch in enumerate(sketches):
+        sizes[i, : len(sketch.levels)] = [
+            len(items) for items in sketch.levels
+        ]
+
+    return {
+        "k": min(s.k for s in sketches),
+        "items": np.concatenate([np.concatenate(s.levels) for s in sketches]),
+        "sizes": sizes,
+        "minimums": np.array([s.minimum for s in sketches]),
+        "maximums": np.array([s.maximum for s in sketches]),
+    }
+
+
+def sketches_from_arrays(
+    k: int,
+    items: NDArray[Any],
+    sizes: NDArray[Any],
+    minimums: NDArray[Any],
+    maximums: NDArray[Any],
+) -> List[QuantileSketch]:
+    """Rebuild the sketches flattened by 'sketch_values'."""
+    sketches = []
+    offset = 0
+    for i, feature_sizes in enumerate(sizes):
+        # Levels padding 'sizes' to the same length are dropped.
+        nonzero = np.flatnonzero(feature_sizes)
+        num_levels = int(nonzero[-1]) + 1 if len(nonzero) > 0 else 1
+        sketch = QuantileSketch(k)
+        sketch.levels = []
+        for size in feature_sizes[:num_levels]:
+            sketch.levels.append(
+                np.asarray(items[offset : offset + size], dtype=np.float64)
+            )
+            offset += size
+        sketch.minimum = float(minimums[i])
+        sketch.maximum = float(maximums[i])
+        sketches.append(sketch)
+
+    return sketches
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Number of rows per batched matrix product. Large enough to keep BLAS
+# busy, small enough to bound the size of the float64 temporaries.
+DEFAULT_BATCH_SIZE = 65536
+
+
+@dataclass
+class SufficientStatistics:
+    """Mergeable moments of a (entries x features) table.
+
+    `multiply_sums` is the upper triangle of the symmetric Gram matrix
+    (X^T X), packed row by row (see `pack_triangle`), and
+    `squared_deviations` holds the per feature sum of squared deviations
+    from the mean, which is merged with the pairwise update of Chan et al.
+    to stay stable.
+    """
+
+    entries: int
+    sums: NDArray[np.float64]
+    multiply_sums: NDArray[np.float64]
+    squared_deviations: NDArray[np.float64]
+
+    @classmethod
+    def empty(cls, features: int) -> "SufficientStatistics":
+        return cls(
+            entries=0,
+            sums=np.zeros(features),
+            multiply_sums=np.zeros(triangle_size(features)),
+            squared_deviations=np.zeros(features),
+        )
+
+    @property
+    def features(self) -> int:
+        return int(self.sums.shape[0])
+
+    @property
+    def variances(self) -> NDArray[np.float64]:
+        if self.entries == 0:
+            return np.full(self.features, np.nan)
+        return self.squared_deviations / self.entries
+
+    def merge(self, other: "SufficientStatistics") -> "SufficientStatistics":
+        if other.entries == 0:
+            return self
+        if self.entries == 0:
+            return other
+
+        entries = self.entries + other.entries
+        delta = other.sums / other.entries - self.sums / self.entries
+
+        return SufficientStatistics(
+            entries=entries,
+            sums=self.sums + other.sums,
+            multiply_sums=self.multiply_sums + other.multiply_sums,
+            squared_deviations=self.squared_deviations
+            + other.squared_deviations
+            + delta**2 * (self.entries * other.entries / entries),
+        )
+
+
+def sufficient_statistics(
+    data: NDArray[Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> SufficientStatistics:
+    """Compute sums, variances and the Gram matrix of `data` in one pass.
+
+    Rows are processed in batches. Every batch is centered once and its
+    Gram matrix is computed with a single matrix product, the uncentered
+    Gram matrix is then recovered with a rank one update.
+    """
+    statistics = SufficientStatistics.empty(data.shape[1])
+    for start in range(0, data.shape[0], batch_size):
+        statistics = statistics.merge(
+            _batch_statistics(data[start : start + batch_size])
+        )
+
+    return statistics
+
+
+def triangle_size(features: int) -> int:
+    return features * (features + 1) // 2
+
+
+def pack_triangle(matrix: NDArray[Any]) -> NDArray[Any]:
+    """Pack the upper triangle of a square matrix row by row.
+
+    Rows are copied one at a time instead of using 'np.triu_indices', whose
+    index arrays are larger than the packed triangle itself.
+    """
+    features = matrix.shape[0]
+    packed = np.empty(triangle_size(features), dtype=matrix.dtype)
+    offset = 0
+    for i in range(features):
+        packed[offset : offset + features - i] = matrix[i, i:]
+        offset += features - i
+
+    return packed
+
+
+def unpack_triangle(packed: NDArray[Any], features: int) -> NDArray[Any]:
+    """Unpack a triangle packed by `pack_triangle` into a symmetric matrix."""
+    matrix = np.empty((features, features), dtype=packed.dtype)
+    offset = 0
+    for i in range(features):
+        row = packed[offset : offset + features - i]
+        matrix[i, i:] = row
+        matrix[i:, i] = row
+        offset += features - i
+
+    return matrix
+
+
+def _batch_statistics(batch: NDArray[Any]) -> SufficientStatistics:
+    entries, features = batch.shape
+    values = np.asarray(batch, dtype=np.float64)
+
+    sums = np.sum(values, axis=0)
+    mean = sums / entries
+    centered = values - mean
+    # 'centered.T @ centered' is dispatched to a symmetric rank-k update.
+    centered_multiply_sums = centered.T @ centered
+
+    # The uncentered Gram matrix is only ever built packed.
+    multiply_sums = pack_triangle(centered_multiply_sums)
+    offset = 0
+    for i in range(features):
+        multiply_sums[offset : offset + features - i] += (
+            entries * mean[i] * mean[i:]
+        )
+        offset += features - i
+
+    return SufficientStatistics(
+        entries=entries,
+        sums=sums,
+        multiply_sums=multiply_sums,
+        squared_deviations=np.diagonal(centered_multiply_sums).copy(),
+    )
@@ -1,29 +1,72 @@
 import logging
+import os
+import threading
 from typing import List
 
 import flwr
 
+from flwr_analytics_client.cache import DEFAULT_MAX_BYTES, ResultCache
 from flwr_analytics_client.client import AnalyticsClient
-from flwr_analytics_client.correlation import CorrelationProvider
 from flwr_analytics_client.data import data
-from flwr_analytics_client.fedbox import BoxPlotProvider
-from flwr_analytics_client.fedhist import HistogramProvider
-from flwr_analytics_client.provider import AnalyticsProvider
+from flwr_analytics_client.dataset import load_dataset
+from flwr_analytics_client.incremental import IncrementalProvider
+from flwr_analytics_client.providers import (
+    DEFAULT_MAX_BUCKETS,
+    dataset_providers,
+    feed,
+    window_providers,
+)
 
 log = logging.getLogger(__name__)
 
 if __name__ == "__main__":
-    d = data()
+    d = load_dataset(data)
 
-    providers: List[AnalyticsProvider] = [
-        CorrelationProvider(d),
-        HistogramProvider(d),
-        BoxPlotProvider(d),
-    ]
+    # Threads folding chunks in parallel, 0 for one per core.
+    workers = int(os.environ.get("ANALYTICS_WORKERS", 1))
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    providers = dataset_providers(d, workers=workers)
 
     log.info(
         f"starting client with {', '.join(p.name for p in providers) } providers"
     )
 
-    client = AnalyticsClient(providers=providers)
+    # Rows of 'stream()' are kept in a ring of time buckets of this length
+    # to answer requests over time windows.
+    windows: List[IncrementalProvider] = []
+    bucket_seconds = os.environ.get("ANALYTICS_BUCKET_SECONDS")
+    if bucket_seconds is not None:
+        from flwr_analytics_client.data import stream
+
+        windows = window_providers(
+            dataset_providers(d, workers=workers),
+            bucket_seconds=float(bucket_seconds),
+            max_buckets=int(
+                os.environ.get("ANALYTICS_MAX_BUCKETS", DEFAULT_MAX_BUCKETS)
+            ),
+        )
+        threading.Thread(
+            target=feed, args=(windows, stream()), daemon=True
+        ).start()
+        log.info(f"keeping time buckets of {bucket_seconds}s")
+
+    cache = ResultCache(
+        max_bytes=int(
+            os.environ.get("ANALYTICS_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        ),
+        directory=os.environ.get("ANALYTICS_CACHE_DIR"),
+    )
+
+    cache_private_results = os.environ.get(
+        "ANALYTICS_CACHE_PRIVATE_RESULTS", "false"
+    ).lower() in ["1", "true"]
+
+    client = AnalyticsClient(
+        providers=providers,
+        cache=cache,
+        cache_private_results=cache_private_results,
+        window_providers=windows,
+    )
     flwr.client.start_client(server_address="localhost:9080", client=client)
@@ -0,0 +1,88 @@
+from typing import Iterator
+
+import numpy as np
+from flwr.common import Code, GetPropertiesIns
+
+from flwr_analytics_client.client import AnalyticsClient
+from flwr_analytics_client.correlation import (
+    CorrelationProvider,
+    RegressionProvider,
+)
+from flwr_analytics_client.dataset import load_dataset
+from flwr_analytics_client.fedhist import HistogramProvider
+
+
+def _test_data() -> np.ndarray:
+    return np.random.default_rng(4242).normal(size=(1000, 3))
+
+
+def test_batched_request() -> None:
+    passes = []
+
+    def chunks() -> Iterator[np.ndarray]:
+        passes.append(True)
+        yield from np.array_split(_test_data(), 7)
+
+    dataset = load_dataset(chunks)
+    client = AnalyticsClient(
+        [CorrelationProvider(dataset), HistogramProvider(dataset)]
+    )
+
+    res = client.get_properties(
+        GetPropertiesIns(
+            {
+                "providers": "correlation,histogram",
+                "codec": 1,
+                "correlation/packed": True,
+                "histogram/nbins": 4,
+                "histogram/hmin": -1.0,
+                "histogram/hmax": 1.0,
+            }
+        )
+    )
+
+    assert res.status.code == Code.OK
+    assert len(passes) == 1
+
+    correlation = CorrelationProvider(dataset).get_properties(
+        {"codec": 1, "packed": True}
+    )
+    histogram = HistogramProvider(dataset).get_properties(
+        {"codec": 1, "nbins": 4, "hmin": -1.0, "hmax": 1.0}
+    )
+    assert res.properties == {
+        **{f"correlation/{k}": v for k, v in correlation.items()},
+        **{f"histogram/{k}": v for k, v in histogram.items()},
+    }
+
+
+def test_batched_request_unknown_provider() -> None:
+    client = AnalyticsClient([CorrelationProvider(_test_data())])
+
+    res = client.get_properties(
+        GetPropertiesIns({"providers": "correlation,unknown"})
+    )
+
+    assert res.status.code == Code.GET_PARAMETERS_NOT_IMPLEMENTED
+
+
+def test_batched_correlation_and_regression() -> None:
+    dataset = load_dataset(_test_data)
+    client = AnalyticsClient(
+        [CorrelationProvider(dataset), RegressionProvider(dataset)]
+    )
+
+    res = client.get_properties(
+        GetPropertiesIns(
+            {
+                "providers": "correlation,regression",
+                "correlation/packed": True,
+                "regression/packed": True,
+            }
+        )
+    )
+
+    assert res.status.code == Code.OK
+    assert res.properties["regression/sums"] == (
+        res.properties["correlation/sums"]
+    )
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import numpy as np
+from flwr.common import Code, Config, GetPropertiesIns, Properties
+
+from flwr_analytics_client.cache import ResultCache, cache_key
+from flwr_analytics_client.client import AnalyticsClient
+from flwr_analytics_client.fedhist import HistogramProvider
+
+
+class CountingProvider(HistogramProvider):
+    def __init__(self, data: np.ndarray) -> None:
+        super().__init__(data)
+        self.calls = 0
+
+    def get_properties(self, config: Config) -> Properties:
+        self.calls += 1
+        return super().get_properties(config)
+
+
+def _ins(**config: float) -> GetPropertiesIns:
+    return GetPropertiesIns(
+        {"provider": "histogram", "nbins": 4, "hmin": 0, "hmax": 1, **config}
+    )
+
+
+def test_cache_hit() -> None:
+    provider = CountingProvider(np.linspace(0, 1, 100))
+    client = AnalyticsClient([provider], cache=ResultCache())
+
+    first = client.get_properties(_ins())
+    second = client.get_properties(_ins())
+    client.get_properties(_ins(hmax=2))
+
+    assert first.status.code == Code.OK
+    assert first.properties == second.properties
+    assert provider.calls == 2
+
+
+def test_private_results_are_not_cached() -> None:
+    provider = CountingProvider(np.linspace(0, 1, 100))
+    client = AnalyticsClient([provider], cache=ResultCache())
+
+    client.get_properties(_ins(epsilon=1.0))
+    client.get_properties(_ins(epsilon=1.0))
+
+    assert provider.calls == 2
+
+
+def test_sampled_results_are_not_cached() -> None:
+    provider = CountingProvider(np.linspace(0, 1, 100))
+    client = AnalyticsClient([provider], cache=ResultCache())
+
+    client.get_properties(_ins(sample_fraction=0.5))
+    client.get_properties(_ins(sample_fraction=0.5))
+
+    assert provider.calls == 2
+
+
+def test_private_results_cached_explicitly() -> None:
+    provider = CountingProvider(np.linspace(0, 1, 100))
+    client = AnalyticsClient(
+        [provider], cache=ResultCache(), cache_private_results=True
+    )
+
+    first = client.get_properties(_ins(epsilon=1.0))
+    second = client.get_properties(_ins(epsilon=1.0))
+
+    assert first.properties == second.properties
+    assert provider.calls == 1
+
+
+def test_fingerprint_changes_with_data() -> None:
+    data = np.linspace(0, 1, 100)
+    fingerprint = HistogramProvider(data).fingerprint()
+
+    assert fingerprint == HistogramProvider(data.copy()).fingerprint()
+    assert fingerprint != HistogramProvider(data[:-1]).fingerprint()
+
+
+def test_lru_eviction() -> None:
+    cache = ResultCache(max_bytes=250)
+    for i in range(3):
+        cache.put(str(i), {"counts": bytes(100)})
+
+    assert cache.get("0") is None
+    assert cache.get("1") is not None
+    assert cache.get("2") is not None
+    assert cache.size <= 250
+
+
+def test_oversized_result_replaces_entry() -> None:
+    cache = ResultCache(max_bytes=250)
+    cache.put("key", {"counts": bytes(100)})
+    cache.put("key", {"counts": bytes(300)})
+
+    # The previous result of the key is stale.
+    assert cache.get("key") is None
+    assert cache.size == 0
+
+
+def test_persisted_cache(tmp_path: Path) -> None:
+    key = cache_key("histogram", {"nbins": 4}, "fingerprint")
+    ResultCache(directory=tmp_path).put(key, {"counts": b"123"})
+
+    assert ResultCache(directory=tmp_path).get(key) == {"counts": b"123"}
@@ -0,0 +1,73 @@
+import io
+
+import numpy as np
+import pytest
+from flwr.common import Scalar
+
+from flwr_analytics_client.cardinality import (
+    CardinalityProvider,
+    HyperLogLogAccumulator,
+    hash_registers,
+)
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def test_cardinality() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.integers(0, 1000, size=(10_000, 2)).astype(float)
+    data[::7, 1] = np.nan
+
+    provider = CardinalityProvider(data)
+    properties = provider.get_properties({"precision": 10})
+
+    registers = _scalar_to_numpy(properties["registers"])
+    assert registers.shape == (2, 1024)
+    assert registers.dtype == np.uint8
+
+    # Registers only depend on the distinct values.
+    unique = HyperLogLogAccumulator(precision=10)
+    unique.update(np.unique(data[:, 0]))
+    np.testing.assert_equal(unique.result()["registers"][0], registers[0])
+
+
+def test_cardinality_merge() -> None:
+    values = np.arange(5000, dtype=float)
+    first = HyperLogLogAccumulator()
+    first.update(values[:3000])
+    second = HyperLogLogAccumulator()
+    second.update(values[2000:])
+    total = HyperLogLogAccumulator()
+    total.update(values)
+
+    first.merge(second)
+
+    np.testing.assert_equal(
+        first.result()["registers"], total.result()["registers"]
+    )
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLogAccumulator(precision=8))
+
+
+def test_hash_registers() -> None:
+    index, rank = hash_registers(np.array([0.0, -0.0, 1.0, 1.0]), 12)
+
+    assert index[0] == index[1] and rank[0] == rank[1]
+    assert index[2] == index[3] and rank[2] == rank[3]
+    assert np.all(index < 4096)
+    assert np.all((1 <= rank) & (rank <= 53))
+
+    # Ranks are geometrically distributed.
+    _, rank = hash_registers(np.arange(100_000, dtype=float), 12)
+    assert 0.45 < np.mean(rank == 1) < 0.55
+    assert 0.2 < np.mean(rank == 2) < 0.3
+
+
+def test_precision() -> None:
+    with pytest.raises(ValueError):
+        HyperLogLogAccumulator(precision=3)
+    with pytest.raises(ValueError):
+        HyperLogLogAccumulator(precision=17)
@@ -0,0 +1,111 @@
+import io
+
+import numpy as np
+import pytest
+
+from flwr_analytics_client.codec import (
+    CODEC_VERSION,
+    CONFIG_COMPRESSION,
+    CONFIG_FLOAT32,
+    CONFIG_VERSION,
+    decode_array,
+    encode_array,
+)
+from flwr_analytics_client.correlation import CorrelationProvider
+from flwr_analytics_client.fedhist import HistogramProvider
+
+
+def _test_data() -> np.ndarray:
+    return np.random.default_rng(4242).normal(size=(100, 3))
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.zeros((0, 3)),
+        np.array(7),
+        np.array([True, False]),
+        np.arange(12, dtype=np.int32).reshape(3, 4),
+        np.asfortranarray(_test_data()),
+    ],
+)
+def test_roundtrip(array: np.ndarray) -> None:
+    decoded = decode_array(encode_array(array))
+
+    assert decoded.dtype == array.dtype
+    np.testing.assert_equal(decoded, array)
+
+
+def test_roundtrip_zlib() -> None:
+    array = np.zeros((100, 100))
+
+    encoded = encode_array(array, compression="zlib")
+
+    assert len(encoded) < array.nbytes
+    np.testing.assert_equal(decode_array(encoded), array)
+
+
+def test_float32() -> None:
+    decoded = decode_array(encode_array(_test_data(), float32=True))
+
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, _test_data(), rtol=1e-6)
+
+
+def test_decode_npy() -> None:
+    buf = io.BytesIO()
+    np.save(buf, _test_data())
+
+    np.testing.assert_equal(decode_array(buf.getvalue()), _test_data())
+
+
+def test_decode_invalid() -> None:
+    with pytest.raises(ValueError):
+        decode_array(b"not an array")
+
+
+def test_provider_encoding() -> None:
+    provider = CorrelationProvider(_test_data())
+
+    properties = provider.get_properties(
+        {
+            CONFIG_VERSION: CODEC_VERSION,
+            CONFIG_COMPRESSION: "zlib",
+            CONFIG_FLOAT32: True,
+        }
+    )
+
+    # Sufficient statistics are never downcast.
+    multiply_sums = decode_array(properties["multiply_sums"])
+    assert multiply_sums.dtype == np.float64
+    np.testing.assert_allclose(
+        multiply_sums, _test_data().T @ _test_data(), rtol=1e-12
+    )
+
+
+def test_provider_encoding_float32() -> None:
+    provider = HistogramProvider(_test_data()[:, 0])
+
+    properties = provider.get_properties(
+        {
+            CONFIG_VERSION: CODEC_VERSION,
+            CONFIG_FLOAT32: True,
+            "nbins": 4,
+            "hmin": -0.1,
+            "hmax": 0.1,
+        }
+    )
+
+    # Bin edges of different clients must agree exactly.
+    bins = decode_array(properties["bins"])
+    assert bins.dtype == np.float64
+    np.testing.assert_equal(bins, np.linspace(-0.1, 0.1, 5))
+    assert decode_array(properties["counts"]).sum() > 0
+
+    properties = CorrelationProvider(_test_data()).get_properties(
+        {CONFIG_VERSION: CODEC_VERSION, CONFIG_FLOAT32: True}
+    )
+
+    variances = decode_array(properties["variances"])
+    assert variances.dtype == np.float32
+    np.testing.assert_allclose(variances, _test_data().var(axis=0), rtol=1e-6)
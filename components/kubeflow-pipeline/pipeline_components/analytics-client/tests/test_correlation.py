@@ -3,7 +3,9 @@ import io
 import numpy as np
 from flwr.common import Scalar
 
+from flwr_analytics_client.codec import decode_array, encode_array
 from flwr_analytics_client.correlation import CorrelationProvider
+from flwr_analytics_client.dataset import ArrayDataset
 
 
 def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
@@ -59,3 +61,76 @@ def test_correlation() -> None:
         ],
         decimal=2,
     )
+
+
+def test_correlation_packed() -> None:
+    test_data = np.random.default_rng(4242).normal(size=(100, 5))
+
+    provider = CorrelationProvider(test_data)
+
+    properties = provider.get_properties({"packed": True})
+
+    multiply_sums = _scalar_to_numpy(properties["multiply_sums"])
+    np.testing.assert_allclose(
+        multiply_sums, (test_data.T @ test_data)[np.triu_indices(5)]
+    )
+
+
+def test_correlation_workers() -> None:
+    test_data = np.random.default_rng(4242).normal(size=(10_000, 5))
+    dataset = ArrayDataset(test_data, chunk_size=999)
+
+    sequential = CorrelationProvider(dataset).get_properties({})
+    parallel = CorrelationProvider(dataset, workers=4).get_properties({})
+
+    assert parallel["entries"] == sequential["entries"]
+    for key in ["sums", "multiply_sums", "variances"]:
+        np.testing.assert_allclose(
+            _scalar_to_numpy(parallel[key]), _scalar_to_numpy(sequential[key])
+        )
+
+
+def test_correlation_features() -> None:
+    test_data = np.random.default_rng(4242).normal(size=(100, 8))
+
+    provider = CorrelationProvider(test_data)
+
+    properties = provider.get_properties(
+        {"packed": True, "features": encode_array(np.array([6, 1, 3]))}
+    )
+
+    selected = test_data[:, [6, 1, 3]]
+    assert properties["features"] == 3
+    np.testing.assert_allclose(
+        _scalar_to_numpy(properties["sums"]), selected.sum(axis=0)
+    )
+    np.testing.assert_allclose(
+        _scalar_to_numpy(properties["multiply_sums"]),
+        (selected.T @ selected)[np.triu_indices(3)],
+    )
+
+
+def test_correlation_float32() -> None:
+    rng = np.random.default_rng(4242)
+    x = rng.normal(size=10_000)
+    y = 0.5 * x + np.sqrt(0.75) * rng.normal(size=10_000)
+    # Correlations are lost to cancellation if sums are sent as float32.
+    test_data = 1000 + np.stack([x, y], axis=1)
+
+    properties = CorrelationProvider(test_data).get_properties(
+        {"codec": 1, "codec_float32": True}
+    )
+
+    n = properties["entries"]
+    sums = decode_array(properties["sums"])
+    multiply_sums = decode_array(properties["multiply_sums"])
+    assert sums.dtype == multiply_sums.dtype == np.float64
+
+    means = sums / n
+    covariance = multiply_sums / n - np.outer(means, means)
+    deviations = np.sqrt(np.diag(covariance))
+    np.testing.assert_allclose(
+        covariance / np.outer(deviations, deviations),
+        np.corrcoef(test_data.T),
+        rtol=1e-6,
+    )
@@ -0,0 +1,61 @@
+import io
+from typing import Iterator
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_client.correlation import CorrelationProvider
+from flwr_analytics_client.dataset import ArrayDataset, load_dataset
+from flwr_analytics_client.fedhist import HistogramProvider
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def _test_data() -> np.ndarray:
+    return np.random.default_rng(4242).normal(loc=20, size=(1000, 5))
+
+
+def _chunks() -> Iterator[np.ndarray]:
+    yield from np.array_split(_test_data(), 13)
+
+
+def test_load_dataset_from_iterator() -> None:
+    dataset = load_dataset(_chunks)
+
+    # Every pass restarts the iterator.
+    for _ in range(2):
+        np.testing.assert_equal(
+            np.concatenate(list(dataset.chunks())), _test_data()
+        )
+
+
+def test_chunked_correlation() -> None:
+    expected = CorrelationProvider(_test_data()).get_properties({})
+    properties = CorrelationProvider(load_dataset(_chunks)).get_properties(
+        {}
+    )
+
+    assert properties["entries"] == expected["entries"]
+    assert properties["features"] == expected["features"]
+    for key in ["sums", "multiply_sums", "variances"]:
+        np.testing.assert_allclose(
+            _scalar_to_numpy(properties[key]),
+            _scalar_to_numpy(expected[key]),
+        )
+
+
+def test_chunked_histogram() -> None:
+    config = {"nbins": 30, "hmin": 17.0, "hmax": 23.0}
+    expected = np.histogram(_test_data(), bins=30, range=(17.0, 23.0))
+
+    properties = HistogramProvider(
+        ArrayDataset(_test_data(), chunk_size=7)
+    ).get_properties(config)
+
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["counts"]), expected[0]
+    )
+    np.testing.assert_equal(_scalar_to_numpy(properties["bins"]), expected[1])
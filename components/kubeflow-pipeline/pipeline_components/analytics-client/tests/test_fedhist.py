@@ -1,9 +1,12 @@
 import io
 
 import numpy as np
+from diffprivlib.accountant import BudgetAccountant
 from flwr.common import Scalar
 
-from flwr_analytics_client.fedhist import HistogramProvider
+from flwr_analytics_client.codec import encode_array
+from flwr_analytics_client.dataset import ArrayDataset
+from flwr_analytics_client.fedhist import HistogramProvider, privatize_counts
 
 
 def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
@@ -28,3 +31,89 @@ def test_histogram() -> None:
     np.testing.assert_equal(counts, [2, 1])
     bins = _scalar_to_numpy(properties["bins"])
     np.testing.assert_equal(bins, [0, 0.5, 1])
+
+
+def test_histogram_per_feature() -> None:
+    data = np.random.default_rng(4242).normal(size=(1000, 3))
+    data[::7, 1] = np.nan
+    hmins = np.array([-1.0, -2.0, 0.0])
+    hmaxs = np.array([1.0, 2.0, 0.0])
+
+    provider = HistogramProvider(data)
+
+    properties = provider.get_properties(
+        {
+            "per_feature": True,
+            "nbins": 10,
+            "hmins": encode_array(hmins),
+            "hmaxs": encode_array(hmaxs),
+        }
+    )
+
+    counts = _scalar_to_numpy(properties["counts"])
+    bins = _scalar_to_numpy(properties["bins"])
+    assert counts.shape == (3, 10)
+    for i in range(3):
+        column = data[:, i][~np.isnan(data[:, i])]
+        expected_counts, expected_bins = np.histogram(
+            column, bins=10, range=(hmins[i], hmaxs[i])
+        )
+        np.testing.assert_equal(counts[i], expected_counts)
+        np.testing.assert_equal(bins[i], expected_bins)
+
+
+def test_histogram_per_feature_shared_range() -> None:
+    data = np.array([[0, 1], [1, 1], [0, 0]])
+
+    provider = HistogramProvider(data)
+
+    properties = provider.get_properties(
+        {"per_feature": True, "nbins": 2, "hmin": 0, "hmax": 1}
+    )
+
+    counts = _scalar_to_numpy(properties["counts"])
+    np.testing.assert_equal(counts, [[2, 1], [1, 2]])
+
+
+def test_histogram_workers() -> None:
+    data = np.random.default_rng(4242).normal(size=(10_000, 3))
+    dataset = ArrayDataset(data, chunk_size=999)
+
+    for config in [
+        {"nbins": 20, "hmin": -2, "hmax": 2},
+        {"per_feature": True, "nbins": 20, "hmin": -2, "hmax": 2},
+    ]:
+        sequential = HistogramProvider(dataset).get_properties(config)
+        parallel = HistogramProvider(dataset, workers=4).get_properties(config)
+
+        assert parallel == sequential
+
+
+def test_histogram_features() -> None:
+    data = np.array([[0, 1, 5], [1, 1, 5], [0, 0, 5]])
+
+    provider = HistogramProvider(data, workers=2)
+
+    properties = provider.get_properties(
+        {
+            "per_feature": True,
+            "nbins": 2,
+            "hmin": 0,
+            "hmax": 1,
+            "features": encode_array(np.array([1, 0])),
+        }
+    )
+
+    counts = _scalar_to_numpy(properties["counts"])
+    np.testing.assert_equal(counts, [[1, 2], [2, 1]])
+
+
+def test_privatize_counts() -> None:
+    counts = np.array([[5, 0, 100], [3, 2, 1]])
+    accountant = BudgetAccountant()
+
+    with accountant:
+        noisy_counts = privatize_counts(counts, 1e6)
+
+    np.testing.assert_equal(noisy_counts, counts)
+    assert accountant.total() == (1e6, 0)
@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+from flwr.common import Scalar
+
+from flwr_analytics_client.frequency import (
+    FrequencyAccumulator,
+    FrequencyProvider,
+)
+from flwr_analytics_client.hashing import bucket_values
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def test_frequency() -> None:
+    data = np.array(
+        [[1.0, 5.0], [2.0, 5.0], [1.0, np.nan], [3.0, 5.0], [1.0, 6.0]]
+    )
+
+    provider = FrequencyProvider(data)
+    properties = provider.get_properties(
+        {"width": 16, "depth": 2, "candidates": 3}
+    )
+
+    sketch = _scalar_to_numpy(properties["sketch"])
+    assert sketch.shape == (2, 2, 16)
+    np.testing.assert_equal(sketch.sum(axis=2), [[5, 5], [4, 4]])
+    for d in range(2):
+        bucket = bucket_values([1.0], 16, seed=d)[0]
+        assert sketch[0, d, bucket] >= 3
+    np.testing.assert_equal(_scalar_to_numpy(properties["rows"]), [5, 4])
+
+    # The second feature only has two values, hence the NaN.
+    candidates = _scalar_to_numpy(properties["candidates"])
+    counts = _scalar_to_numpy(properties["candidate_counts"])
+    np.testing.assert_equal(candidates, [[1, 2, 3], [5, 6, np.nan]])
+    np.testing.assert_equal(counts, [[3, 1, 1], [3, 1, 0]])
+
+
+def test_misra_gries() -> None:
+    rng = np.random.default_rng(4242)
+    values = np.concatenate(
+        [
+            np.full(3000, 7.0),
+            np.full(2000, 8.0),
+            rng.integers(0, 10**6, 5000),
+        ]
+    )
+    rng.shuffle(values)
+
+    accumulators = [FrequencyAccumulator(candidates=4) for _ in range(3)]
+    for accumulator, part in zip(accumulators, np.array_split(values, 3)):
+        for chunk in np.array_split(part, 10):
+            accumulator.update(chunk)
+    for accumulator in accumulators[1:]:
+        accumulators[0].merge(accumulator)
+
+    result = accumulators[0].result()
+    candidates = result["candidates"][0]
+    counts = result["candidate_counts"][0]
+    for value, true_count in [(7.0, 3000), (8.0, 2000)]:
+        [count] = counts[candidates == value]
+        # Counts are underestimated by at most n / (k + 1).
+        assert true_count - 10_000 / 5 <= count <= true_count
+
+
+def test_frequency_merge_sizes() -> None:
+    with pytest.raises(ValueError):
+        FrequencyAccumulator(width=8).merge(FrequencyAccumulator(width=16))
+    with pytest.raises(ValueError):
+        FrequencyAccumulator(candidates=0)
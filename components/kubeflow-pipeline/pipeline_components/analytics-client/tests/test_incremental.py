@@ -0,0 +1,181 @@
+import io
+
+import numpy as np
+from flwr.common import Code, GetPropertiesIns, Scalar
+
+from flwr_analytics_client.client import AnalyticsClient
+from flwr_analytics_client.correlation import CorrelationProvider
+from flwr_analytics_client.dataset import ChunkedDataset
+from flwr_analytics_client.fedhist import HistogramProvider
+from flwr_analytics_client.incremental import IncrementalProvider
+from flwr_analytics_client.providers import (
+    dataset_providers,
+    feed,
+    window_providers,
+)
+
+HISTOGRAM = {"nbins": 4, "hmin": 0, "hmax": 1}
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def test_append() -> None:
+    data = np.random.default_rng(4242).uniform(size=(1_000, 3))
+    history = [data[:500]]
+    passes = []
+
+    def source() -> list:
+        passes.append(True)
+        return list(history)
+
+    provider = IncrementalProvider(HistogramProvider(ChunkedDataset(source)))
+
+    provider.get_properties(HISTOGRAM)
+    for start in range(500, 1_000, 100):
+        provider.append(data[start : start + 100])
+    # Encoding options don't change what is maintained.
+    provider.get_properties({**HISTOGRAM, "codec": 1})
+
+    np.testing.assert_equal(
+        provider.get_properties(HISTOGRAM)["counts"],
+        HistogramProvider(data).get_properties(HISTOGRAM)["counts"],
+    )
+    assert len(passes) == 1
+
+
+def test_append_correlation() -> None:
+    data = np.random.default_rng(4242).normal(size=(1_000, 4))
+    provider = IncrementalProvider(CorrelationProvider(data[:100]))
+
+    provider.track({})
+    provider.append(data[100:])
+
+    properties = provider.get_properties({})
+    expected = CorrelationProvider(data).get_properties({})
+    assert properties["entries"] == 1_000
+    np.testing.assert_allclose(
+        _scalar_to_numpy(properties["multiply_sums"]),
+        _scalar_to_numpy(expected["multiply_sums"]),
+    )
+
+
+def test_window_expiry() -> None:
+    data = np.linspace(0, 0.99, 35)
+    provider = IncrementalProvider(
+        HistogramProvider(np.empty(0)), window_rows=10, max_windows=2
+    )
+
+    provider.track(HISTOGRAM)
+    provider.append(data[:17])
+    provider.append(data[17:])
+
+    # Only the windows of rows 20 to 29 and 30 to 34 are kept.
+    counts = _scalar_to_numpy(provider.get_properties(HISTOGRAM)["counts"])
+    np.testing.assert_equal(
+        counts, np.histogram(data[20:], bins=4, range=(0, 1))[0]
+    )
+
+
+def test_time_buckets() -> None:
+    provider = IncrementalProvider(
+        HistogramProvider(np.empty(0)), max_windows=4, bucket_seconds=60
+    )
+    provider.track(HISTOGRAM)
+
+    provider.append([0.1, 0.2], timestamp=0)
+    provider.append([0.3], timestamp=59)
+    provider.append([0.6], timestamp=125)
+    # Late rows of the first bucket.
+    provider.append([0.9], timestamp=30)
+
+    properties = provider.get_properties(
+        {**HISTOGRAM, "window_seconds": 180, "window_end": 180}
+    )
+
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["buckets"]), [0.0, 120.0]
+    )
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["0/counts"]), [2, 1, 0, 1]
+    )
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["1/counts"]), [0, 0, 1, 0]
+    )
+
+    # Longer buckets are merged from the kept ones, windows not starting
+    # within the requested window are left out.
+    merged = provider.get_properties(
+        {
+            **HISTOGRAM,
+            "window_seconds": 120,
+            "window_end": 240,
+            "bucket_seconds": 120,
+        }
+    )
+    np.testing.assert_equal(_scalar_to_numpy(merged["buckets"]), [120.0])
+    np.testing.assert_equal(_scalar_to_numpy(merged["0/counts"]), [0, 0, 1, 0])
+
+
+def test_client_time_windows() -> None:
+    dataset = ChunkedDataset(list)
+    client = AnalyticsClient(
+        providers=dataset_providers(dataset),
+        window_providers=window_providers(
+            dataset_providers(dataset), bucket_seconds=60, max_buckets=4
+        ),
+    )
+    window = {"window_seconds": 180, "window_end": 180, "bucket_seconds": 60}
+    request = GetPropertiesIns(
+        {
+            "providers": "histogram,correlation",
+            **{f"histogram/{k}": v for k, v in HISTOGRAM.items()},
+            **{f"histogram/{k}": v for k, v in window.items()},
+            **{f"correlation/{k}": v for k, v in window.items()},
+        }
+    )
+
+    # The first request of a config covers the rows fed before it.
+    feed(
+        client._window_providers.values(),
+        [(np.array([[0.1], [0.2]]), 0.0), (np.array([[0.6]]), 125.0)],
+    )
+    res = client.get_properties(request)
+    assert res.status.code == Code.OK
+
+    np.testing.assert_equal(
+        _scalar_to_numpy(res.properties["histogram/buckets"]), [0.0, 120.0]
+    )
+    np.testing.assert_equal(
+        _scalar_to_numpy(res.properties["histogram/1/counts"]), [0, 0, 1, 0]
+    )
+    np.testing.assert_allclose(
+        _scalar_to_numpy(res.properties["correlation/0/sums"]), [0.3]
+    )
+
+    # Without time buckets, window requests are answered with an error.
+    client = AnalyticsClient(providers=dataset_providers(dataset))
+    res = client.get_properties(
+        GetPropertiesIns({"provider": "histogram", **HISTOGRAM, **window})
+    )
+    assert res.status.code == Code.GET_PROPERTIES_NOT_IMPLEMENTED
+    assert res.properties == {}
+
+
+def test_seed_windows() -> None:
+    data = np.linspace(0, 0.99, 25)
+    provider = IncrementalProvider(
+        HistogramProvider(np.empty(0)), window_rows=10, max_windows=2
+    )
+
+    provider.append(data[:15])
+    # Configs first requested mid-window cover the rows of the ring.
+    provider.track(HISTOGRAM)
+    provider.append(data[15:])
+
+    counts = _scalar_to_numpy(provider.get_properties(HISTOGRAM)["counts"])
+    np.testing.assert_equal(
+        counts, np.histogram(data[10:], bins=4, range=(0, 1))[0]
+    )
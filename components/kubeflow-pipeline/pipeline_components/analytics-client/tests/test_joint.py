@@ -0,0 +1,79 @@
+import numpy as np
+
+from flwr_analytics_client.codec import decode_array, encode_array
+from flwr_analytics_client.joint import (
+    JointHistogramAccumulator,
+    JointHistogramProvider,
+)
+
+
+def _config(groups: np.ndarray, nbins: int, sparse: bool = False) -> dict:
+    hmins = np.full(groups.shape, -2.0)
+    hmaxs = np.full(groups.shape, 2.0)
+    return {
+        "groups": encode_array(groups),
+        "nbins": nbins,
+        "hmins": encode_array(hmins),
+        "hmaxs": encode_array(hmaxs),
+        "sparse": sparse,
+        "version": 1,
+    }
+
+
+def test_joint_histogram() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=(10_000, 3))
+    data[::10, 2] = np.nan
+    groups = np.array([[0, 1], [2, 0]])
+
+    provider = JointHistogramProvider(data)
+    properties = provider.get_properties(_config(groups, 8))
+
+    counts = decode_array(properties["counts"])
+    bins = decode_array(properties["bins"])
+    assert counts.shape == (2, 8, 8)
+    assert bins.shape == (2, 2, 9)
+    for group, group_counts in zip(groups, counts):
+        expected, _, _ = np.histogram2d(
+            data[:, group[0]],
+            data[:, group[1]],
+            bins=8,
+            range=[(-2, 2), (-2, 2)],
+        )
+        np.testing.assert_equal(group_counts, expected)
+
+
+def test_joint_histogram_sparse() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=(5_000, 4))
+    groups = np.array([[0, 1, 2, 3]])
+
+    provider = JointHistogramProvider(data)
+    properties = provider.get_properties(_config(groups, 4, sparse=True))
+
+    indices = decode_array(properties["indices"])
+    counts = decode_array(properties["counts"])
+    expected, _ = np.histogramdd(data, bins=4, range=[(-2, 2)] * 4)
+    dense = np.zeros(4**4)
+    dense[indices] = counts
+    np.testing.assert_equal(dense.reshape(4, 4, 4, 4), expected)
+    assert len(indices) == np.count_nonzero(expected)
+
+
+def test_joint_histogram_merge() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=(1_000, 2))
+    groups = np.array([[0, 1]])
+    hrange = np.full(groups.shape, 2.0)
+
+    for sparse in [False, True]:
+        total = JointHistogramAccumulator(groups, 5, -hrange, hrange, sparse)
+        total.update(data)
+        first = JointHistogramAccumulator(groups, 5, -hrange, hrange, sparse)
+        first.update(data[:300])
+        second = JointHistogramAccumulator(groups, 5, -hrange, hrange, sparse)
+        second.update(data[300:])
+        first.merge(second)
+
+        for key, value in total.result().items():
+            np.testing.assert_equal(first.result()[key], value)
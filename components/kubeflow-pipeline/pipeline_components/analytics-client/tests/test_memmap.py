@@ -0,0 +1,51 @@
+import io
+from pathlib import Path
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_client.correlation import CorrelationProvider
+from flwr_analytics_client.dataset import load_dataset
+from flwr_analytics_client.memmap import open_npy, open_raw
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def _test_data() -> np.ndarray:
+    return np.random.default_rng(4242).normal(size=(100, 3))
+
+
+def test_open_npy(tmp_path: Path) -> None:
+    path = tmp_path / "data.npy"
+    np.save(path, _test_data())
+
+    data = open_npy(path)
+
+    assert isinstance(data, np.memmap)
+    np.testing.assert_equal(data, _test_data())
+
+
+def test_open_raw(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"header" + _test_data().astype(np.float32).tobytes())
+
+    data = open_raw(path, dtype=np.float32, features=3, offset=6)
+
+    assert isinstance(data, np.memmap)
+    np.testing.assert_equal(data, _test_data().astype(np.float32))
+
+
+def test_correlation_from_memmap(tmp_path: Path) -> None:
+    path = tmp_path / "data.npy"
+    np.save(path, _test_data())
+
+    provider = CorrelationProvider(load_dataset(lambda: open_npy(path)))
+    properties = provider.get_properties({})
+
+    np.testing.assert_allclose(
+        _scalar_to_numpy(properties["multiply_sums"]),
+        _test_data().T @ _test_data(),
+    )
@@ -0,0 +1,103 @@
+from typing import Any, List
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    MIN_WORKER_ROWS,
+    Values,
+    accumulate,
+    split_chunks,
+)
+
+
+class SumAccumulator(MergeableAccumulator):
+    def __init__(self) -> None:
+        self.total = 0
+        self.chunks = 0
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        if np.any(chunk < 0):
+            raise ValueError("negative chunk")
+        self.total += int(np.sum(chunk))
+        self.chunks += 1
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        assert isinstance(other, SumAccumulator)
+        self.total += other.total
+        self.chunks += other.chunks
+
+    def result(self) -> Values:
+        return {"total": self.total}
+
+
+class ListAccumulator(Accumulator):
+    def __init__(self) -> None:
+        self.chunks: List[NDArray[Any]] = []
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        self.chunks.append(chunk)
+
+    def result(self) -> Values:
+        return {}
+
+
+def _chunks() -> List[NDArray[Any]]:
+    return [np.arange(i, i + 10) for i in range(0, 1000, 10)]
+
+
+def test_accumulate_workers() -> None:
+    [accumulator] = accumulate(_chunks(), lambda: [SumAccumulator()], 3)
+
+    assert isinstance(accumulator, SumAccumulator)
+    assert accumulator.total == sum(range(1000))
+    assert accumulator.chunks == 100
+
+
+def test_accumulate_not_mergeable() -> None:
+    # Chunks are folded in order by the calling thread.
+    sums, chunks = accumulate(
+        _chunks(), lambda: [SumAccumulator(), ListAccumulator()], 3
+    )
+
+    assert isinstance(chunks, ListAccumulator)
+    assert len(chunks.chunks) == 100
+    np.testing.assert_equal(chunks.chunks[1], np.arange(10, 20))
+
+
+def test_accumulate_worker_error() -> None:
+    chunks = _chunks()
+    chunks[42] = -chunks[42]
+
+    with pytest.raises(ValueError, match="negative chunk"):
+        accumulate(chunks, lambda: [SumAccumulator()], 3)
+
+
+def test_accumulate_workers_single_chunk() -> None:
+    chunk = np.arange(3 * MIN_WORKER_ROWS)
+
+    [accumulator] = accumulate([chunk], lambda: [SumAccumulator()], 3)
+
+    # Every worker folded a piece of the chunk.
+    assert isinstance(accumulator, SumAccumulator)
+    assert accumulator.total == int(np.sum(chunk))
+    assert accumulator.chunks == 3
+
+
+def test_split_chunks() -> None:
+    rows = 2 * MIN_WORKER_ROWS + 1
+    chunks = [np.arange(rows), np.arange(10), np.zeros((0, 2))]
+
+    pieces = list(split_chunks(chunks, workers=4))
+
+    # Pieces keep at least MIN_WORKER_ROWS rows.
+    assert [len(piece) for piece in pieces] == [
+        MIN_WORKER_ROWS + 1,
+        MIN_WORKER_ROWS,
+        10,
+        0,
+    ]
+    np.testing.assert_equal(np.concatenate(pieces[:2]), chunks[0])
@@ -0,0 +1,48 @@
+import io
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_client.fedbox import BoxPlotProvider
+from flwr_analytics_client.quantiles import QuantilesProvider
+from flwr_analytics_client.sketch import sketches_from_arrays
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def _test_data() -> np.ndarray:
+    return np.random.default_rng(4242).normal(size=(10_000, 3))
+
+
+def _median(properties: dict) -> np.ndarray:
+    sketches = sketches_from_arrays(
+        int(properties["k"]),
+        _scalar_to_numpy(properties["items"]),
+        _scalar_to_numpy(properties["sizes"]),
+        _scalar_to_numpy(properties["minimums"]),
+        _scalar_to_numpy(properties["maximums"]),
+    )
+    return np.array([sketch.quantiles(0.5) for sketch in sketches])
+
+
+def test_quantiles() -> None:
+    provider = QuantilesProvider(_test_data())
+
+    properties = provider.get_properties({"k": 100})
+
+    np.testing.assert_allclose(
+        _median(properties), np.median(_test_data(), axis=0), atol=0.1
+    )
+
+
+def test_boxplot_method() -> None:
+    provider = BoxPlotProvider(_test_data())
+
+    sketch = provider.get_properties({"method": "sketch"})
+    histogram = provider.get_properties({"nbins": 4, "hmin": 0, "hmax": 1})
+
+    assert _median(sketch).shape == (3,)
+    assert set(histogram) == {"counts", "bins"}
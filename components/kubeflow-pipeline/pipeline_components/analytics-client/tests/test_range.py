@@ -0,0 +1,37 @@
+import io
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_client.range import RangeProvider
+
+
+def _scalar_to_numpy(scalar: Scalar) -> np.ndarray:
+    buf = io.BytesIO(scalar)
+    return np.load(buf)
+
+
+def test_range() -> None:
+    data = np.array([[1.0, np.nan], [-3.0, 2.0], [5.0, 4.0]])
+    provider = RangeProvider(data)
+
+    properties = provider.get_properties({})
+
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["minimums"]), [-3.0, 2.0]
+    )
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["maximums"]), [5.0, 4.0]
+    )
+
+
+def test_range_sketches() -> None:
+    data = np.random.default_rng(4242).normal(size=(1_000, 2))
+    provider = RangeProvider(data)
+
+    properties = provider.get_properties({"k": 50})
+
+    assert {"items", "sizes"} <= set(properties)
+    np.testing.assert_equal(
+        _scalar_to_numpy(properties["minimums"]), data.min(axis=0)
+    )
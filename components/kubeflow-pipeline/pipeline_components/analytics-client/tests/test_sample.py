@@ -0,0 +1,129 @@
+from typing import Any
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from flwr_analytics_client.accumulator import (
+    Accumulator,
+    MergeableAccumulator,
+    Values,
+)
+from flwr_analytics_client.correlation import CorrelationProvider
+from flwr_analytics_client.sample import (
+    BernoulliAccumulator,
+    ReservoirAccumulator,
+    sampled,
+)
+
+
+class RowsAccumulator(MergeableAccumulator):
+    def __init__(self) -> None:
+        self.rows: NDArray[Any] = np.empty((0,))
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        self.rows = np.concatenate([self.rows, chunk])
+
+    def merge(self, other: MergeableAccumulator) -> None:
+        assert isinstance(other, RowsAccumulator)
+        self.rows = np.concatenate([self.rows, other.rows])
+
+    def result(self) -> Values:
+        return {"rows": np.sort(self.rows)}
+
+
+def test_bernoulli() -> None:
+    accumulator = BernoulliAccumulator(RowsAccumulator(), 0.1, seed=0)
+    for start in range(0, 100_000, 1000):
+        accumulator.update(np.arange(start, start + 1000))
+
+    result = accumulator.result()
+
+    assert result["population"] == 100_000
+    assert result["sample_size"] == len(result["rows"])
+    assert 9_000 < result["sample_size"] < 11_000
+    # Every row is sampled at most once.
+    assert len(np.unique(result["rows"])) == len(result["rows"])
+
+
+def test_reservoir() -> None:
+    accumulator = ReservoirAccumulator(RowsAccumulator(), 100, seed=0)
+    for start in range(0, 10_000, 300):
+        accumulator.update(np.arange(start, min(start + 300, 10_000)))
+
+    result = accumulator.result()
+
+    assert result["population"] == 10_000
+    assert result["sample_size"] == 100
+    rows = result["rows"]
+    assert len(np.unique(rows)) == 100
+    # Rows of all parts of the data are sampled.
+    assert np.min(rows) < 2_000 and np.max(rows) > 8_000
+
+
+def test_reservoir_small() -> None:
+    accumulator = ReservoirAccumulator(RowsAccumulator(), 100, seed=0)
+    accumulator.update(np.arange(10))
+
+    result = accumulator.result()
+
+    assert result["sample_size"] == 10
+    np.testing.assert_equal(result["rows"], np.arange(10))
+
+
+def test_reservoir_merge() -> None:
+    first = ReservoirAccumulator(RowsAccumulator(), 50, seed=1)
+    second = ReservoirAccumulator(RowsAccumulator(), 50, seed=2)
+    first.update(np.arange(1000))
+    second.update(np.arange(1000, 1500))
+
+    first.merge(second)
+    result = first.result()
+
+    assert result["population"] == 1500
+    assert result["sample_size"] == 50
+    assert len(np.unique(result["rows"])) == 50
+
+
+class CountAccumulator(Accumulator):
+    def __init__(self) -> None:
+        self.count = 0
+
+    def update(self, chunk: NDArray[Any]) -> None:
+        self.count += len(chunk)
+
+    def result(self) -> Values:
+        return {"count": self.count}
+
+
+def test_sampled() -> None:
+    accumulator = CountAccumulator()
+
+    assert sampled(accumulator, {}) is accumulator
+    with pytest.raises(TypeError):
+        sampled(accumulator, {"sample_rows": 10})
+    assert isinstance(
+        sampled(RowsAccumulator(), {"sample_rows": 10}), ReservoirAccumulator
+    )
+    assert isinstance(
+        sampled(RowsAccumulator(), {"sample_fraction": 0.5}),
+        BernoulliAccumulator,
+    )
+
+
+def test_correlation_sample() -> None:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=20_000)
+    data = np.stack([x, x + rng.normal(size=20_000)], axis=1)
+    provider = CorrelationProvider(data)
+
+    properties = provider.get_properties({"sample_fraction": 0.25})
+
+    assert properties["population"] == 20_000
+    assert properties["entries"] == properties["sample_size"]
+    assert 4_000 < properties["sample_size"] < 6_000
+
+    properties = provider.get_properties({"sample_rows": 1000})
+
+    assert properties["population"] == 20_000
+    assert properties["entries"] == 1000
@@ -0,0 +1,78 @@
+import numpy as np
+
+from flwr_analytics_client.sketch import (
+    QuantileSketch,
+    sketch_values,
+    sketches_from_arrays,
+)
+
+QUANTILES = np.linspace(0, 1, 21)
+
+
+def _test_data() -> np.ndarray:
+    return np.random.default_rng(4242).lognormal(size=100_000)
+
+
+def _rank_error(data: np.ndarray, estimates: np.ndarray) -> float:
+    ranks = np.searchsorted(np.sort(data), estimates) / len(data)
+    return float(np.max(np.abs(ranks - QUANTILES)))
+
+
+def test_quantiles() -> None:
+    sketch = QuantileSketch(seed=4242)
+    for chunk in np.array_split(_test_data(), 17):
+        sketch.update(chunk)
+
+    estimates = sketch.quantiles(QUANTILES)
+
+    assert sketch.count == len(_test_data())
+    assert sum(len(level) for level in sketch.levels) < 1000
+    assert _rank_error(_test_data(), estimates) < 0.02
+    assert estimates[0] == np.min(_test_data())
+    assert estimates[-1] == np.max(_test_data())
+
+
+def test_merge() -> None:
+    sketches = []
+    for i, part in enumerate(np.array_split(_test_data(), 10)):
+        sketch = QuantileSketch(seed=i)
+        sketch.update(part)
+        sketches.append(sketch)
+
+    merged = QuantileSketch(seed=4242)
+    for sketch in sketches:
+        merged.merge(sketch)
+
+    assert merged.count == len(_test_data())
+    assert _rank_error(_test_data(), merged.quantiles(QUANTILES)) < 0.02
+
+
+def test_ignore_nan() -> None:
+    sketch = QuantileSketch()
+    sketch.update(np.array([np.nan, 1.0, 2.0, np.nan]))
+
+    assert sketch.count == 2
+    np.testing.assert_equal(sketch.quantiles([0, 1]), [1.0, 2.0])
+    np.testing.assert_equal(QuantileSketch().quantiles([0.5]), [np.nan])
+
+
+def test_sketch_values() -> None:
+    sketches = [QuantileSketch(seed=4242), QuantileSketch(seed=4242)]
+    sketches[0].update(_test_data())
+    sketches[1].update(np.arange(10))
+
+    values = sketch_values(sketches)
+    decoded = sketches_from_arrays(
+        values["k"],
+        values["items"],
+        values["sizes"],
+        values["minimums"],
+        values["maximums"],
+    )
+
+    for sketch, expected in zip(decoded, sketches):
+        assert sketch.count == expected.count
+        assert len(sketch.levels) == len(expected.levels)
+        np.testing.assert_equal(
+            sketch.quantiles(QUANTILES), expected.quantiles(QUANTILES)
+        )
@@ -0,0 +1,48 @@
+import numpy as np
+
+from flwr_analytics_client.stats import (
+    SufficientStatistics,
+    pack_triangle,
+    sufficient_statistics,
+    unpack_triangle,
+)
+
+
+def test_sufficient_statistics() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(loc=1000.0, size=(1000, 6))
+
+    statistics = sufficient_statistics(data, batch_size=64)
+
+    np.testing.assert_equal(statistics.entries, 1000)
+    np.testing.assert_equal(statistics.features, 6)
+    np.testing.assert_allclose(statistics.sums, np.sum(data, axis=0))
+    np.testing.assert_allclose(
+        unpack_triangle(statistics.multiply_sums, 6), data.T @ data
+    )
+    np.testing.assert_allclose(statistics.variances, np.var(data, axis=0))
+
+
+def test_merge() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.gamma(shape=2.0, size=(300, 4))
+
+    merged = SufficientStatistics.empty(4)
+    for part in np.array_split(data, 7):
+        merged = merged.merge(sufficient_statistics(part))
+    statistics = sufficient_statistics(data)
+
+    np.testing.assert_equal(merged.entries, statistics.entries)
+    np.testing.assert_allclose(merged.sums, statistics.sums)
+    np.testing.assert_allclose(merged.multiply_sums, statistics.multiply_sums)
+    np.testing.assert_allclose(merged.variances, statistics.variances)
+
+
+def test_pack_triangle() -> None:
+    matrix = np.arange(16).reshape(4, 4)
+    matrix = matrix + matrix.T
+
+    packed = pack_triangle(matrix)
+
+    np.testing.assert_equal(packed, matrix[np.triu_indices(4)])
+    np.testing.assert_equal(unpack_triangle(packed, 4), matrix)
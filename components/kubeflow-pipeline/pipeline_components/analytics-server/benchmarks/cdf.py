@@ -0,0 +1,48 @@
+"""Benchmark of histogram quantiles.
+
+Run with 'python -m benchmarks.cdf' from the analytics-server directory.
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from flwr_analytics_server.cdf import HistogramCDF
+from flwr_analytics_server.fedhist import HistogramData
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bins",
+        type=int,
+        nargs="+",
+        default=[1_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--quantiles", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=1_000_000)
+    q = np.linspace(0, 1, args.quantiles)
+
+    print(f"{'bins':>10} {'build [ms]':>12} {'query [ms]':>12}")
+    for nbins in args.bins:
+        histogram = HistogramData(*np.histogram(data, bins=nbins))
+        build = min(
+            timeit.repeat(
+                lambda: HistogramCDF(histogram), number=1, repeat=args.repeat
+            )
+        )
+        cdf = HistogramCDF(histogram)
+        query = min(
+            timeit.repeat(
+                lambda: cdf.quantiles(q), number=1, repeat=args.repeat
+            )
+        )
+        print(f"{nbins:>10} {1000 * build:>12.3f} {1000 * query:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Scaling benchmark of the federated correlation aggregation.
+
+Run with 'python -m benchmarks.correlation' from the analytics-server
+directory.
+"""
+import argparse
+import timeit
+from typing import List
+
+import numpy as np
+
+from flwr_analytics_server.correlation import (
+    AggregationData,
+    distributed_correlation,
+    pack_triangle,
+)
+
+
+def _client_data(features: int, clients: int) -> List[AggregationData]:
+    rng = np.random.default_rng(4242)
+    # A packed Gram matrix per client doesn't fit into memory for the wider
+    # tables, hence all clients share the same one.
+    data = rng.normal(size=(2 * features, features))
+    multiply_sums = pack_triangle(data.T @ data)
+
+    return [
+        AggregationData(
+            num_features=features,
+            num_entries=data.shape[0],
+            sums=rng.normal(size=features),
+            multiply_sums=multiply_sums,
+            variances=rng.uniform(0.5, 1.5, size=features),
+        )
+        for _ in range(clients)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--features",
+        type=int,
+        nargs="+",
+        default=[100, 1_000, 2_000, 5_000, 10_000],
+    )
+    parser.add_argument(
+        "--clients",
+        type=int,
+        nargs="+",
+        default=[10, 300],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'features':>10} {'clients':>10} {'seconds':>10}")
+    for features in args.features:
+        for clients in args.clients:
+            data = _client_data(features, clients)
+            seconds = min(
+                timeit.repeat(
+                    lambda: distributed_correlation(features, data),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(f"{features:>10} {clients:>10} {seconds:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,33 @@
 import argparse
 import logging
+import sys
 from pathlib import Path
-from typing import Dict, cast
+from typing import Dict, List, cast
 
 import flwr
 from flwr.server import Server, ServerConfig
 from flwr.server.client_manager import SimpleClientManager
 
+from .batch import BatchProvider, split_arguments
+from .cardinality import CardinalityProvider
+from .codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    COMPRESSION_ZSTD,
+    available_compression,
+)
 from .correlation import CorrelationProvider
+from .fanout import DEFAULT_MAX_CONCURRENCY, FanOut
+from .fedbox import BoxPlotProvider
 from .fedhist import HistogramProvider
+from .frequency import FrequencyProvider
+from .joint import JointHistogramProvider
 from .provider import AnalyticsProvider
-from .server import AnalyticsServer
+from .quantiles import QuantilesProvider
+from .range import RangeProvider
+from .regression import RegressionProvider
+from .server import DEFAULT_CONNECTION_TIMEOUT, AnalyticsServer
+from .window import WindowProvider
 
 log = logging.getLogger(__name__)
 
@@ -18,56 +35,157 @@ if __name__ == "__main__":
     providers: Dict[str, AnalyticsProvider] = {
         "correlation": CorrelationProvider(),
         "histogram": HistogramProvider(),
+        "boxplot": BoxPlotProvider(),
+        "quantiles": QuantilesProvider(),
+        "range": RangeProvider(),
+        "cardinality": CardinalityProvider(),
+        "frequency": FrequencyProvider(),
+        "joint": JointHistogramProvider(),
+        "regression": RegressionProvider(),
     }
 
-    parser = argparse.ArgumentParser()
+    # Several providers can be given, each followed by its own arguments.
+    # They are then computed with a single request per client.
+    parser = argparse.ArgumentParser(
+        usage="%(prog)s [options] provider [provider options] [provider ...]"
+    )
     parser.add_argument(
         "--min-available-clients",
         type=int,
         default=2,
         help="Minimal number of clients to participate in federated learning",
     )
+    parser.add_argument(
+        "--connection-timeout",
+        type=float,
+        default=DEFAULT_CONNECTION_TIMEOUT,
+        help="Seconds to wait for the minimal number of clients to connect",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        help="Seconds to wait for clients to answer, stragglers are dropped. "
+        "No deadline if missing or not positive",
+    )
+    parser.add_argument(
+        "--min-quorum",
+        type=float,
+        default=0.0,
+        help="Fraction of the minimal number of clients required to answer",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="Maximal number of concurrent calls to clients",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=[COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD],
+        default=COMPRESSION_NONE,
+        help="Compression of the arrays sent by clients",
+    )
+    parser.add_argument(
+        "--float32",
+        action="store_true",
+        help="Ask clients to send aggregate statistics which tolerate it, "
+        "e.g. variances, as float32. Values of the data, e.g. histogram bins "
+        "and quantile sketch items, as well as sums and products which lose "
+        "their precision to cancellation are always sent as float64",
+    )
+    parser.add_argument(
+        "--window-seconds",
+        type=float,
+        help="Only use the rows of this many seconds, kept by the clients "
+        "in time buckets. Clients not run with ANALYTICS_BUCKET_SECONDS are "
+        "dropped",
+    )
+    parser.add_argument(
+        "--bucket-seconds",
+        type=float,
+        help="Length of the time buckets of '--window-seconds'",
+    )
     parser.add_argument(
         "--metadata-output-path",
         type=str,
         help="Path to the file containing JSON metadata",
     )
 
-    subparsers = parser.add_subparsers(dest="provider", required=True)
-
+    provider_parsers: Dict[str, argparse.ArgumentParser] = {}
     for name, p in providers.items():
-        provider_parser = subparsers.add_parser(name)
+        provider_parser = argparse.ArgumentParser(prog=f"{parser.prog} {name}")
         p.add_arguments(provider_parser)
+        provider_parsers[name] = provider_parser
 
-    args = parser.parse_args()
-
-    log.info(f"using {args.provider}")
-
-    provider = providers.get(args.provider)
-    if provider is None:
-        raise Exception(f"Unknown provider {args.provider}")
-
-    provider.set_arguments(args)
+    common_args, provider_args = split_arguments(
+        sys.argv[1:], parser, provider_parsers
+    )
+    args = parser.parse_args(common_args)
+    if not provider_args:
+        parser.error(f"a provider is required: {', '.join(providers)}")
+
+    selected: List[AnalyticsProvider] = []
+    for name, argv in provider_args:
+        log.info(f"using {name}")
+
+        p = providers[name]
+        p.set_arguments(provider_parsers[name].parse_args(argv))
+        if args.window_seconds is not None:
+            p = WindowProvider(
+                p,
+                window_seconds=args.window_seconds,
+                bucket_seconds=(
+                    args.bucket_seconds
+                    if args.bucket_seconds is not None
+                    else args.window_seconds
+                ),
+            )
+        selected.append(p)
+
+    try:
+        provider = (
+            selected[0] if len(selected) == 1 else BatchProvider(selected)
+        )
+        # Batched providers must agree on the options of shared rounds.
+        provider.preliminary()
+    except ValueError as e:
+        parser.error(str(e))
 
     client_manager = SimpleClientManager()
-
+    fanout = FanOut(max_concurrency=args.max_concurrency)
+
+    analytics_server = AnalyticsServer(
+        client_manager=client_manager,
+        min_available_clients=args.min_available_clients,
+        provider=provider,
+        connection_timeout=args.connection_timeout,
+        request_timeout=(
+            args.request_timeout
+            if args.request_timeout is not None and args.request_timeout > 0
+            else None
+        ),
+        min_quorum=args.min_quorum,
+        fanout=fanout,
+        compression=available_compression(args.compression),
+        float32=args.float32,
+    )
     # The cast to 'Server' is a hack. There isn't an ABC for a server and our
     # implementation is only using a few parts of it, hence doesn't inherit
     # from 'Server'. By casting here, the type system will ignore all missing
     # functions from 'Server' not present in 'AnalyticsServer'.
-    server = cast(
-        Server,
-        AnalyticsServer(
-            client_manager=client_manager,
-            min_available_clients=args.min_available_clients,
-            provider=provider,
-        ),
-    )
+    server = cast(Server, analytics_server)
 
-    flwr.server.start_server(server=server, config=ServerConfig(num_rounds=1))
+    try:
+        flwr.server.start_server(
+            server=server, config=ServerConfig(num_rounds=1)
+        )
+    finally:
+        fanout.shutdown()
 
     log.info(f"{provider.name} completed, preparing output")
-    metadata = provider.result_metadata_json()
+    metadata = analytics_server.result_metadata_json(
+        provider.result_metadata_json()
+    )
 
     # The output paths might not exist yet.
     # In that case create it.
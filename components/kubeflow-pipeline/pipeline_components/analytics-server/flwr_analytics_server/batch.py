@@ -0,0 +1,165 @@
+import json
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flwr.common import Properties, Scalar
+
+from flwr_analytics_server.provider import AnalyticsProvider
+
+# Key of the request config listing the providers of a batched request.
+# Config and properties of every provider are prefixed with its name and
+# 'SEPARATOR', e.g. "histogram/nbins".
+PROVIDERS_KEY = "providers"
+SEPARATOR = "/"
+
+
+class BatchProvider(AnalyticsProvider):
+    """Provider running several providers with a single request per client.
+
+    Clients compute all providers with shared passes over their data. The
+    metadata outputs of the providers are combined into a single one.
+    """
+
+    def __init__(self, providers: Sequence[AnalyticsProvider]) -> None:
+        names = [p.name for p in providers]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate providers in {', '.join(names)}")
+
+        self._providers = list(providers)
+        self._preliminaries: List[
+            Tuple[AnalyticsProvider, AnalyticsProvider]
+        ] = []
+        self._shared: Dict[str, AnalyticsProvider] = {}
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        data: Dict[str, Scalar] = {
+            PROVIDERS_KEY: ",".join(p.name for p in self._providers)
+        }
+        for provider in self._providers:
+            for key, value in provider.client_input_data().items():
+                data[f"{provider.name}{SEPARATOR}{key}"] = value
+
+        return data
+
+    def preliminary(self) -> Optional[AnalyticsProvider]:
+        """Batch the preliminary rounds of all providers.
+
+        Providers asking for the same preliminary provider share its round.
+        Preliminaries of different options are merged if they can be, e.g.
+        ranges of different features into the ranges of all of them.
+        """
+        shared: Dict[str, AnalyticsProvider] = {}
+        self._preliminaries = []
+        for provider in self._providers:
+            preliminary = provider.preliminary()
+            if preliminary is None:
+                continue
+
+            first = shared.setdefault(preliminary.name, preliminary)
+            if first.client_input_data() == preliminary.client_input_data():
+                preliminary = first
+            else:
+                merged = first.merge_preliminary(preliminary)
+                if merged is None:
+                    raise ValueError(
+                        f"Conflicting options of the preliminary "
+                        f"{first.name} of {provider.name} and of other "
+                        f"providers"
+                    )
+                shared[preliminary.name] = merged
+            self._preliminaries.append((provider, preliminary))
+
+        self._shared = shared
+        if not shared:
+            return None
+        if len(shared) == 1:
+            return next(iter(shared.values()))
+
+        return BatchProvider(list(shared.values()))
+
+    def configure(self, preliminary: AnalyticsProvider) -> None:
+        # The preliminary providers were aggregated as part of 'preliminary'.
+        for provider, own in self._preliminaries:
+            merged = self._shared[own.name]
+            if own is not merged:
+                own.take_result(merged)
+            provider.configure(own)
+
+    def add_client_data(self, properties: Properties) -> None:
+        for provider in self._providers:
+            prefix = f"{provider.name}{SEPARATOR}"
+            provider.add_client_data(
+                {
+                    key[len(prefix) :]: value
+                    for key, value in properties.items()
+                    if key.startswith(prefix)
+                }
+            )
+
+    def aggregate(self) -> None:
+        for provider in self._providers:
+            provider.aggregate()
+
+    def result_metadata_json(self) -> str:
+        outputs: List[Any] = []
+        for provider in self._providers:
+            outputs.extend(
+                json.loads(provider.result_metadata_json())["outputs"]
+            )
+
+        metadata = {
+            "version": 1,
+            "outputs": outputs,
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        pass
+
+    def set_arguments(self, args: Namespace) -> None:
+        pass
+
+    @property
+    def name(self) -> str:
+        return ",".join(p.name for p in self._providers)
+
+
+def split_arguments(
+    argv: Sequence[str],
+    parser: ArgumentParser,
+    provider_parsers: Dict[str, ArgumentParser],
+) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+    """Split command line arguments at provider names.
+
+    Returns the arguments preceding the first provider and the arguments
+    following each provider, e.g. '--min-available-clients 2 correlation
+    histogram --nbins 10' is split into '--min-available-clients 2',
+    'correlation' without arguments and 'histogram' with '--nbins 10'. A
+    provider name following an option that takes a value, as in
+    '--method histogram', is that value.
+    """
+    common: List[str] = []
+    segments: List[Tuple[str, List[str]]] = []
+    current, previous = parser, ""
+    for arg in argv:
+        if arg in provider_parsers and not _takes_value(current, previous):
+            segments.append((arg, []))
+            current, previous = provider_parsers[arg], ""
+            continue
+
+        if segments:
+            segments[-1][1].append(arg)
+        else:
+            common.append(arg)
+        previous = arg
+
+    return common, segments
+
+
+def _takes_value(parser: ArgumentParser, option: str) -> bool:
+    for action in parser._actions:
+        if option in action.option_strings:
+            return action.nargs != 0
+
+    return False
@@ -0,0 +1,135 @@
+import json
+import math
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional, cast
+
+import numpy as np
+from flwr.common import Properties, Scalar
+from numpy.typing import NDArray
+
+from flwr_analytics_server.provider import (
+    AnalyticsProvider,
+    add_feature_arguments,
+    bytes_to_numpy,
+    feature_input_data,
+    feature_labels,
+)
+
+# Clients send 2^precision one byte registers per feature, see
+# 'estimate_cardinality' for the error.
+DEFAULT_PRECISION = 12
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+
+class CardinalityProvider(AnalyticsProvider):
+    """Number of distinct values of every feature across all clients.
+
+    Clients send the registers of a HyperLogLog sketch per feature, whose
+    size only depends on 'precision'. Sketches are merged by their
+    element-wise maximum, hence values present on several clients are only
+    counted once.
+    """
+
+    def __init__(self) -> None:
+        self._registers: Optional[NDArray[np.uint8]] = None
+        self.precision = DEFAULT_PRECISION
+        self.features: Optional[List[int]] = None
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        return {
+            "precision": self.precision,
+            **feature_input_data(self.features),
+        }
+
+    def add_client_data(self, properties: Properties) -> None:
+        registers = bytes_to_numpy(cast(bytes, properties["registers"]))
+        if self._registers is None:
+            self._registers = registers
+            return
+        if registers.shape != self._registers.shape:
+            raise ValueError(
+                f"Expected registers of shape {self._registers.shape}, "
+                f"got {registers.shape}"
+            )
+
+        self._registers = np.maximum(self._registers, registers)
+
+    def aggregate(self) -> None:
+        if self._registers is None:
+            raise ValueError("No client data to aggregate")
+
+        self._result = [
+            estimate_cardinality(registers) for registers in self._registers
+        ]
+
+    def result_metadata_json(self) -> str:
+        error = 1.04 / math.sqrt(1 << self.precision)
+        labels = feature_labels(self.features, len(self._result))
+        table = ["| Feature | Distinct values |", "| --- | --- |"]
+        for label, cardinality in zip(labels, self._result):
+            table.append(f"| {label} | {cardinality:.0f} |")
+
+        metadata = {
+            "version": 1,
+            "outputs": [
+                {
+                    "type": "markdown",
+                    "storage": "inline",
+                    "source": "\n".join(
+                        [
+                            "## Cardinality",
+                            "",
+                            f"Estimates with a standard error of "
+                            f"{error:.1%}.",
+                            "",
+                            *table,
+                        ]
+                    ),
+                },
+            ],
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--precision",
+            type=int,
+            choices=range(MIN_PRECISION, MAX_PRECISION + 1),
+            default=DEFAULT_PRECISION,
+            metavar=f"{{{MIN_PRECISION}..{MAX_PRECISION}}}",
+            help="Clients send 2^precision bytes per feature, the standard "
+            "error is 1.04 / sqrt(2^precision)",
+        )
+        add_feature_arguments(parser)
+
+    def set_arguments(self, args: Namespace) -> None:
+        self.precision = args.precision
+        self.features = args.features
+
+    @property
+    def name(self) -> str:
+        return "cardinality"
+
+
+def estimate_cardinality(registers: NDArray[Any]) -> float:
+    """Estimate the number of distinct values of a HyperLogLog sketch.
+
+    The standard error is 1.04 / sqrt(m) for m registers. Small numbers of
+    distinct values, leaving many registers empty, are estimated by linear
+    counting instead (Flajolet et al., 2007). Hashes have 64 bits, hence no
+    correction is needed for large numbers.
+    """
+    m = len(registers)
+    if m >= 128:
+        alpha = 0.7213 / (1 + 1.079 / m)
+    else:
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+    estimate = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros > 0:
+        return m * math.log(m / zeros)
+
+    return float(estimate)
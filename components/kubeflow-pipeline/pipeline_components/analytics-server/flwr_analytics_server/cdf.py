@@ -0,0 +1,78 @@
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from flwr_analytics_server.fedhist import HistogramData
+
+
+class HistogramCDF:
+    """Cumulative distribution of one histogram or of one per feature.
+
+    'counts' are either a single histogram or a (features x nbins) matrix
+    and 'bins' the edges shared by all features or one row of edges per
+    feature. The cumulative counts are computed once, quantiles are then
+    answered for all features at once with a binary search and a linear
+    interpolation inside the bin, i.e. values are assumed to be uniformly
+    distributed within each bin.
+    """
+
+    def __init__(self, histogram: HistogramData) -> None:
+        self._counts = np.atleast_2d(histogram.counts).astype(np.float64)
+        features, nbins = self._counts.shape
+        self._bins = np.broadcast_to(
+            np.asarray(histogram.bins, dtype=np.float64), (features, nbins + 1)
+        )
+
+        cumulative = np.cumsum(self._counts, axis=1)
+        self._totals = cumulative[:, -1]
+        # Shifting every feature by the total of the preceding ones makes the
+        # flattened cumulative counts of all features sorted, so that a
+        # single search answers the quantiles of all features.
+        self._offsets = np.cumsum(self._totals) - self._totals
+        self._cumulative = (cumulative + self._offsets[:, np.newaxis]).ravel()
+
+    @property
+    def features(self) -> int:
+        return int(self._counts.shape[0])
+
+    def quantiles(self, q: ArrayLike) -> NDArray[Any]:
+        """Estimate the quantiles 'q' of every feature.
+
+        Returns a (features x quantiles) matrix, NaN for empty histograms.
+        The 0 and 1 quantiles are the outer edges of the first and last
+        non-empty bins.
+        """
+        q = np.clip(np.asarray(q, dtype=np.float64), 0.0, 1.0)
+        features, nbins = self._counts.shape
+
+        ranks = q * self._totals[:, np.newaxis]
+        shifted = ranks + self._offsets[:, np.newaxis]
+        # The first bin whose cumulative count reaches the rank holds the
+        # quantile. For rank 0 it is the first non-empty bin instead.
+        indices = np.where(
+            ranks > 0,
+            np.searchsorted(self._cumulative, shifted, side="left"),
+            np.searchsorted(self._cumulative, shifted, side="right"),
+        )
+        rows = np.arange(features)[:, np.newaxis]
+        indices = np.clip(indices - rows * nbins, 0, nbins - 1)
+
+        counts = self._counts[rows, indices]
+        before = self._cumulative.reshape(features, nbins)[rows, indices]
+        before = before - self._offsets[:, np.newaxis] - counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(counts > 0, (ranks - before) / counts, 0.0)
+
+        lower = self._bins[rows, indices]
+        upper = self._bins[rows, indices + 1]
+        result = lower + np.clip(fraction, 0.0, 1.0) * (upper - lower)
+
+        return np.where(self._totals[:, np.newaxis] > 0, result, np.nan)
+
+
+def histogram_quantiles(
+    histogram: HistogramData, q: ArrayLike
+) -> NDArray[Any]:
+    """Estimate the quantiles 'q' of every feature of 'histogram'."""
+    return HistogramCDF(histogram).quantiles(q)
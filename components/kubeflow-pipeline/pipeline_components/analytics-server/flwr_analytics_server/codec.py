@@ -0,0 +1,131 @@
+"""Wire codec for the arrays exchanged between analytics clients and server.
+
+An encoded array is a small header followed by the raw array buffer::
+
+    magic (4) | version (1) | compression (1) | dtype length (1) | dtype
+    | ndim (1) | shape (ndim x uint64)
+
+The buffer is optionally compressed with zlib or, if the 'zstandard'
+package is installed, with zstd. Uncompressed arrays are decoded without a
+copy. Arrays written by 'np.save' (the format used before version 1) are
+still decoded.
+
+This module is kept identical in the analytics client and server.
+"""
+
+import io
+import struct
+import zlib
+from typing import Any, Optional, cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+CODEC_VERSION = 1
+
+MAGIC = b"\x93FLA"
+NPY_MAGIC = b"\x93NUMPY"
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_ZSTD = "zstd"
+
+_COMPRESSION_IDS = {
+    COMPRESSION_NONE: 0,
+    COMPRESSION_ZLIB: 1,
+    COMPRESSION_ZSTD: 2,
+}
+_COMPRESSION_NAMES = {v: k for k, v in _COMPRESSION_IDS.items()}
+
+_HEADER = struct.Struct("<4sBBB")
+
+# Keys of the request config through which the server asks for the codec.
+# Clients only use the codec if 'codec' is set, and 'np.save' otherwise.
+CONFIG_VERSION = "codec"
+CONFIG_COMPRESSION = "codec_compression"
+CONFIG_FLOAT32 = "codec_float32"
+
+
+def available_compression(compression: str) -> str:
+    """Return 'compression' or a fallback if it isn't available."""
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError(f"Unknown compression {compression}")
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        return COMPRESSION_ZLIB
+
+    return compression
+
+
+def encode_array(
+    array: NDArray[Any],
+    compression: str = COMPRESSION_NONE,
+    float32: bool = False,
+) -> bytes:
+    """Encode an array, optionally compressed and downcast to float32."""
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        raise ValueError("Arrays of objects can't be encoded")
+    if float32 and array.dtype == np.float64:
+        array = array.astype(np.float32)
+
+    compression = available_compression(compression)
+    dtype = array.dtype.str.encode()
+
+    header = _HEADER.pack(
+        MAGIC, CODEC_VERSION, _COMPRESSION_IDS[compression], len(dtype)
+    )
+    shape = struct.pack(f"<B{array.ndim}Q", array.ndim, *array.shape)
+
+    data = np.ascontiguousarray(array).tobytes()
+    if compression == COMPRESSION_ZLIB:
+        data = zlib.compress(data)
+    elif compression == COMPRESSION_ZSTD:
+        data = zstandard.ZstdCompressor().compress(data)
+
+    return header + dtype + shape + data
+
+
+def decode_array(data: bytes) -> NDArray[Any]:
+    """Decode an array encoded by 'encode_array' or 'np.save'.
+
+    Uncompressed arrays are read-only views of 'data'.
+    """
+    if data.startswith(NPY_MAGIC):
+        return cast(NDArray[Any], np.load(io.BytesIO(data)))
+
+    magic, version, compression_id, dtype_length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded array")
+    if version > CODEC_VERSION:
+        raise ValueError(f"Unsupported codec version {version}")
+
+    offset = _HEADER.size
+    dtype = np.dtype(data[offset : offset + dtype_length].decode())
+    offset += dtype_length
+
+    (ndim,) = struct.unpack_from("<B", data, offset)
+    shape = struct.unpack_from(f"<{ndim}Q", data, offset + 1)
+    offset += 1 + 8 * ndim
+
+    compression = _COMPRESSION_NAMES.get(compression_id)
+    buffer: Optional[bytes] = None
+    if compression == COMPRESSION_ZLIB:
+        buffer = zlib.decompress(data[offset:])
+    elif compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Decoding zstd requires the zstandard package")
+        buffer = zstandard.ZstdDecompressor().decompress(data[offset:])
+    elif compression != COMPRESSION_NONE:
+        raise ValueError(f"Unknown compression {compression_id}")
+
+    if buffer is None:
+        array = np.frombuffer(data, dtype=dtype, offset=offset)
+    else:
+        array = np.frombuffer(buffer, dtype=dtype)
+
+    return array.reshape(shape)
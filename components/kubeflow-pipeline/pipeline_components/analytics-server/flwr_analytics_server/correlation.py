@@ -2,14 +2,26 @@ import io
 import json
 from argparse import ArgumentParser, Namespace
 from dataclasses import dataclass
-from typing import Any, Dict, List, cast
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 import matplotlib.pyplot as plt
 import numpy as np
 from flwr.common import Properties, Scalar
 from numpy.typing import NDArray
 
-from flwr_analytics_server.provider import AnalyticsProvider, bytes_to_numpy
+from flwr_analytics_server.provider import (
+    AnalyticsProvider,
+    add_feature_arguments,
+    add_sample_arguments,
+    bytes_to_numpy,
+    feature_input_data,
+    feature_labels,
+    sample_input_data,
+)
+
+# Number of feature pairs up to which the confidence intervals are listed.
+MAX_INTERVAL_PAIRS = 50
 
 
 @dataclass
@@ -21,57 +33,215 @@ class AggregationData:
     variances: NDArray[Any]
 
 
+@dataclass
+class CorrelationAccumulator:
+    """Running totals of the client statistics.
+
+    'multiply_sums' is the upper triangle of the symmetric Gram matrix,
+    packed row by row (see 'pack_triangle'). 'squared_deviations' is the sum
+    of squared deviations around the mean of all entries added so far.
+    Client contributions are merged with the pairwise update of Chan et al.,
+    so that the memory needed is independent of the number of clients.
+    """
+
+    num_features: int
+    num_entries: int
+    sums: NDArray[Any]
+    multiply_sums: NDArray[Any]
+    squared_deviations: NDArray[Any]
+
+    @classmethod
+    def empty(cls, num_features: int) -> "CorrelationAccumulator":
+        return cls(
+            num_features=num_features,
+            num_entries=0,
+            sums=np.zeros(num_features),
+            multiply_sums=np.zeros(triangle_size(num_features)),
+            squared_deviations=np.zeros(num_features),
+        )
+
+    def add(self, data: AggregationData) -> None:
+        if data.num_features != self.num_features:
+            raise ValueError(
+                f"Expected {self.num_features} features, "
+                f"got {data.num_features}"
+            )
+        if data.num_entries == 0:
+            return
+
+        num_entries = self.num_entries + data.num_entries
+        client_avg = data.sums / data.num_entries
+        if self.num_entries > 0:
+            delta = client_avg - self.sums / self.num_entries
+            self.squared_deviations += np.power(delta, 2) * (
+                self.num_entries * data.num_entries / num_entries
+            )
+        self.squared_deviations += data.num_entries * data.variances
+
+        self.num_entries = num_entries
+        self.sums += data.sums
+        if data.multiply_sums.ndim == 2:
+            self.multiply_sums += pack_triangle(data.multiply_sums)
+        else:
+            self.multiply_sums += data.multiply_sums
+
+    def correlation(self) -> NDArray[Any]:
+        """Return the packed upper triangle of the correlation matrix."""
+        variances = self.squared_deviations / self.num_entries
+        covariances = _calc_covariances(
+            self.num_features, self.num_entries, self.sums, self.multiply_sums
+        )
+
+        deviations = np.sqrt(variances)
+        offset = 0
+        for i in range(self.num_features):
+            row = slice(offset, offset + self.num_features - i)
+            covariances[row] /= deviations[i] * deviations[i:]
+            offset += self.num_features - i
+
+        return covariances
+
+
 class CorrelationProvider(AnalyticsProvider):
+    """Correlation matrix of all features or of the selected 'features'.
+
+    Clients then only compute the Gram matrix of the selected features.
+    With 'sample_fraction' or 'sample_rows', clients only compute their
+    statistics on a uniform sample of their rows and the result comes with
+    'confidence' intervals of every correlation.
+    """
+
     def __init__(self) -> None:
-        self._client_data: List[AggregationData] = []
+        self._accumulator: Optional[CorrelationAccumulator] = None
+        self._population = 0
+        self.features: Optional[List[int]] = None
+        self.sample_fraction: Optional[float] = None
+        self.sample_rows: Optional[int] = None
+        self.confidence = 0.95
+
+    @property
+    def sampled(self) -> bool:
+        return self.sample_fraction is not None or self.sample_rows is not None
 
     def client_input_data(self) -> Dict[str, Scalar]:
-        return {}
+        return {
+            "packed": True,
+            **feature_input_data(self.features),
+            **sample_input_data(self.sample_fraction, self.sample_rows),
+        }
 
     def add_client_data(self, properties: Properties) -> None:
-        self._client_data.append(
-            AggregationData(
-                num_features=int(properties["features"]),
-                num_entries=int(properties["entries"]),
-                sums=bytes_to_numpy(cast(bytes, properties["sums"])),
-                multiply_sums=bytes_to_numpy(
-                    cast(bytes, properties["multiply_sums"])
-                ),
-                variances=bytes_to_numpy(cast(bytes, properties["variances"])),
-            )
+        data = AggregationData(
+            num_features=int(properties["features"]),
+            num_entries=int(properties["entries"]),
+            sums=bytes_to_numpy(cast(bytes, properties["sums"])),
+            multiply_sums=bytes_to_numpy(
+                cast(bytes, properties["multiply_sums"])
+            ),
+            variances=bytes_to_numpy(cast(bytes, properties["variances"])),
         )
 
+        if self._accumulator is None:
+            self._accumulator = CorrelationAccumulator.empty(data.num_features)
+        self._accumulator.add(data)
+        self._population += int(properties.get("population", data.num_entries))
+
     def aggregate(self) -> None:
-        num_features = self._client_data[0].num_features
-        self._result = distributed_correlation(num_features, self._client_data)
+        if self._accumulator is None:
+            raise ValueError("No client data to aggregate")
+
+        # The result is kept packed and only unpacked for rendering.
+        self._num_features = self._accumulator.num_features
+        self._result = self._accumulator.correlation()
+        self._intervals: Optional[Tuple[NDArray[Any], NDArray[Any]]] = None
+        if self.sampled:
+            self._intervals = correlation_intervals(
+                self._result, self._accumulator.num_entries, self.confidence
+            )
 
     def result_metadata_json(self) -> str:
         fig_svg = io.BytesIO()
 
         fig, ax = plt.subplots()
-        ax.matshow(self._result)
+        ax.matshow(unpack_triangle(self._result, self._num_features))
+        if self.features is not None:
+            labels = feature_labels(self.features, self._num_features)
+            ax.set_xticks(range(self._num_features), labels)
+            ax.set_yticks(range(self._num_features), labels)
 
         plt.savefig(fig_svg, format="svg")
 
-        # Write Kubeflow pipeline metadata
-        metadata = {
-            "version": 1,
-            "outputs": [
+        outputs = [
+            {
+                "type": "web-app",
+                "storage": "inline",
+                "source": fig_svg.getvalue().decode("utf-8"),
+            },
+        ]
+        if self._intervals is not None:
+            outputs.append(
                 {
-                    "type": "web-app",
+                    "type": "markdown",
                     "storage": "inline",
-                    "source": fig_svg.getvalue().decode("utf-8"),
-                },
-            ],
-        }
+                    "source": "\n".join(self._interval_summary()),
+                }
+            )
+
+        # Write Kubeflow pipeline metadata
+        metadata = {"version": 1, "outputs": outputs}
 
         return json.dumps(metadata)
 
+    def _interval_summary(self) -> List[str]:
+        assert self._accumulator is not None and self._intervals is not None
+        lower, upper = self._intervals
+        lines = [
+            "## Sample",
+            "",
+            f"Correlations of a sample of {self._accumulator.num_entries} "
+            f"of {self._population} rows, with "
+            f"{self.confidence:.0%} confidence intervals.",
+        ]
+
+        labels = feature_labels(self.features, self._num_features)
+        pairs = [
+            (i, j)
+            for i in range(self._num_features)
+            for j in range(i, self._num_features)
+        ]
+        off_diagonal = [k for k, (i, j) in enumerate(pairs) if i != j]
+        if not 0 < len(off_diagonal) <= MAX_INTERVAL_PAIRS:
+            return lines
+
+        lines += [
+            "",
+            "| Features | Correlation | Lower | Upper |",
+            "| --- | --- | --- | --- |",
+        ]
+        for k in off_diagonal:
+            i, j = pairs[k]
+            lines.append(
+                f"| {labels[i]}, {labels[j]} | {self._result[k]:.3f} "
+                f"| {lower[k]:.3f} | {upper[k]:.3f} |"
+            )
+
+        return lines
+
     def add_arguments(self, parser: ArgumentParser) -> None:
-        pass
+        add_feature_arguments(parser)
+        add_sample_arguments(parser)
+        parser.add_argument(
+            "--confidence",
+            type=float,
+            default=0.95,
+            help="Confidence level of the intervals of sampled correlations",
+        )
 
     def set_arguments(self, args: Namespace) -> None:
-        pass
+        self.features = args.features
+        self.sample_fraction = args.sample_fraction
+        self.sample_rows = args.sample_rows
+        self.confidence = args.confidence
 
     @property
     def name(self) -> str:
@@ -81,47 +251,63 @@ class CorrelationProvider(AnalyticsProvider):
 def distributed_correlation(
     num_features: int, data: List[AggregationData]
 ) -> NDArray[Any]:
-    total_entries = np.sum([d.num_entries for d in data])
-    total_sums = np.sum([d.sums for d in data], axis=0)
-    total_multiply_sums = np.sum([d.multiply_sums for d in data], axis=0)
+    accumulator = CorrelationAccumulator.empty(num_features)
+    for d in data:
+        accumulator.add(d)
 
-    variances = _calc_variances(num_features, total_entries, total_sums, data)
-    covariances = _calc_covariances(
-        num_features, total_entries, total_sums, total_multiply_sums
-    )
+    return accumulator.correlation()
 
-    corr_coeffs = np.zeros((num_features, num_features))
-    for i in range(num_features):
-        for j in range(num_features):
-            corr_coeffs[i, j] = covariances[i, j] / (
-                np.sqrt(variances[i]) * np.sqrt(variances[j])
-            )
 
-    return corr_coeffs
+def correlation_intervals(
+    correlations: NDArray[Any], num_entries: int, confidence: float
+) -> Tuple[NDArray[Any], NDArray[Any]]:
+    """Confidence intervals of correlations estimated from a sample.
 
+    The Fisher transformation atanh(r) of a sample correlation is close to
+    normally distributed with a standard error of 1 / sqrt(n - 3). Intervals
+    are NaN for samples of at most three entries.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"Invalid confidence level {confidence}")
+    if num_entries <= 3:
+        nan = np.full(correlations.shape, np.nan)
+        return nan, nan
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    margin = z / np.sqrt(num_entries - 3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        transformed = np.arctanh(np.clip(correlations, -1, 1))
+
+    return np.tanh(transformed - margin), np.tanh(transformed + margin)
 
-def _calc_variances(
-    num_features: int,
-    total_entries: int,
-    total_sums: NDArray[Any],
-    data: List[AggregationData],
-) -> NDArray[Any]:
-    variances = np.zeros(num_features)
 
-    total_avg = total_sums / total_entries
+def triangle_size(num_features: int) -> int:
+    return num_features * (num_features + 1) // 2
 
-    variances = np.zeros(num_features)
+
+def pack_triangle(matrix: NDArray[Any]) -> NDArray[Any]:
+    """Pack the upper triangle of a square matrix row by row."""
+    num_features = matrix.shape[0]
+    packed = np.empty(triangle_size(num_features), dtype=matrix.dtype)
+    offset = 0
     for i in range(num_features):
-        numerator = 0
-        for client in data:
-            client_avg = client.sums[i] / client.num_entries
-            variance_contribution = client.num_entries * (
-                client.variances[i] + np.power(client_avg - total_avg[i], 2)
-            )
-            numerator += variance_contribution
-        variances[i] = numerator / total_entries
+        packed[offset : offset + num_features - i] = matrix[i, i:]
+        offset += num_features - i
 
-    return variances
+    return packed
+
+
+def unpack_triangle(packed: NDArray[Any], num_features: int) -> NDArray[Any]:
+    """Unpack a triangle packed by 'pack_triangle' into a symmetric matrix."""
+    matrix = np.empty((num_features, num_features), dtype=packed.dtype)
+    offset = 0
+    for i in range(num_features):
+        row = packed[offset : offset + num_features - i]
+        matrix[i, i:] = row
+        matrix[i:, i] = row
+        offset += num_features - i
+
+    return matrix
 
 
 def _calc_covariances(
@@ -130,12 +316,13 @@ def _calc_covariances(
     total_sums: NDArray[Any],
     total_multiply_sums: NDArray[Any],
 ) -> NDArray[Any]:
-    covariances = np.zeros((num_features, num_features))
+    """Return the packed upper triangle of the covariance matrix."""
+    avg = total_sums / total_entries
+    covariances = total_multiply_sums / total_entries
+
+    offset = 0
     for i in range(num_features):
-        for j in range(num_features):
-            avg_i = total_sums[i] / total_entries
-            avg_j = total_sums[j] / total_entries
-            avg_multiply = total_multiply_sums[i, j] / total_entries
-            covariances[i, j] = avg_multiply - (avg_i * avg_j)
+        covariances[offset : offset + num_features - i] -= avg[i] * avg[i:]
+        offset += num_features - i
 
     return covariances
@@ -0,0 +1,84 @@
+import concurrent.futures as futures
+import threading
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+class FanOut:
+    """Long-lived, bounded pool for concurrent calls to clients.
+
+    At most 'max_concurrency' calls are in flight, further calls are queued.
+    The pool is shared by all calls of a server, hence the number of threads
+    doesn't grow with the number of connected clients.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="fanout"
+        )
+        self._lock = threading.Lock()
+        self._max_concurrency = max_concurrency
+        self._queue_depth = 0
+        self._in_flight = 0
+        self._peak_queue_depth = 0
+        self._peak_in_flight = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free slot."""
+        return self._queue_depth
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        return self._in_flight
+
+    @property
+    def peak_queue_depth(self) -> int:
+        return self._peak_queue_depth
+
+    @property
+    def peak_in_flight(self) -> int:
+        return self._peak_in_flight
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "futures.Future[T]":
+        with self._lock:
+            self._queue_depth += 1
+            self._peak_queue_depth = max(
+                self._peak_queue_depth, self._queue_depth
+            )
+
+        def run() -> T:
+            with self._lock:
+                self._queue_depth -= 1
+                self._in_flight += 1
+                self._peak_in_flight = max(
+                    self._peak_in_flight, self._in_flight
+                )
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+        future = self._executor.submit(run)
+        future.add_done_callback(self._on_done)
+
+        return future
+
+    def _on_done(self, future: "futures.Future[Any]") -> None:
+        # Cancelled calls never started, hence are still counted as queued.
+        if future.cancelled():
+            with self._lock:
+                self._queue_depth -= 1
+
+    def shutdown(self) -> None:
+        """Stop accepting calls without waiting for outstanding ones."""
+        self._executor.shutdown(wait=False)
@@ -1,38 +1,87 @@
 import io
 import json
-from typing import Any, Dict, cast
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional
 
 import matplotlib.pyplot as plt
+from flwr.common import Properties, Scalar
 
-from flwr_analytics_server.fedhist import (
-    HistogramProvider,
-    aggregate_histograms,
-)
+from flwr_analytics_server.fedhist import HistogramProvider, is_auto_range
 from flwr_analytics_server.fivenum import FiveNum, compute_fivesum
+from flwr_analytics_server.provider import (
+    add_feature_arguments,
+    feature_input_data,
+    feature_labels,
+)
+from flwr_analytics_server.quantiles import (
+    merge_sketches,
+    sketches_from_properties,
+)
+from flwr_analytics_server.range import add_range_arguments
+from flwr_analytics_server.sketch import DEFAULT_K, QuantileSketch
+
+METHOD_HISTOGRAM = "histogram"
+METHOD_SKETCH = "sketch"
 
 
 class BoxPlotProvider(HistogramProvider):
+    """Box plots from merged quantile sketches or from a histogram.
+
+    Sketches give a box per feature with a bounded error, the histogram
+    gives a single box of all values, estimated from its bins.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._sketches: Optional[List[QuantileSketch]] = None
+        self.method = METHOD_SKETCH
+        self.k = DEFAULT_K
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        if self.method == METHOD_SKETCH:
+            return {
+                "method": METHOD_SKETCH,
+                "k": self.k,
+                **feature_input_data(self.features),
+            }
+
+        return {"method": METHOD_HISTOGRAM, **super().client_input_data()}
+
+    def add_client_data(self, properties: Properties) -> None:
+        if self.method == METHOD_SKETCH:
+            self._sketches = merge_sketches(
+                self._sketches, sketches_from_properties(properties)
+            )
+        else:
+            super().add_client_data(properties)
+
     def aggregate(self) -> None:
-        histogram_data = aggregate_histograms(self._client_data)
-        client_input = self.client_input_data()
-        self._fivesum = compute_fivesum(
-            float(client_input["hmin"]),
-            float(client_input["hmax"]),
-            histogram_data,
-        )
+        if self.method == METHOD_SKETCH:
+            if self._sketches is None:
+                raise ValueError("No client data to aggregate")
 
-    def result_metadata_json(self) -> str:
+            self._fivesums = [
+                FiveNum(*sketch.quantiles([0.0, 0.25, 0.5, 0.75, 1.0]))
+                for sketch in self._sketches
+            ]
+            return
 
-        five_num_info: Dict[str, Any] = {}
-        five_num_info["label"] = "box"  # not required
-        five_num_info["med"] = self._fivesum.median
-        five_num_info["q1"] = self._fivesum.quartile_first
-        five_num_info["q3"] = self._fivesum.quartile_third
-        five_num_info["whislo"] = self._fivesum.maximum
-        five_num_info["whishi"] = self._fivesum.minimum
-        five_num_info["fliers"] = []
+        super().aggregate()
+        self._fivesums = [compute_fivesum(self._result)]
 
-        stats = [five_num_info]
+    def result_metadata_json(self) -> str:
+        stats: List[Dict[str, Any]] = []
+        labels = feature_labels(self.features, len(self._fivesums))
+        for label, fivesum in zip(labels, self._fivesums):
+            five_num_info: Dict[str, Any] = {}
+            five_num_info["label"] = label
+            five_num_info["med"] = fivesum.median
+            five_num_info["q1"] = fivesum.quartile_first
+            five_num_info["q3"] = fivesum.quartile_third
+            five_num_info["whislo"] = fivesum.minimum
+            five_num_info["whishi"] = fivesum.maximum
+            five_num_info["fliers"] = []
+            stats.append(five_num_info)
 
         fig_svg = io.BytesIO()
 
@@ -61,6 +110,44 @@ class BoxPlotProvider(HistogramProvider):
 
         return json.dumps(metadata)
 
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--method",
+            choices=[METHOD_SKETCH, METHOD_HISTOGRAM],
+            default=METHOD_SKETCH,
+            help="Estimate the quartiles from sketches or from a histogram",
+        )
+        parser.add_argument(
+            "--k",
+            type=int,
+            default=DEFAULT_K,
+            help="Accuracy of the quantile sketches",
+        )
+        # Only used by the histogram method.
+        parser.add_argument("--nbins", type=int)
+        # The range is discovered from the data if missing or NaN.
+        parser.add_argument("--hmin", type=float)
+        parser.add_argument("--hmax", type=float)
+        add_range_arguments(parser)
+        add_feature_arguments(parser)
+
+    def set_arguments(self, args: Namespace) -> None:
+        self.method = args.method
+        self.k = args.k
+        self.features = args.features
+        if self.method == METHOD_HISTOGRAM:
+            if args.nbins is None:
+                raise ValueError("The histogram method requires --nbins")
+            self.nbins = args.nbins
+            self.auto_range = is_auto_range(
+                None if args.hmin is None else [args.hmin],
+                None if args.hmax is None else [args.hmax],
+            )
+            if self.auto_range:
+                self.range_percentile = args.range_percentile
+            else:
+                self.hrange = (args.hmin, args.hmax)
+
     @property
     def name(self) -> str:
         return "boxplot"
@@ -1,15 +1,26 @@
 import io
 import json
-from argparse import ArgumentParser, Namespace
+import math
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
 from dataclasses import dataclass
-from typing import Any, Dict, List, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 import matplotlib.pyplot as plt
 import numpy as np
 from flwr.common import Properties, Scalar
 from numpy.typing import NDArray
 
-from flwr_analytics_server.provider import AnalyticsProvider, bytes_to_numpy
+from flwr_analytics_server.codec import encode_array
+from flwr_analytics_server.provider import (
+    AnalyticsProvider,
+    add_feature_arguments,
+    add_sample_arguments,
+    bytes_to_numpy,
+    feature_input_data,
+    feature_labels,
+    sample_input_data,
+)
+from flwr_analytics_server.range import RangeProvider, add_range_arguments
 
 
 @dataclass
@@ -19,40 +30,119 @@ class HistogramData:
 
 
 class HistogramProvider(AnalyticsProvider):
+    """Histogram of all values or, with 'per_feature', of every feature.
+
+    Per feature histograms share 'hrange' unless 'feature_ranges' holds a
+    range per feature. With 'auto_range', the ranges are discovered by a
+    preliminary round collecting the range of every feature. Clients only
+    use the selected 'features' if given. With 'sample_fraction' or
+    'sample_rows', clients only bin a uniform sample of their rows and the
+    counts of every client are scaled up to estimates of its full counts.
+    """
+
     def __init__(self) -> None:
-        self._client_data: List[HistogramData] = []
+        self._histogram: Optional[HistogramData] = None
         self.nbins = 0
         self.hrange = (0.0, 0.0)
+        self.per_feature = False
+        self.feature_ranges: Optional[List[Tuple[float, float]]] = None
+        self.auto_range = False
+        self.range_percentile = 0.0
+        self.features: Optional[List[int]] = None
+        self.sample_fraction: Optional[float] = None
+        self.sample_rows: Optional[int] = None
 
     def client_input_data(self) -> Dict[str, Scalar]:
-        return {
+        if self.feature_ranges is not None:
+            hmins, hmaxs = zip(*self.feature_ranges)
+            return {
+                "per_feature": True,
+                "nbins": self.nbins,
+                "hmins": encode_array(np.array(hmins)),
+                "hmaxs": encode_array(np.array(hmaxs)),
+                **feature_input_data(self.features),
+                **sample_input_data(self.sample_fraction, self.sample_rows),
+            }
+
+        data: Dict[str, Scalar] = {
             "nbins": self.nbins,
             "hmin": self.hrange[0],
             "hmax": self.hrange[1],
         }
+        if self.per_feature:
+            data["per_feature"] = True
+
+        return {
+            **data,
+            **feature_input_data(self.features),
+            **sample_input_data(self.sample_fraction, self.sample_rows),
+        }
+
+    def preliminary(self) -> Optional[AnalyticsProvider]:
+        if not self.auto_range:
+            return None
+
+        provider = RangeProvider()
+        provider.percentile = self.range_percentile
+        provider.features = self.features
+        return provider
+
+    def configure(self, preliminary: AnalyticsProvider) -> None:
+        if not isinstance(preliminary, RangeProvider):
+            raise TypeError(f"Unexpected preliminary {preliminary.name}")
+
+        if self.per_feature:
+            self.feature_ranges = preliminary.ranges()
+        else:
+            self.hrange = preliminary.total_range()
 
     def add_client_data(self, properties: Properties) -> None:
-        self._client_data.append(
+        counts = bytes_to_numpy(cast(bytes, properties["counts"]))
+        sample_size = int(properties.get("sample_size", 0))
+        if sample_size > 0:
+            # Every sampled value stands for population / sample_size values
+            # of the client.
+            counts = counts * (int(properties["population"]) / sample_size)
+
+        self._histogram = merge_histograms(
+            self._histogram,
             HistogramData(
-                counts=bytes_to_numpy(cast(bytes, properties["counts"])),
+                counts=counts,
                 bins=bytes_to_numpy(cast(bytes, properties["bins"])),
-            )
+            ),
         )
 
     def aggregate(self) -> None:
-        self._result = aggregate_histograms(self._client_data)
+        if self._histogram is None:
+            raise ValueError("No client data to aggregate")
+
+        self._result = self._histogram
 
     def result_metadata_json(self) -> str:
         fig_svg = io.BytesIO()
 
-        fix, ax = plt.subplots()
+        counts = np.atleast_2d(self._result.counts)
+        bins = np.broadcast_to(
+            self._result.bins, (counts.shape[0], counts.shape[1] + 1)
+        )
 
-        ax.hist(
-            self._result.bins[:-1],
-            self._result.bins,
-            weights=self._result.counts,
+        labels = feature_labels(self.features, len(counts))
+        # A grid of histograms, one per feature.
+        ncols = math.ceil(math.sqrt(len(counts)))
+        nrows = math.ceil(len(counts) / ncols)
+        fig, axes = plt.subplots(
+            nrows, ncols, squeeze=False, figsize=(4 * ncols, 3 * nrows)
         )
+        for i, ax in enumerate(axes.flat):
+            if i >= len(counts):
+                ax.set_visible(False)
+                continue
+
+            ax.hist(bins[i][:-1], bins[i], weights=counts[i])
+            if self.per_feature:
+                ax.set_title(f"Feature {labels[i]}")
 
+        fig.tight_layout()
         plt.savefig(fig_svg, format="svg")
 
         metadata = {
@@ -77,28 +167,111 @@ class HistogramProvider(AnalyticsProvider):
         parser.add_argument(
             "--hmin",
             type=float,
-            required=True,
+            nargs="+",
+            help="Lower end of the range, or of every feature's range. "
+            "Discovered from the data if missing or NaN",
         )
         parser.add_argument(
             "--hmax",
             type=float,
-            required=True,
+            nargs="+",
+            help="Upper end of the range, or of every feature's range. "
+            "Discovered from the data if missing or NaN",
         )
+        add_range_arguments(parser)
+        parser.add_argument(
+            "--per-feature",
+            type=parse_bool,
+            nargs="?",
+            const=True,
+            default=False,
+            help="Compute a histogram per feature instead of one of all values",
+        )
+        add_feature_arguments(parser)
+        add_sample_arguments(parser)
 
     def set_arguments(self, args: Namespace) -> None:
         self.nbins = args.nbins
-        self.hrange = (args.hmin, args.hmax)
+        self.per_feature = args.per_feature
+        self.features = args.features
+        self.sample_fraction = args.sample_fraction
+        self.sample_rows = args.sample_rows
+        self.auto_range = is_auto_range(args.hmin, args.hmax)
+        if self.auto_range:
+            self.range_percentile = args.range_percentile
+            return
+
+        if len(args.hmin) != len(args.hmax):
+            raise ValueError(
+                "--hmin and --hmax need the same number of values"
+            )
+        if len(args.hmin) > 1 and not args.per_feature:
+            raise ValueError("Ranges per feature require --per-feature")
+
+        self.hrange = (args.hmin[0], args.hmax[0])
+        if len(args.hmin) > 1:
+            self.feature_ranges = list(zip(args.hmin, args.hmax))
 
     @property
     def name(self) -> str:
         return "histogram"
 
 
+def parse_bool(value: str) -> bool:
+    if value.lower() in ["1", "true"]:
+        return True
+    if value.lower() in ["0", "false"]:
+        return False
+
+    raise ArgumentTypeError(f"Expected a boolean, got {value}")
+
+
+def is_auto_range(
+    hmin: Optional[List[float]], hmax: Optional[List[float]]
+) -> bool:
+    """Whether the range is left to be discovered from the data.
+
+    Either both ends are missing or all of their values are NaN, which lets
+    pipelines with a fixed set of parameters ask for discovery.
+    """
+    if hmin is None and hmax is None:
+        return True
+    if hmin is None or hmax is None:
+        raise ValueError("--hmin and --hmax must be given together")
+
+    values = [*hmin, *hmax]
+    if all(math.isnan(v) for v in values):
+        return True
+    if any(math.isnan(v) for v in values):
+        raise ValueError("Ranges can't be partially NaN")
+
+    return False
+
+
 def aggregate_histograms(histograms: List[HistogramData]) -> HistogramData:
-    bins = histograms[0].bins
-    counts = np.sum([h.counts for h in histograms], axis=0)
+    result: Optional[HistogramData] = None
+    for histogram in histograms:
+        result = merge_histograms(result, histogram)
+
+    if result is None:
+        raise ValueError("No histograms to aggregate")
+
+    return result
+
+
+def merge_histograms(
+    total: Optional[HistogramData], histogram: HistogramData
+) -> HistogramData:
+    """Add the counts of 'histogram' to the running 'total'."""
+    if total is None:
+        return HistogramData(
+            counts=np.array(histogram.counts),
+            bins=histogram.bins,
+        )
 
-    return HistogramData(
-        counts=counts,
-        bins=bins,
-    )
+    if np.can_cast(histogram.counts.dtype, total.counts.dtype):
+        total.counts += histogram.counts
+    else:
+        # Counts scaled from a sample are fractional.
+        total.counts = total.counts + histogram.counts
+    return total
@@ -9,10 +9,8 @@ Katulu GmbH
 """
 
 from dataclasses import dataclass
-from typing import List, Optional, cast
-
-import numpy as np
 
+from flwr_analytics_server.cdf import HistogramCDF
 from flwr_analytics_server.fedhist import HistogramData
 
 
@@ -27,27 +25,14 @@ class FiveNum:
     maximum: float
 
 
-def compute_fivesum(
-    hmin: float, hmax: float, histogram: HistogramData
-) -> FiveNum:
-    """Compute five number summary."""
-
-    def inverse_value_bin(histogram: HistogramData, yvalue: float) -> float:
-        """
-
-        Return closest bin edge given yvalue : count
-
-        """
-        idx = (np.abs(yvalue - histogram.counts)).argmin()
-        return float(histogram.bins[idx])
+def compute_fivesum(histogram: HistogramData) -> FiveNum:
+    """Compute five number summary.
 
-    dist = histogram.counts
+    Quartiles are interpolated within their bins, minimum and maximum are
+    the outer edges of the first and last non-empty bins.
+    """
+    cdf = HistogramCDF(histogram)
+    quantiles = cdf.quantiles([0.0, 0.25, 0.5, 0.75, 1.0])[0]
 
-    fivenum = FiveNum(
-        minimum=hmin,
-        quartile_first=inverse_value_bin(histogram, np.quantile(dist, q=0.25)),
-        median=inverse_value_bin(histogram, np.quantile(dist, q=0.50)),
-        quartile_third=inverse_value_bin(histogram, np.quantile(dist, q=0.75)),
-        maximum=hmax,
-    )
+    fivenum = FiveNum(*(float(q) for q in quantiles))
     return fivenum
@@ -0,0 +1,188 @@
+import json
+import math
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+import numpy as np
+from flwr.common import Properties, Scalar
+from numpy.typing import NDArray
+
+from flwr_analytics_server.hashing import bucket_values
+from flwr_analytics_server.provider import (
+    AnalyticsProvider,
+    add_feature_arguments,
+    bytes_to_numpy,
+    feature_input_data,
+    feature_labels,
+)
+
+DEFAULT_WIDTH = 1024
+DEFAULT_DEPTH = 4
+DEFAULT_CANDIDATES = 64
+DEFAULT_TOP = 10
+
+
+class FrequencyProvider(AnalyticsProvider):
+    """The 'top' most frequent values of every feature and their counts.
+
+    Clients send a count-min sketch of 'depth' rows of 'width' counters and
+    a Misra-Gries summary of 'candidates' values per feature. Sketches are
+    added up, so their counts cover all clients. Every value making up more
+    than 1 / (candidates + 1) of all values is frequent on at least one
+    client, hence candidates are the union of the summaries of all clients.
+    They are ranked by their count in the merged sketch, which
+    overestimates counts by at most e / width of all values with a
+    probability of 1 - exp(-depth).
+    """
+
+    def __init__(self) -> None:
+        self._sketch: Optional[NDArray[Any]] = None
+        self._rows: Optional[NDArray[Any]] = None
+        self._candidates: List[Set[float]] = []
+        self.width = DEFAULT_WIDTH
+        self.depth = DEFAULT_DEPTH
+        self.candidates = DEFAULT_CANDIDATES
+        self.top = DEFAULT_TOP
+        self.features: Optional[List[int]] = None
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "candidates": self.candidates,
+            **feature_input_data(self.features),
+        }
+
+    def add_client_data(self, properties: Properties) -> None:
+        sketch = bytes_to_numpy(cast(bytes, properties["sketch"]))
+        rows = bytes_to_numpy(cast(bytes, properties["rows"]))
+        candidates = bytes_to_numpy(cast(bytes, properties["candidates"]))
+        if self._sketch is None or self._rows is None:
+            self._sketch = np.array(sketch)
+            self._rows = np.array(rows)
+            self._candidates = [set() for _ in range(len(sketch))]
+        elif sketch.shape != self._sketch.shape:
+            raise ValueError(
+                f"Expected sketches of shape {self._sketch.shape}, "
+                f"got {sketch.shape}"
+            )
+        else:
+            self._sketch += sketch
+            self._rows += rows
+
+        for union, values in zip(self._candidates, candidates):
+            # Summaries are padded with NaN.
+            union.update(values[~np.isnan(values)].tolist())
+
+    def aggregate(self) -> None:
+        if self._sketch is None:
+            raise ValueError("No client data to aggregate")
+
+        self._result = [
+            top_values(sketch, sorted(union), self.top)
+            for sketch, union in zip(self._sketch, self._candidates)
+        ]
+
+    def result_metadata_json(self) -> str:
+        assert self._sketch is not None and self._rows is not None
+        depth, width = self._sketch.shape[1:]
+        labels = feature_labels(self.features, len(self._result))
+        lines = [
+            "## Frequent values",
+            "",
+            f"Counts exceed the true counts by at most {math.e / width:.2%} "
+            f"of the values of a feature with a probability of "
+            f"{1 - math.exp(-depth):.0%}.",
+        ]
+        for label, rows, (values, counts) in zip(
+            labels, self._rows, self._result
+        ):
+            lines += [
+                "",
+                f"### Feature {label}, {rows} values",
+                "",
+                "| Value | Count |",
+                "| --- | --- |",
+            ]
+            for value, count in zip(values, counts):
+                lines.append(f"| {value:g} | {count} |")
+
+        metadata = {
+            "version": 1,
+            "outputs": [
+                {
+                    "type": "markdown",
+                    "storage": "inline",
+                    "source": "\n".join(lines),
+                },
+            ],
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=DEFAULT_TOP,
+            help="Number of most frequent values to report per feature",
+        )
+        parser.add_argument(
+            "--width",
+            type=int,
+            default=DEFAULT_WIDTH,
+            help="Counters per row of the count-min sketches",
+        )
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=DEFAULT_DEPTH,
+            help="Rows of the count-min sketches",
+        )
+        parser.add_argument(
+            "--candidates",
+            type=int,
+            default=DEFAULT_CANDIDATES,
+            help="Frequent values every client proposes per feature",
+        )
+        add_feature_arguments(parser)
+
+    def set_arguments(self, args: Namespace) -> None:
+        if min(args.top, args.width, args.depth, args.candidates) < 1:
+            raise ValueError("Sketches and summaries can't be empty")
+
+        self.top = args.top
+        self.width = args.width
+        self.depth = args.depth
+        self.candidates = args.candidates
+        self.features = args.features
+
+    @property
+    def name(self) -> str:
+        return "frequency"
+
+
+def estimate_counts(
+    sketch: NDArray[Any], values: List[float]
+) -> NDArray[np.int64]:
+    """Counts of 'values' in a count-min sketch of shape (depth, width)."""
+    depth, width = sketch.shape
+    counts = np.stack(
+        [sketch[d, bucket_values(values, width, seed=d)] for d in range(depth)]
+    )
+
+    return cast(NDArray[np.int64], counts.min(axis=0))
+
+
+def top_values(
+    sketch: NDArray[Any], candidates: List[float], top: int
+) -> Tuple[List[float], List[int]]:
+    """The 'top' candidates of largest count, by decreasing count."""
+    if not candidates:
+        return [], []
+
+    counts = estimate_counts(sketch, candidates)
+    # Ties are ranked by value, as the candidates are sorted.
+    order = np.argsort(-counts, kind="stable")[:top]
+
+    return [candidates[i] for i in order], [int(counts[i]) for i in order]
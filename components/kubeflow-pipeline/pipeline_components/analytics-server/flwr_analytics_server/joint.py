@@ -0,0 +1,263 @@
+import io
+import json
+import math
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import matplotlib.pyplot as plt
+import numpy as np
+from flwr.common import Properties, Scalar
+from numpy.typing import NDArray
+
+from flwr_analytics_server.codec import encode_array
+from flwr_analytics_server.fedhist import is_auto_range, parse_bool
+from flwr_analytics_server.provider import AnalyticsProvider, bytes_to_numpy
+from flwr_analytics_server.range import RangeProvider, add_range_arguments
+
+
+class JointHistogramProvider(AnalyticsProvider):
+    """Histograms of the joint distribution of groups of features.
+
+    Every group, e.g. a pair of features, gets a histogram of 'nbins' per
+    axis. Axes share 'hrange' unless 'axis_ranges' holds the range of every
+    axis of every group, in order. With 'auto_range', ranges are discovered
+    by a preliminary round. 'sparse' histograms are sent as the indices and
+    counts of their non-empty bins, for groups of more than two features.
+    Histograms are rendered as heatmaps of their first two axes.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Optional[NDArray[Any]] = None
+        self._indices: Optional[NDArray[Any]] = None
+        self._bins: Optional[NDArray[Any]] = None
+        self.groups: List[List[int]] = []
+        self.nbins = 0
+        self.hrange = (0.0, 0.0)
+        self.axis_ranges: Optional[List[Tuple[float, float]]] = None
+        self.auto_range = False
+        self.range_percentile = 0.0
+        self.sparse = False
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        groups = np.array(self.groups, dtype=np.int64)
+        if self.axis_ranges is not None:
+            hmins, hmaxs = np.array(self.axis_ranges).T
+        else:
+            hmins = np.full(groups.size, self.hrange[0])
+            hmaxs = np.full(groups.size, self.hrange[1])
+
+        data: Dict[str, Scalar] = {
+            "groups": encode_array(groups),
+            "nbins": self.nbins,
+            "hmins": encode_array(hmins.reshape(groups.shape)),
+            "hmaxs": encode_array(hmaxs.reshape(groups.shape)),
+        }
+        if self.sparse:
+            data["sparse"] = True
+
+        return data
+
+    def preliminary(self) -> Optional[AnalyticsProvider]:
+        if not self.auto_range:
+            return None
+
+        provider = RangeProvider()
+        provider.percentile = self.range_percentile
+        provider.features = sorted({f for group in self.groups for f in group})
+        return provider
+
+    def configure(self, preliminary: AnalyticsProvider) -> None:
+        if not isinstance(preliminary, RangeProvider):
+            raise TypeError(f"Unexpected preliminary {preliminary.name}")
+
+        ranges = dict(
+            zip(cast(List[int], preliminary.features), preliminary.ranges())
+        )
+        self.axis_ranges = [ranges[f] for group in self.groups for f in group]
+
+    def add_client_data(self, properties: Properties) -> None:
+        counts = bytes_to_numpy(cast(bytes, properties["counts"]))
+        self._bins = bytes_to_numpy(cast(bytes, properties["bins"]))
+        if "indices" in properties:
+            indices = bytes_to_numpy(cast(bytes, properties["indices"]))
+            self._indices, self._counts = merge_sparse(
+                self._indices, self._counts, indices, counts
+            )
+        elif self._counts is None:
+            self._counts = np.array(counts)
+        else:
+            self._counts += counts
+
+    def aggregate(self) -> None:
+        if self._counts is None or self._bins is None:
+            raise ValueError("No client data to aggregate")
+
+        num_groups, dimensions = self._bins.shape[:2]
+        if self._indices is not None:
+            self._result = sparse_heatmaps(
+                self._indices, self._counts, self.nbins, num_groups, dimensions
+            )
+        else:
+            # Axes beyond the first two are summed up.
+            self._result = self._counts.reshape(
+                num_groups, self.nbins, self.nbins, -1
+            ).sum(axis=3)
+
+    def result_metadata_json(self) -> str:
+        assert self._bins is not None
+        fig_svg = io.BytesIO()
+
+        # A grid of heatmaps, one per group.
+        ncols = math.ceil(math.sqrt(len(self._result)))
+        nrows = math.ceil(len(self._result) / ncols)
+        fig, axes = plt.subplots(
+            nrows, ncols, squeeze=False, figsize=(5 * ncols, 4 * nrows)
+        )
+        for i, ax in enumerate(axes.flat):
+            if i >= len(self._result):
+                ax.set_visible(False)
+                continue
+
+            group = self.groups[i]
+            mesh = ax.pcolormesh(
+                self._bins[i, 0], self._bins[i, 1], self._result[i].T
+            )
+            fig.colorbar(mesh, ax=ax)
+            ax.set_xlabel(f"Feature {group[0]}")
+            ax.set_ylabel(f"Feature {group[1]}")
+            if len(group) > 2:
+                ax.set_title(
+                    f"Features {', '.join(str(f) for f in group)}, marginal"
+                )
+
+        fig.tight_layout()
+        plt.savefig(fig_svg, format="svg")
+
+        metadata = {
+            "version": 1,
+            "outputs": [
+                {
+                    "type": "web-app",
+                    "storage": "inline",
+                    "source": fig_svg.getvalue().decode("utf-8"),
+                },
+            ],
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--groups",
+            type=parse_group,
+            nargs="+",
+            required=True,
+            help="Groups of features of the same size, e.g. pairs 0,1 2,3",
+        )
+        parser.add_argument(
+            "--nbins",
+            type=int,
+            required=True,
+            help="Number of bins per axis",
+        )
+        parser.add_argument(
+            "--hmin",
+            type=float,
+            nargs="+",
+            help="Lower end of the range of all axes, or of every axis of "
+            "every group. Discovered from the data if missing or NaN",
+        )
+        parser.add_argument(
+            "--hmax",
+            type=float,
+            nargs="+",
+            help="Upper end of the range of all axes, or of every axis of "
+            "every group. Discovered from the data if missing or NaN",
+        )
+        add_range_arguments(parser)
+        parser.add_argument(
+            "--sparse",
+            type=parse_bool,
+            nargs="?",
+            const=True,
+            default=False,
+            help="Only send the non-empty bins",
+        )
+
+    def set_arguments(self, args: Namespace) -> None:
+        if len({len(group) for group in args.groups}) != 1:
+            raise ValueError("Groups must have the same number of features")
+
+        self.groups = args.groups
+        self.nbins = args.nbins
+        self.sparse = args.sparse
+        self.auto_range = is_auto_range(args.hmin, args.hmax)
+        if self.auto_range:
+            self.range_percentile = args.range_percentile
+            return
+
+        axes = sum(len(group) for group in self.groups)
+        if len(args.hmin) != len(args.hmax) or len(args.hmin) not in [1, axes]:
+            raise ValueError(
+                f"Expected 1 or {axes} values of --hmin and --hmax"
+            )
+
+        self.hrange = (args.hmin[0], args.hmax[0])
+        if len(args.hmin) > 1:
+            self.axis_ranges = list(zip(args.hmin, args.hmax))
+
+    @property
+    def name(self) -> str:
+        return "joint"
+
+
+def parse_group(value: str) -> List[int]:
+    try:
+        group = [int(feature) for feature in value.split(",")]
+    except ValueError:
+        raise ArgumentTypeError(f"Expected features like 0,1, got {value}")
+    if len(group) < 2:
+        raise ArgumentTypeError(f"Expected at least two features in {value}")
+
+    return group
+
+
+def merge_sparse(
+    indices: Optional[NDArray[Any]],
+    counts: Optional[NDArray[Any]],
+    other_indices: NDArray[Any],
+    other_counts: NDArray[Any],
+) -> Tuple[NDArray[Any], NDArray[Any]]:
+    """Add the counts of two sparse histograms."""
+    if indices is None or counts is None:
+        return other_indices, other_counts
+
+    merged, inverse = np.unique(
+        np.concatenate([indices, other_indices]), return_inverse=True
+    )
+    merged_counts = np.bincount(
+        inverse, weights=np.concatenate([counts, other_counts])
+    )
+
+    return merged, merged_counts.astype(np.int64)
+
+
+def sparse_heatmaps(
+    indices: NDArray[Any],
+    counts: NDArray[Any],
+    nbins: int,
+    num_groups: int,
+    dimensions: int,
+) -> NDArray[Any]:
+    """Counts of the first two axes of every group of a sparse histogram.
+
+    Flat indices are offset by the group, and hold the bins of all axes.
+    """
+    group, rest = np.divmod(indices, nbins**dimensions)
+    first, second, *_ = np.unravel_index(rest, (nbins,) * dimensions)
+    flat = (group * nbins + first) * nbins + second
+    heatmaps = np.bincount(
+        flat, weights=counts, minlength=num_groups * nbins * nbins
+    )
+
+    return heatmaps.reshape(num_groups, nbins, nbins).astype(np.int64)
@@ -1,12 +1,22 @@
-import io
 from abc import ABC, abstractmethod
 from argparse import ArgumentParser, Namespace
-from typing import Any, Dict, cast
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 from flwr.common import Properties, Scalar
 from numpy.typing import NDArray
 
+from flwr_analytics_server.codec import decode_array, encode_array
+
+# Config key of the indices of the features clients compute, all features
+# if missing.
+CONFIG_FEATURES = "features"
+
+# Config keys of a request computed on a uniform sample of the rows of
+# every client, either a fraction of the rows or at most a number of rows.
+CONFIG_SAMPLE_FRACTION = "sample_fraction"
+CONFIG_SAMPLE_ROWS = "sample_rows"
+
 
 class AnalyticsProvider(ABC):
     @abstractmethod
@@ -25,6 +35,36 @@ class AnalyticsProvider(ABC):
     def result_metadata_json(self) -> str:
         pass
 
+    def preliminary(self) -> Optional["AnalyticsProvider"]:
+        """Provider of a round to run before this one, if any.
+
+        Once aggregated, it is passed to 'configure', e.g. to choose the bins
+        of a histogram from the ranges of the data.
+        """
+        return None
+
+    def configure(self, preliminary: "AnalyticsProvider") -> None:
+        pass
+
+    def merge_preliminary(
+        self, other: "AnalyticsProvider"
+    ) -> Optional["AnalyticsProvider"]:
+        """Preliminary answering both this preliminary and 'other', if any.
+
+        Batched providers asking for different options of a preliminary
+        share the round of the merged one. Once it is aggregated, both take
+        their own result from it with 'take_result'.
+        """
+        return None
+
+    def take_result(self, merged: "AnalyticsProvider") -> None:
+        """Take the result of this provider from the aggregated 'merged'.
+
+        By default, the result of 'merged' answers this provider as is.
+        Providers merging requests of different results override it.
+        """
+        self._result = getattr(merged, "_result")
+
     @abstractmethod
     def add_arguments(self, parser: ArgumentParser) -> None:
         pass
@@ -40,5 +80,60 @@ class AnalyticsProvider(ABC):
 
 
 def bytes_to_numpy(bytes: bytes) -> NDArray[Any]:
-    buf = io.BytesIO(bytes)
-    return cast(NDArray[Any], np.load(buf))
+    return decode_array(bytes)
+
+
+def add_feature_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--features",
+        type=int,
+        nargs="+",
+        help="Indices of the features to compute, all features by default",
+    )
+
+
+def feature_input_data(
+    features: Optional[Sequence[int]],
+) -> Dict[str, Scalar]:
+    """Ask clients to only compute the selected 'features'."""
+    if features is None:
+        return {}
+
+    return {CONFIG_FEATURES: encode_array(np.array(features, dtype=np.int64))}
+
+
+def feature_labels(features: Optional[Sequence[int]], count: int) -> List[str]:
+    """Labels of the 'count' features of a result, their original index."""
+    if features is None:
+        return [str(i) for i in range(count)]
+
+    return [str(i) for i in features]
+
+
+def add_sample_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--sample-fraction",
+        type=float,
+        help="Fraction of the rows of every client to sample, "
+        "all rows by default",
+    )
+    parser.add_argument(
+        "--sample-rows",
+        type=int,
+        help="Number of rows of every client to sample, takes precedence "
+        "over --sample-fraction",
+    )
+
+
+def sample_input_data(
+    fraction: Optional[float], rows: Optional[int]
+) -> Dict[str, Scalar]:
+    """Ask clients to compute their results on a sample of their rows."""
+    if rows is not None:
+        return {CONFIG_SAMPLE_ROWS: rows}
+    if fraction is not None:
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Invalid sample fraction {fraction}")
+        return {CONFIG_SAMPLE_FRACTION: fraction}
+
+    return {}
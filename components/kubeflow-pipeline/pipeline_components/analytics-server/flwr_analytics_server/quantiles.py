@@ -0,0 +1,125 @@
+import json
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional, Sequence, cast
+
+import numpy as np
+from flwr.common import Properties, Scalar
+from numpy.typing import NDArray
+
+from flwr_analytics_server.provider import (
+    AnalyticsProvider,
+    add_feature_arguments,
+    bytes_to_numpy,
+    feature_input_data,
+    feature_labels,
+)
+from flwr_analytics_server.sketch import (
+    DEFAULT_K,
+    QuantileSketch,
+    sketches_from_arrays,
+)
+
+DEFAULT_QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+class QuantilesProvider(AnalyticsProvider):
+    def __init__(self) -> None:
+        self._sketches: Optional[List[QuantileSketch]] = None
+        self.k = DEFAULT_K
+        self.quantiles = DEFAULT_QUANTILES
+        self.features: Optional[List[int]] = None
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        return {"k": self.k, **feature_input_data(self.features)}
+
+    def add_client_data(self, properties: Properties) -> None:
+        self._sketches = merge_sketches(
+            self._sketches, sketches_from_properties(properties)
+        )
+
+    def aggregate(self) -> None:
+        if self._sketches is None:
+            raise ValueError("No client data to aggregate")
+
+        self._result = np.stack(
+            [sketch.quantiles(self.quantiles) for sketch in self._sketches]
+        )
+
+    def result_metadata_json(self) -> str:
+        header = ["Feature", *(f"{q:g}" for q in self.quantiles)]
+        table = [
+            "| " + " | ".join(header) + " |",
+            "|" + " --- |" * len(header),
+        ]
+        labels = feature_labels(self.features, len(self._result))
+        for label, row in zip(labels, self._result):
+            table.append(
+                "| " + " | ".join([label, *(f"{v:g}" for v in row)]) + " |"
+            )
+
+        metadata = {
+            "version": 1,
+            "outputs": [
+                {
+                    "type": "markdown",
+                    "storage": "inline",
+                    "source": "\n".join(["## Quantiles", "", *table]),
+                },
+            ],
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--k",
+            type=int,
+            default=DEFAULT_K,
+            help="Accuracy of the quantile sketches",
+        )
+        parser.add_argument(
+            "--quantiles",
+            type=float,
+            nargs="+",
+            default=DEFAULT_QUANTILES,
+        )
+        add_feature_arguments(parser)
+
+    def set_arguments(self, args: Namespace) -> None:
+        self.k = args.k
+        self.quantiles = args.quantiles
+        self.features = args.features
+
+    @property
+    def name(self) -> str:
+        return "quantiles"
+
+
+def sketches_from_properties(properties: Properties) -> List[QuantileSketch]:
+    def array(key: str) -> NDArray[Any]:
+        return bytes_to_numpy(cast(bytes, properties[key]))
+
+    return sketches_from_arrays(
+        k=int(properties["k"]),
+        items=array("items"),
+        sizes=array("sizes"),
+        minimums=array("minimums"),
+        maximums=array("maximums"),
+    )
+
+
+def merge_sketches(
+    total: Optional[List[QuantileSketch]], sketches: Sequence[QuantileSketch]
+) -> List[QuantileSketch]:
+    """Merge the per feature 'sketches' of a client into the 'total'."""
+    if total is None:
+        return list(sketches)
+    if len(sketches) != len(total):
+        raise ValueError(
+            f"Expected {len(total)} features, got {len(sketches)}"
+        )
+
+    for sketch, other in zip(total, sketches):
+        sketch.merge(other)
+
+    return total
@@ -0,0 +1,170 @@
+import json
+import math
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import numpy as np
+from flwr.common import Properties, Scalar
+from numpy.typing import NDArray
+
+from flwr_analytics_server.provider import (
+    AnalyticsProvider,
+    add_feature_arguments,
+    bytes_to_numpy,
+    feature_input_data,
+    feature_labels,
+)
+from flwr_analytics_server.quantiles import (
+    merge_sketches,
+    sketches_from_properties,
+)
+from flwr_analytics_server.sketch import DEFAULT_K, QuantileSketch
+
+
+class RangeProvider(AnalyticsProvider):
+    """Range of every feature.
+
+    By default the range is the exact minimum and maximum. With a
+    'percentile', e.g. 1 for the 1st to the 99th percentile, it is estimated
+    from quantile sketches instead, which leaves out outliers.
+    """
+
+    def __init__(self) -> None:
+        self._minimums: Optional[NDArray[Any]] = None
+        self._maximums: Optional[NDArray[Any]] = None
+        self._sketches: Optional[List[QuantileSketch]] = None
+        self.percentile = 0.0
+        self.k = DEFAULT_K
+        self.features: Optional[List[int]] = None
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        data = feature_input_data(self.features)
+        if self.percentile > 0:
+            data["k"] = self.k
+
+        return data
+
+    def add_client_data(self, properties: Properties) -> None:
+        if self.percentile > 0:
+            self._sketches = merge_sketches(
+                self._sketches, sketches_from_properties(properties)
+            )
+            return
+
+        minimums = bytes_to_numpy(cast(bytes, properties["minimums"]))
+        maximums = bytes_to_numpy(cast(bytes, properties["maximums"]))
+        if self._minimums is None or self._maximums is None:
+            self._minimums, self._maximums = minimums, maximums
+            return
+        if len(minimums) != len(self._minimums):
+            raise ValueError(
+                f"Expected {len(self._minimums)} features, got {len(minimums)}"
+            )
+
+        self._minimums = np.minimum(self._minimums, minimums)
+        self._maximums = np.maximum(self._maximums, maximums)
+
+    def aggregate(self) -> None:
+        if self._sketches is not None:
+            q = self.percentile / 100
+            self._result = np.stack(
+                [sketch.quantiles([q, 1 - q]) for sketch in self._sketches]
+            )
+        elif self._minimums is not None and self._maximums is not None:
+            self._result = np.column_stack([self._minimums, self._maximums])
+        else:
+            raise ValueError("No client data to aggregate")
+
+    def merge_preliminary(
+        self, other: AnalyticsProvider
+    ) -> Optional[AnalyticsProvider]:
+        """Ranges of the union of the features of both providers."""
+        if not isinstance(other, RangeProvider):
+            return None
+        if (other.percentile, other.k) != (self.percentile, self.k):
+            # Ranges of different percentiles need rounds of their own.
+            return None
+
+        merged = RangeProvider()
+        merged.percentile = self.percentile
+        merged.k = self.k
+        if self.features is not None and other.features is not None:
+            merged.features = sorted(set(self.features) | set(other.features))
+
+        return merged
+
+    def take_result(self, merged: AnalyticsProvider) -> None:
+        if not isinstance(merged, RangeProvider):
+            raise TypeError(f"Unexpected provider {merged.name}")
+
+        if self.features is None:
+            self._result = merged._result
+        elif merged.features is None:
+            self._result = merged._result[self.features]
+        else:
+            self._result = merged._result[
+                [merged.features.index(f) for f in self.features]
+            ]
+
+    def ranges(self) -> List[Tuple[float, float]]:
+        """Range of every feature, (0, 0) for features without any value."""
+        return [
+            (float(low), float(high))
+            if math.isfinite(low) and math.isfinite(high)
+            else (0.0, 0.0)
+            for low, high in self._result
+        ]
+
+    def total_range(self) -> Tuple[float, float]:
+        """Smallest range containing the ranges of all features."""
+        finite = np.isfinite(self._result).all(axis=1)
+        if not finite.any():
+            return (0.0, 0.0)
+
+        return (
+            float(self._result[finite, 0].min()),
+            float(self._result[finite, 1].max()),
+        )
+
+    def result_metadata_json(self) -> str:
+        ranges = self.ranges()
+        labels = feature_labels(self.features, len(ranges))
+        table = ["| Feature | Minimum | Maximum |", "| --- | --- | --- |"]
+        for label, (low, high) in zip(labels, ranges):
+            table.append(f"| {label} | {low:g} | {high:g} |")
+
+        metadata = {
+            "version": 1,
+            "outputs": [
+                {
+                    "type": "markdown",
+                    "storage": "inline",
+                    "source": "\n".join(["## Ranges", "", *table]),
+                },
+            ],
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        add_range_arguments(parser)
+        add_feature_arguments(parser)
+
+    def set_arguments(self, args: Namespace) -> None:
+        self.percentile = args.range_percentile
+        self.features = args.features
+
+    @property
+    def name(self) -> str:
+        return "range"
+
+
+def add_range_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--range-percentile",
+        type=float,
+        default=0.0,
+        help="Range from the given percentile to its complement, e.g. 1 for "
+        "the 1st to the 99th percentile, instead of the minimum and maximum. "
+        "Batched providers discovering ranges must use the same value",
+    )
@@ -0,0 +1,157 @@
+import json
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from typing import Any, List
+
+import numpy as np
+from numpy.typing import NDArray
+
+from flwr_analytics_server.correlation import (
+    CorrelationAccumulator,
+    CorrelationProvider,
+    unpack_triangle,
+)
+from flwr_analytics_server.provider import (
+    add_feature_arguments,
+    feature_labels,
+)
+
+
+@dataclass
+class RegressionResult:
+    coefficients: NDArray[Any]
+    intercept: float
+    r_squared: float
+    num_entries: int
+
+
+class RegressionProvider(CorrelationProvider):
+    """Linear regression of the 'target' feature on all other features.
+
+    Clients send the statistics of the correlation provider, which hold
+    the Gram matrix of all features, hence the least squares fit solves the
+    normal equations in a single round. With 'ridge', the squared norm of
+    the coefficients, but not of the intercept, is penalized. The target
+    is given by its index in the data, and must be one of the selected
+    'features' if any. The fit always covers all rows, as intervals of the
+    coefficients of a sample aren't computed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.target = 0
+        self.ridge = 0.0
+
+    def aggregate(self) -> None:
+        if self._accumulator is None:
+            raise ValueError("No client data to aggregate")
+
+        labels = feature_labels(self.features, self._accumulator.num_features)
+        if str(self.target) not in labels:
+            raise ValueError(f"Target {self.target} isn't a selected feature")
+
+        target = labels.index(str(self.target))
+        self._labels = labels[:target] + labels[target + 1 :]
+        self._regression = fit_linear_regression(
+            self._accumulator, target, self.ridge
+        )
+
+    def result_metadata_json(self) -> str:
+        table = ["| Feature | Coefficient |", "| --- | --- |"]
+        for label, coefficient in zip(
+            self._labels, self._regression.coefficients
+        ):
+            table.append(f"| {label} | {coefficient:g} |")
+
+        metadata = {
+            "version": 1,
+            "outputs": [
+                {
+                    "type": "markdown",
+                    "storage": "inline",
+                    "source": "\n".join(
+                        [
+                            "## Regression",
+                            "",
+                            f"Feature {self.target} fitted on "
+                            f"{self._regression.num_entries} rows, intercept "
+                            f"{self._regression.intercept:g}, R² "
+                            f"{self._regression.r_squared:.4f}.",
+                            "",
+                            *table,
+                        ]
+                    ),
+                },
+            ],
+        }
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        add_feature_arguments(parser)
+        parser.add_argument(
+            "--target",
+            type=int,
+            required=True,
+            help="Index of the feature to predict from all other features",
+        )
+        parser.add_argument(
+            "--ridge",
+            type=float,
+            default=0.0,
+            help="Weight of the squared norm of the coefficients",
+        )
+
+    def set_arguments(self, args: Namespace) -> None:
+        if args.ridge < 0:
+            raise ValueError("--ridge can't be negative")
+
+        self.features = args.features
+        self.target = args.target
+        self.ridge = args.ridge
+
+    @property
+    def name(self) -> str:
+        return "regression"
+
+
+def fit_linear_regression(
+    accumulator: CorrelationAccumulator, target: int, ridge: float = 0.0
+) -> RegressionResult:
+    """Least squares fit of feature 'target' on all other features.
+
+    The intercept is the mean of the target less the coefficients times
+    the means of the features, hence the coefficients are fitted on the
+    centered cross products. Collinear features get the coefficients of
+    least norm.
+    """
+    n = accumulator.num_entries
+    if n == 0:
+        raise ValueError("Cannot fit a regression without any entries")
+
+    means = accumulator.sums / n
+    centered = unpack_triangle(
+        accumulator.multiply_sums, accumulator.num_features
+    ) - n * np.outer(means, means)
+    # The squared deviations are merged without cancellation.
+    np.fill_diagonal(centered, accumulator.squared_deviations)
+
+    others: List[int] = [
+        i for i in range(accumulator.num_features) if i != target
+    ]
+    xx = centered[np.ix_(others, others)]
+    xy = centered[others, target]
+    yy = centered[target, target]
+
+    coefficients = np.linalg.lstsq(
+        xx + ridge * np.eye(len(others)), xy, rcond=None
+    )[0]
+    intercept = means[target] - coefficients @ means[others]
+    residuals = yy - 2 * coefficients @ xy + coefficients @ xx @ coefficients
+
+    return RegressionResult(
+        coefficients=coefficients,
+        intercept=float(intercept),
+        r_squared=float(1 - residuals / yy) if yy > 0 else float("nan"),
+        num_entries=n,
+    )
@@ -1,8 +1,12 @@
 import concurrent.futures as futures
+import json
 import logging
-from typing import Optional, Tuple
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
 from flwr.common import (
+    Code,
     DisconnectRes,
     GetPropertiesIns,
     GetPropertiesRes,
@@ -12,10 +16,20 @@ from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 from flwr.server.history import History
 
+from flwr_analytics_server.codec import (
+    CODEC_VERSION,
+    COMPRESSION_NONE,
+    CONFIG_COMPRESSION,
+    CONFIG_FLOAT32,
+    CONFIG_VERSION,
+)
+from flwr_analytics_server.fanout import FanOut
 from flwr_analytics_server.provider import AnalyticsProvider
 
 log = logging.getLogger(__name__)
 
+DEFAULT_CONNECTION_TIMEOUT = 86400
+
 
 class AnalyticsServer:
     def __init__(
@@ -23,10 +37,39 @@ class AnalyticsServer:
         client_manager: ClientManager,
         min_available_clients: int,
         provider: AnalyticsProvider,
+        connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+        request_timeout: Optional[float] = None,
+        min_quorum: float = 0.0,
+        fanout: Optional[FanOut] = None,
+        compression: str = COMPRESSION_NONE,
+        float32: bool = False,
     ) -> None:
+        """Server running a single round of federated analytics.
+
+        If the provider needs a preliminary round, e.g. to discover the
+        ranges of a histogram, it is run first on the same clients.
+
+        The round starts once 'min_available_clients' are connected or the
+        'connection_timeout' has passed. Clients that don't answer within
+        'request_timeout' are dropped. The round fails unless at least the
+        'min_quorum' fraction of 'min_available_clients' (and at least one
+        client) answered.
+
+        Calls to clients are run by 'fanout', which bounds their concurrency.
+        Clients are asked to encode arrays with 'compression' and to downcast
+        float64 arrays which tolerate it, e.g. variances, if 'float32' is set.
+        """
         self._client_manager = client_manager
         self._min_available_clients = min_available_clients
         self._provider = provider
+        self._connection_timeout = connection_timeout
+        self._request_timeout = request_timeout
+        self._min_quorum = min_quorum
+        self._fanout = fanout if fanout is not None else FanOut()
+        self._compression = compression
+        self._float32 = float32
+        self.participating_clients: List[str] = []
+        self.dropped_clients: List[str] = []
 
     def client_manager(self) -> ClientManager:
         return self._client_manager
@@ -38,42 +81,225 @@ class AnalyticsServer:
             f"waiting for {self._min_available_clients} clients to connect"
         )
 
-        # TODO: actually allow to configure the connection timeout here.
-        self._client_manager.wait_for(self._min_available_clients, 86400)
+        connected = self._client_manager.wait_for(
+            self._min_available_clients, int(self._connection_timeout)
+        )
+        clients = self._client_manager.all()
+        if not connected:
+            log.warning(
+                f"only {len(clients)} of {self._min_available_clients} "
+                f"clients connected within {self._connection_timeout}s"
+            )
+
+        request_timeout = (
+            self._request_timeout
+            if self._request_timeout is not None
+            else timeout
+        )
+
+        preliminary = self._provider.preliminary()
+        if preliminary is not None:
+            log.info(
+                f"clients connected, starting preliminary {preliminary.name}"
+            )
+            self._run_round(preliminary, clients, request_timeout)
+            self._provider.configure(preliminary)
+
+            # The main round runs on the clients that answered the preliminary
+            # one, on the same connections.
+            clients = {cid: clients[cid] for cid in self.participating_clients}
+            self.participating_clients = []
 
         log.info(f"clients connected, starting {self._provider.name}")
+        self._run_round(self._provider, clients, request_timeout)
 
+        return history
+
+    def _run_round(
+        self,
+        provider: AnalyticsProvider,
+        clients: Dict[str, ClientProxy],
+        request_timeout: Optional[float],
+    ) -> None:
         ins = GetPropertiesIns(
             {
-                "provider": self._provider.name,
-                **self._provider.client_input_data(),
+                "provider": provider.name,
+                CONFIG_VERSION: CODEC_VERSION,
+                CONFIG_COMPRESSION: self._compression,
+                CONFIG_FLOAT32: self._float32,
+                **provider.client_input_data(),
             }
         )
 
-        with futures.ThreadPoolExecutor() as executor:
-            submitted_fs = {
-                executor.submit(
-                    get_client_properties, client_proxy, ins, timeout
-                )
-                for client_proxy in self._client_manager.all().values()
-            }
-            finished_fs, _ = futures.wait(fs=submitted_fs, timeout=None)
+        # Calls may wait for a free slot of the fan-out, hence the deadline
+        # of a client starts with its call rather than on submission.
+        started: Dict[str, float] = {}
+
+        def call(
+            cid: str, client_proxy: ClientProxy
+        ) -> Tuple[ClientProxy, GetPropertiesRes]:
+            started[cid] = time.monotonic()
+            return get_client_properties(client_proxy, ins, request_timeout)
+
+        submitted_fs = {
+            self._fanout.submit(call, cid, client_proxy): cid
+            for cid, client_proxy in clients.items()
+        }
+        log.info(
+            f"{self._fanout.in_flight} requests in flight, "
+            f"{self._fanout.queue_depth} queued"
+        )
+        try:
+            self._collect_properties(
+                provider, submitted_fs, started, request_timeout
+            )
+        finally:
+            # Requests of dropped clients that haven't started yet.
+            for future in submitted_fs:
+                future.cancel()
+
+        log.info(
+            f"collected properties with at most {self._fanout.peak_in_flight} "
+            f"requests in flight and {self._fanout.peak_queue_depth} queued "
+            f"(max concurrency {self._fanout.max_concurrency})"
+        )
+
+        quorum = max(
+            1, math.ceil(self._min_quorum * self._min_available_clients)
+        )
+        if len(self.participating_clients) < quorum:
+            raise RuntimeError(
+                f"only {len(self.participating_clients)} clients answered, "
+                f"a quorum of {quorum} is required"
+            )
 
-        for future in finished_fs:
-            failure = future.exception()
-            if failure is not None:
+        provider.aggregate()
+
+    def _collect_properties(
+        self,
+        provider: AnalyticsProvider,
+        submitted_fs: Dict[
+            "futures.Future[Tuple[ClientProxy, GetPropertiesRes]]", str
+        ],
+        started: Dict[str, float],
+        request_timeout: Optional[float],
+    ) -> None:
+        # Responses are decoded and aggregated as soon as they arrive, while
+        # the calls to the remaining clients are still in flight.
+        pending = set(submitted_fs)
+        while pending:
+            done, pending = futures.wait(
+                pending,
+                timeout=self._next_deadline(
+                    pending, submitted_fs, started, request_timeout
+                ),
+                return_when=futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                self._add_client_result(provider, submitted_fs[future], future)
+
+            if request_timeout is None:
+                continue
+
+            now = time.monotonic()
+            expired = {
+                future
+                for future in pending
+                if not future.done()
+                and submitted_fs[future] in started
+                and now - started[submitted_fs[future]] >= request_timeout
+            }
+            if expired:
                 log.warning(
-                    f"Failed to retrieve client properties of a client: {failure}"
+                    f"{len(expired)} clients didn't answer within "
+                    f"{request_timeout}s, continuing without them"
                 )
-                pass
-            else:
-                result = future.result()
-                properties = result[1].properties
+                self.dropped_clients.extend(
+                    sorted(submitted_fs[future] for future in expired)
+                )
+                pending -= expired
 
-                self._provider.add_client_data(properties=properties)
+    @staticmethod
+    def _next_deadline(
+        pending: Set["futures.Future[Tuple[ClientProxy, GetPropertiesRes]]"],
+        submitted_fs: Dict[
+            "futures.Future[Tuple[ClientProxy, GetPropertiesRes]]", str
+        ],
+        started: Dict[str, float],
+        request_timeout: Optional[float],
+    ) -> Optional[float]:
+        """Seconds until the earliest deadline of the pending calls."""
+        if request_timeout is None:
+            return None
 
-        self._provider.aggregate()
-        return history
+        deadlines = [
+            started[submitted_fs[future]] + request_timeout
+            for future in pending
+            if submitted_fs[future] in started
+        ]
+        if not deadlines:
+            # All calls are queued, their deadlines start once they run.
+            return request_timeout
+
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _add_client_result(
+        self,
+        provider: AnalyticsProvider,
+        cid: str,
+        future: "futures.Future[Tuple[ClientProxy, GetPropertiesRes]]",
+    ) -> None:
+        failure = future.exception()
+        if failure is not None:
+            log.warning(
+                f"Failed to retrieve client properties of {cid}: {failure}"
+            )
+            self.dropped_clients.append(cid)
+            return
+
+        status = future.result()[1].status
+        if status.code != Code.OK:
+            log.warning(
+                f"Client {cid} answered with status {status.code.name}"
+                f": {status.message}"
+            )
+            self.dropped_clients.append(cid)
+            return
+
+        properties = future.result()[1].properties
+        try:
+            provider.add_client_data(properties=properties)
+        except Exception as e:
+            # Invalid properties of a client don't abort the round, the
+            # quorum decides whether it can go on without it.
+            log.warning(f"Invalid client properties of {cid}: {e}")
+            self.dropped_clients.append(cid)
+            return
+
+        self.participating_clients.append(cid)
+
+    def result_metadata_json(self, metadata_json: str) -> str:
+        """Add a summary of the participating clients to provider metadata."""
+        summary = [
+            "## Clients",
+            "",
+            f"{len(self.participating_clients)} clients participated, "
+            f"{len(self.dropped_clients)} clients were dropped.",
+        ]
+        if self.dropped_clients:
+            summary.append("")
+            summary.extend(f"- `{cid}`" for cid in self.dropped_clients)
+
+        metadata = json.loads(metadata_json)
+        metadata["outputs"].append(
+            {
+                "type": "markdown",
+                "storage": "inline",
+                "source": "\n".join(summary),
+            }
+        )
+
+        return json.dumps(metadata)
 
     def disconnect_all_clients(self, timeout: Optional[float]) -> None:
         clients = self._client_manager.all().values()
@@ -82,12 +308,11 @@ class AnalyticsServer:
             (client_proxy, instruction) for client_proxy in clients
         ]
 
-        with futures.ThreadPoolExecutor() as executor:
-            submitted_fs = {
-                executor.submit(reconnect_client, client_proxy, ins, timeout)
-                for client_proxy, ins in client_instructions
-            }
-            _, _ = futures.wait(fs=submitted_fs, timeout=None)
+        submitted_fs = {
+            self._fanout.submit(reconnect_client, client_proxy, ins, timeout)
+            for client_proxy, ins in client_instructions
+        }
+        _, _ = futures.wait(fs=submitted_fs, timeout=None)
 
 
 def get_client_properties(
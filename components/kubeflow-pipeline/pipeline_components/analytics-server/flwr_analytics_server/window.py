@@ -0,0 +1,171 @@
+import json
+import time
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, cast
+
+from flwr.common import Properties, Scalar
+
+from flwr_analytics_server.batch import SEPARATOR
+from flwr_analytics_server.provider import AnalyticsProvider, bytes_to_numpy
+
+
+class WindowProvider(AnalyticsProvider):
+    """Run 'provider' on the rows of a recent time window only.
+
+    Clients keep partial results per time bucket and return those of the
+    buckets of 'bucket_seconds' starting within the last 'window_seconds'
+    before 'window_end', by default the time of the request. Buckets start
+    at multiples of their length, hence the buckets of all clients align.
+    Every bucket is merged into 'provider' like the result of a client.
+    Clients which don't keep time buckets are dropped.
+    """
+
+    def __init__(
+        self,
+        provider: AnalyticsProvider,
+        window_seconds: float,
+        bucket_seconds: float,
+        window_end: Optional[float] = None,
+    ) -> None:
+        if bucket_seconds <= 0 or window_seconds <= 0:
+            raise ValueError("Windows and buckets must have a length")
+
+        self._provider = provider
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.window_end = window_end
+        self._buckets: Set[float] = set()
+
+    def preliminary(self) -> Optional[AnalyticsProvider]:
+        preliminary = self._provider.preliminary()
+        if preliminary is None:
+            return None
+
+        # The preliminary round covers the same window, e.g. ranges of the
+        # streamed rows rather than of the datasets of the clients.
+        return WindowProvider(
+            preliminary,
+            window_seconds=self.window_seconds,
+            bucket_seconds=self.bucket_seconds,
+            window_end=self.window_end,
+        )
+
+    def configure(self, preliminary: AnalyticsProvider) -> None:
+        if not isinstance(preliminary, WindowProvider):
+            raise TypeError(f"Unexpected preliminary {preliminary.name}")
+
+        # Both rounds end the window at the time of the first one.
+        self.window_end = preliminary.window_end
+        self._provider.configure(preliminary._provider)
+
+    def merge_preliminary(
+        self, other: AnalyticsProvider
+    ) -> Optional[AnalyticsProvider]:
+        if not isinstance(other, WindowProvider):
+            return None
+        if (other.window_seconds, other.bucket_seconds) != (
+            self.window_seconds,
+            self.bucket_seconds,
+        ):
+            return None
+
+        # Windows of batched providers only differ by their end, which is
+        # the time of the request.
+        merged: Optional[AnalyticsProvider] = self._provider
+        if (
+            self._provider.client_input_data()
+            != other._provider.client_input_data()
+        ):
+            merged = self._provider.merge_preliminary(other._provider)
+        if merged is None:
+            return None
+
+        return WindowProvider(
+            merged,
+            window_seconds=self.window_seconds,
+            bucket_seconds=self.bucket_seconds,
+            window_end=self.window_end,
+        )
+
+    def take_result(self, merged: AnalyticsProvider) -> None:
+        if not isinstance(merged, WindowProvider):
+            raise TypeError(f"Unexpected provider {merged.name}")
+
+        self.window_end = merged.window_end
+        if merged._provider is not self._provider:
+            self._provider.take_result(merged._provider)
+
+    def client_input_data(self) -> Dict[str, Scalar]:
+        # All clients are asked for the same window.
+        if self.window_end is None:
+            self.window_end = time.time()
+
+        return {
+            **self._provider.client_input_data(),
+            "window_seconds": self.window_seconds,
+            "window_end": self.window_end,
+            "bucket_seconds": self.bucket_seconds,
+        }
+
+    def add_client_data(self, properties: Properties) -> None:
+        if self.window_end is None:
+            raise ValueError("Client data before the window was requested")
+
+        if "buckets" not in properties:
+            # The server drops clients which don't keep time buckets.
+            raise ValueError("Client didn't send the buckets of the window")
+
+        begin = self.window_end - self.window_seconds
+        starts = bytes_to_numpy(cast(bytes, properties["buckets"]))
+        for i, start in enumerate(starts):
+            # Only merge the requested buckets.
+            if not begin <= start < self.window_end:
+                continue
+
+            prefix = f"{i}{SEPARATOR}"
+            self._provider.add_client_data(
+                {
+                    key[len(prefix) :]: value
+                    for key, value in properties.items()
+                    if key.startswith(prefix)
+                }
+            )
+            self._buckets.add(float(start))
+
+    def aggregate(self) -> None:
+        self._provider.aggregate()
+
+    def result_metadata_json(self) -> str:
+        end = datetime.fromtimestamp(
+            cast(float, self.window_end), timezone.utc
+        )
+        metadata = json.loads(self._provider.result_metadata_json())
+        metadata["outputs"].append(
+            {
+                "type": "markdown",
+                "storage": "inline",
+                "source": "\n".join(
+                    [
+                        "## Window",
+                        "",
+                        f"Last {self.window_seconds:g}s before "
+                        f"{end.isoformat()}, "
+                        f"{len(self._buckets)} buckets of "
+                        f"{self.bucket_seconds:g}s with data.",
+                    ]
+                ),
+            }
+        )
+
+        return json.dumps(metadata)
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        self._provider.add_arguments(parser)
+
+    def set_arguments(self, args: Namespace) -> None:
+        self._provider.set_arguments(args)
+
+    @property
+    def name(self) -> str:
+        return self._provider.name
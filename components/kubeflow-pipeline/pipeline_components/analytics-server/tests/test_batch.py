@@ -0,0 +1,192 @@
+import io
+import json
+from argparse import ArgumentParser
+
+import numpy as np
+import pytest
+from flwr.common import Properties, Scalar
+
+from flwr_analytics_server.batch import BatchProvider, split_arguments
+from flwr_analytics_server.correlation import CorrelationProvider
+from flwr_analytics_server.fedbox import BoxPlotProvider
+from flwr_analytics_server.fedhist import HistogramProvider
+from flwr_analytics_server.joint import JointHistogramProvider
+from flwr_analytics_server.range import RangeProvider
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def _properties(data: np.ndarray) -> Properties:
+    counts, bins = np.histogram(data[:, 0], bins=4, range=(0, 1))
+    return {
+        "correlation/features": data.shape[1],
+        "correlation/entries": data.shape[0],
+        "correlation/sums": _numpy_to_scalar(np.sum(data, axis=0)),
+        "correlation/variances": _numpy_to_scalar(np.var(data, axis=0)),
+        "correlation/multiply_sums": _numpy_to_scalar(data.T @ data),
+        "histogram/counts": _numpy_to_scalar(counts),
+        "histogram/bins": _numpy_to_scalar(bins),
+    }
+
+
+def _histogram_provider() -> HistogramProvider:
+    provider = HistogramProvider()
+    provider.nbins = 4
+    provider.hrange = (0.0, 1.0)
+    return provider
+
+
+def test_batch_provider() -> None:
+    data = np.random.default_rng(4242).uniform(size=(100, 3))
+    correlation = CorrelationProvider()
+    histogram = _histogram_provider()
+    provider = BatchProvider([correlation, histogram])
+
+    assert provider.client_input_data() == {
+        "providers": "correlation,histogram",
+        "correlation/packed": True,
+        "histogram/nbins": 4,
+        "histogram/hmin": 0.0,
+        "histogram/hmax": 1.0,
+    }
+
+    for part in np.array_split(data, 3):
+        provider.add_client_data(_properties(part))
+    provider.aggregate()
+
+    np.testing.assert_allclose(
+        histogram._result.counts,
+        np.histogram(data[:, 0], bins=4, range=(0, 1))[0],
+    )
+    np.testing.assert_allclose(
+        correlation._result,
+        np.corrcoef(data, rowvar=False)[np.triu_indices(3)],
+    )
+
+    metadata = json.loads(provider.result_metadata_json())
+    assert len(metadata["outputs"]) == 2
+
+
+def test_split_arguments() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--min-available-clients", type=int)
+    parser.add_argument("--float32", action="store_true")
+    provider_parsers = {}
+    for provider in [
+        CorrelationProvider(),
+        HistogramProvider(),
+        BoxPlotProvider(),
+    ]:
+        provider_parsers[provider.name] = ArgumentParser()
+        provider.add_arguments(provider_parsers[provider.name])
+
+    common, segments = split_arguments(
+        [
+            "--min-available-clients",
+            "2",
+            "--float32",
+            "correlation",
+            "histogram",
+            "--nbins",
+            "10",
+            "boxplot",
+            "--method",
+            "histogram",
+            "--nbins",
+            "20",
+        ],
+        parser,
+        provider_parsers,
+    )
+
+    assert common == ["--min-available-clients", "2", "--float32"]
+    assert segments == [
+        ("correlation", []),
+        ("histogram", ["--nbins", "10"]),
+        ("boxplot", ["--method", "histogram", "--nbins", "20"]),
+    ]
+
+
+def test_shared_preliminary() -> None:
+    histogram = HistogramProvider()
+    histogram.auto_range = True
+    boxplot = BoxPlotProvider()
+    boxplot.method = "histogram"
+    boxplot.auto_range = True
+    batch = BatchProvider([histogram, boxplot, CorrelationProvider()])
+
+    preliminary = batch.preliminary()
+    assert preliminary is not None and preliminary.name == "range"
+
+    preliminary.add_client_data(
+        {
+            "minimums": _numpy_to_scalar(np.array([-1.0, 0.0])),
+            "maximums": _numpy_to_scalar(np.array([1.0, 4.0])),
+        }
+    )
+    preliminary.aggregate()
+    batch.configure(preliminary)
+
+    assert histogram.hrange == (-1.0, 4.0)
+    assert boxplot.hrange == (-1.0, 4.0)
+
+
+def test_merged_preliminary() -> None:
+    histogram = HistogramProvider()
+    histogram.auto_range = True
+    histogram.per_feature = True
+    histogram.features = [2, 0]
+    joint = JointHistogramProvider()
+    joint.auto_range = True
+    joint.groups = [[1, 2]]
+    batch = BatchProvider([histogram, joint])
+
+    # Ranges of the union of the features of both providers.
+    preliminary = batch.preliminary()
+    assert isinstance(preliminary, RangeProvider)
+    assert preliminary.features == [0, 1, 2]
+
+    preliminary.add_client_data(
+        {
+            "minimums": _numpy_to_scalar(np.array([-1.0, 0.0, 2.0])),
+            "maximums": _numpy_to_scalar(np.array([1.0, 4.0, 3.0])),
+        }
+    )
+    preliminary.aggregate()
+    batch.configure(preliminary)
+
+    assert histogram.feature_ranges == [(2.0, 3.0), (-1.0, 1.0)]
+    assert joint.axis_ranges == [(0.0, 4.0), (2.0, 3.0)]
+
+
+def test_conflicting_preliminaries() -> None:
+    histogram = HistogramProvider()
+    histogram.auto_range = True
+    histogram.range_percentile = 1.0
+    boxplot = BoxPlotProvider()
+    boxplot.method = "histogram"
+    boxplot.auto_range = True
+
+    with pytest.raises(ValueError, match="Conflicting options"):
+        BatchProvider([histogram, boxplot]).preliminary()
+
+
+def test_take_result() -> None:
+    merged = _histogram_provider()
+    merged.add_client_data(
+        {
+            "counts": _numpy_to_scalar(np.array([0, 0, 4, 0])),
+            "bins": _numpy_to_scalar(np.linspace(0, 1, 5)),
+        }
+    )
+    merged.aggregate()
+
+    provider = _histogram_provider()
+    provider.take_result(merged)
+
+    np.testing.assert_equal(provider._result.counts, [0, 0, 4, 0])
@@ -0,0 +1,65 @@
+import argparse
+import io
+import json
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_server.cardinality import (
+    CardinalityProvider,
+    estimate_cardinality,
+)
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def _registers(count: int, precision: int) -> np.ndarray:
+    """Registers of 'count' distinct values with uniform hashes."""
+    rng = np.random.default_rng(count)
+    index = rng.integers(0, 1 << precision, size=count)
+    rank = np.minimum(rng.geometric(0.5, size=count), 64 - precision + 1)
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    np.maximum.at(registers, index, rank)
+
+    return registers
+
+
+def test_estimate_cardinality() -> None:
+    assert estimate_cardinality(np.zeros(4096, dtype=np.uint8)) == 0
+
+    for n in [10, 1000, 100_000]:
+        registers = _registers(n, 12)
+        np.testing.assert_allclose(
+            estimate_cardinality(registers), n, rtol=0.05
+        )
+
+
+def test_cardinality() -> None:
+    provider = CardinalityProvider()
+    parser = argparse.ArgumentParser()
+    provider.add_arguments(parser)
+    provider.set_arguments(parser.parse_args(["--precision", "10"]))
+    assert provider.client_input_data() == {"precision": 10}
+
+    # Both clients hold the same values of the first feature, whose hashes
+    # are the same on all clients.
+    first = np.zeros((2, 1024), dtype=np.uint8)
+    first[0] = _registers(30_000, 10)
+    second = np.zeros((2, 1024), dtype=np.uint8)
+    second[0] = first[0]
+    second[1, :8] = 1
+    provider.add_client_data({"registers": _numpy_to_scalar(first)})
+    provider.add_client_data({"registers": _numpy_to_scalar(second)})
+    provider.aggregate()
+
+    # Values of both clients are counted once.
+    np.testing.assert_allclose(provider._result[0], 30_000, rtol=0.1)
+    np.testing.assert_allclose(provider._result[1], 8, rtol=0.1)
+
+    metadata = json.loads(provider.result_metadata_json())
+    assert "| 1 | 8 |" in metadata["outputs"][0]["source"]
@@ -0,0 +1,51 @@
+import numpy as np
+
+from flwr_analytics_server.cdf import HistogramCDF, histogram_quantiles
+from flwr_analytics_server.fedhist import HistogramData, aggregate_histograms
+
+
+def test_quantiles() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=100_000)
+    q = np.linspace(0, 1, 101)
+
+    histograms = [
+        HistogramData(*np.histogram(part, bins=10_000, range=(-6, 6)))
+        for part in np.array_split(data, 3)
+    ]
+    quantiles = histogram_quantiles(aggregate_histograms(histograms), q)
+
+    assert quantiles.shape == (1, 101)
+    np.testing.assert_allclose(quantiles[0], np.quantile(data, q), atol=2e-3)
+
+
+def test_interpolation() -> None:
+    counts = np.array(
+        [
+            [0, 2, 0, 2, 0],
+            [0, 0, 0, 0, 0],
+            [1, 1, 1, 1, 1],
+        ]
+    )
+    cdf = HistogramCDF(HistogramData(counts=counts, bins=np.arange(6)))
+
+    quantiles = cdf.quantiles([0, 0.25, 0.5, 1])
+
+    assert cdf.features == 3
+    np.testing.assert_equal(
+        quantiles,
+        [
+            [1.0, 1.5, 2.0, 4.0],
+            [np.nan, np.nan, np.nan, np.nan],
+            [0.0, 1.25, 2.5, 5.0],
+        ],
+    )
+
+
+def test_bins_per_feature() -> None:
+    counts = np.array([[1, 1], [2, 2]])
+    bins = np.array([[0.0, 1.0, 2.0], [10.0, 20.0, 30.0]])
+
+    quantiles = histogram_quantiles(HistogramData(counts, bins), [0.5])
+
+    np.testing.assert_equal(quantiles, [[1.0], [20.0]])
@@ -1,9 +1,17 @@
 import io
+import json
 
 import numpy as np
 from flwr.common import Scalar, Properties
 
-from flwr_analytics_server.correlation import CorrelationProvider
+from flwr_analytics_server.codec import decode_array
+from flwr_analytics_server.correlation import (
+    AggregationData,
+    CorrelationAccumulator,
+    CorrelationProvider,
+    pack_triangle,
+    unpack_triangle,
+)
 
 def _numpy_to_scalar(input: np.ndarray) -> Scalar:
     buf = io.BytesIO()
@@ -33,11 +41,113 @@ def test_correlation() -> None:
     provider.add_client_data(_aggregate_data(test_data[5:7]))
     provider.aggregate()
 
-    dist_corr = provider._result
+    dist_corr = unpack_triangle(provider._result, 8)
 
     np.testing.assert_almost_equal(dist_corr, corr)
 
 
+def test_correlation_packed() -> None:
+    rng = np.random.default_rng(4242)
+    test_data = rng.normal(size=(100, 5))
+
+    corr = np.corrcoef(test_data, rowvar=False)
+
+    provider = CorrelationProvider()
+    for part in np.array_split(test_data, 3):
+        properties = _aggregate_data(part)
+        properties["multiply_sums"] = _numpy_to_scalar(
+            pack_triangle(part.T @ part)
+        )
+        provider.add_client_data(properties)
+    provider.aggregate()
+
+    np.testing.assert_almost_equal(provider._result, pack_triangle(corr))
+    assert provider.client_input_data() == {"packed": True}
+
+
+def test_correlation_features() -> None:
+    test_data = np.random.default_rng(4242).normal(size=(100, 2))
+
+    provider = CorrelationProvider()
+    provider.features = [7, 2]
+    provider.add_client_data(_aggregate_data(test_data))
+    provider.aggregate()
+
+    features = provider.client_input_data()["features"]
+    np.testing.assert_equal(decode_array(features), [7, 2])
+    assert provider.result_metadata_json()
+
+
+def test_correlation_sample() -> None:
+    rng = np.random.default_rng(4242)
+    x = rng.normal(size=1000)
+    test_data = np.stack([x, x + rng.normal(size=1000), rng.normal(size=1000)], axis=1)
+
+    provider = CorrelationProvider()
+    provider.sample_fraction = 0.1
+    assert provider.client_input_data()["sample_fraction"] == 0.1
+
+    for part in np.array_split(test_data, 2):
+        properties = _aggregate_data(part)
+        properties["sample_size"] = part.shape[0]
+        properties["population"] = 10 * part.shape[0]
+        provider.add_client_data(properties)
+    provider.aggregate()
+
+    lower, upper = provider._intervals
+    # Pairs of distinct features in the packed triangle.
+    pairs = [1, 2, 4]
+    correlations = provider._result[pairs]
+    assert np.all(lower[pairs] < correlations)
+    assert np.all(correlations < upper[pairs])
+    # Features 0 and 1 correlate, 0 and 2 don't.
+    assert lower[1] > 0.6
+    assert lower[2] < 0 < upper[2]
+    np.testing.assert_allclose(upper[2] - lower[2], 0.124, atol=0.002)
+
+    source = json.loads(provider.result_metadata_json())["outputs"][1]["source"]
+    assert "of 10000 rows" in source
+    assert "| 0, 2 |" in source and source.count("\n| ") == 5
+
+
+def test_correlation_accumulator_chunks() -> None:
+    rng = np.random.default_rng(4242)
+    test_data = rng.gamma(shape=2.0, size=(200, 4))
+    # Chunks of clients without rows and with a single row.
+    chunks = [test_data[:0], test_data[:1], test_data[1:150], test_data[150:]]
+
+    chunked = CorrelationAccumulator.empty(4)
+    for chunk in chunks:
+        chunked.add(_accumulator_data(chunk))
+    one_shot = CorrelationAccumulator.empty(4)
+    one_shot.add(_accumulator_data(test_data))
+
+    assert chunked.num_entries == one_shot.num_entries == 200
+    np.testing.assert_allclose(chunked.sums, one_shot.sums)
+    np.testing.assert_allclose(chunked.multiply_sums, one_shot.multiply_sums)
+    np.testing.assert_allclose(
+        chunked.squared_deviations, one_shot.squared_deviations
+    )
+    np.testing.assert_allclose(chunked.correlation(), one_shot.correlation())
+    np.testing.assert_allclose(
+        unpack_triangle(chunked.correlation(), 4),
+        np.corrcoef(test_data, rowvar=False),
+    )
+
+
+def _accumulator_data(data: np.ndarray) -> AggregationData:
+    num_entries, num_features = data.shape
+    variances = np.var(data, axis=0) if num_entries else np.zeros(num_features)
+
+    return AggregationData(
+        num_features=num_features,
+        num_entries=num_entries,
+        sums=np.sum(data, axis=0),
+        multiply_sums=data.T @ data,
+        variances=variances,
+    )
+
+
 def _aggregate_data(data: np.ndarray) -> Properties:
     num_entries = data.shape[0]
     num_features = data.shape[1]
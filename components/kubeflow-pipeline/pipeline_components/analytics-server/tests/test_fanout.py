@@ -0,0 +1,28 @@
+import concurrent.futures as futures
+import threading
+
+from flwr_analytics_server.fanout import FanOut
+
+
+def test_bounded_concurrency() -> None:
+    fanout = FanOut(max_concurrency=2)
+    release = threading.Event()
+
+    submitted_fs = [fanout.submit(release.wait, 10) for _ in range(5)]
+    while fanout.in_flight < 2:
+        pass
+
+    assert fanout.in_flight == 2
+    assert fanout.queue_depth == 3
+
+    submitted_fs[-1].cancel()
+    assert fanout.queue_depth == 2
+
+    release.set()
+    futures.wait(submitted_fs[:-1])
+    fanout.shutdown()
+
+    assert fanout.in_flight == 0
+    assert fanout.queue_depth == 0
+    assert fanout.peak_in_flight == 2
+    assert fanout.peak_queue_depth >= 3
@@ -11,6 +11,7 @@ import argparse
 import numpy as np
 from flwr.common import Scalar
 from flwr_analytics_server.fedbox import BoxPlotProvider
+from flwr_analytics_server.sketch import QuantileSketch, sketch_values
 
 def _numpy_to_scalar(input: np.ndarray) -> Scalar:
     buf = io.BytesIO()
@@ -40,9 +41,12 @@ def run_two_client_example(_rtol=1e-05, _atol=1e-08) -> None:
     #
     provider = BoxPlotProvider()
     args = argparse.Namespace()
+    args.method = "histogram"
+    args.k = 200
     args.nbins = 100
     args.hmin = 17.0
     args.hmax = 24.0
+    args.features = None
     provider.set_arguments(args)
 
     provider.add_client_data({
@@ -55,15 +59,42 @@ def run_two_client_example(_rtol=1e-05, _atol=1e-08) -> None:
         })
 
     provider.aggregate()
-    fivenum = provider._fivesum
+    fivenum = provider._fivesums[0]
     _fivenum = [fivenum.minimum, fivenum.quartile_first, fivenum.median, fivenum.quartile_third, fivenum.maximum]
-    _fivenum_precomputed = [17.0, 17.21, 17.91, 19.03, 24.0]
+    _fivenum_precomputed = [17.21, 19.415, 20.0896552, 20.7610417, 23.51]
     #
     # Assertion
     #
     assert np.allclose(_fivenum, _fivenum_precomputed, atol=_atol, rtol=_rtol)
+    # Quartiles are within a bin width of the exact ones.
+    assert np.allclose(_fivenum[1:4], np.quantile(global_data, [0.25, 0.5, 0.75]), atol=0.07)
 
 
 def test_two_clients_normal() -> None:
     """Two client example."""
     run_two_client_example()
+
+
+def test_two_clients_sketch() -> None:
+    """Two client example with quantile sketches."""
+    rng = np.random.default_rng(4242)
+    global_data = rng.normal(size=(10000, 2), loc=20)
+
+    provider = BoxPlotProvider()
+    for part in np.array_split(global_data, 2):
+        sketches = [QuantileSketch(), QuantileSketch()]
+        for sketch, column in zip(sketches, part.T):
+            sketch.update(column)
+        values = sketch_values(sketches)
+        provider.add_client_data({
+            key: _numpy_to_scalar(value) if isinstance(value, np.ndarray) else value
+            for key, value in values.items()
+        })
+
+    provider.aggregate()
+    assert provider.client_input_data() == {"method": "sketch", "k": 200}
+
+    quantiles = np.quantile(global_data, [0, 0.25, 0.5, 0.75, 1], axis=0)
+    for fivenum, expected in zip(provider._fivesums, quantiles.T):
+        _fivenum = [fivenum.minimum, fivenum.quartile_first, fivenum.median, fivenum.quartile_third, fivenum.maximum]
+        assert np.allclose(_fivenum, expected, atol=0.05)
@@ -6,12 +6,19 @@ Katulu GmbH
 (c) 2022 
 
 """
+import argparse
 import io
+import json
 
 import numpy as np
 from flwr.common import Scalar
 
-from flwr_analytics_server.fedhist import HistogramProvider
+from flwr_analytics_server.codec import decode_array
+from flwr_analytics_server.fedhist import (
+    HistogramData,
+    HistogramProvider,
+    merge_histograms,
+)
 
 def _numpy_to_scalar(input: np.ndarray) -> Scalar:
     buf = io.BytesIO()
@@ -65,3 +72,89 @@ def run_two_client_example(_rtol=1e-05, _atol=1e-08) -> None:
 def test_two_clients_gamma() -> None:
     """Two client example."""
     run_two_client_example()
+
+
+def test_histogram_per_feature() -> None:
+    """Per feature histograms with a range per feature."""
+    rng = np.random.default_rng(4242)
+    global_data = rng.normal(size=(1000, 3))
+    hmins, hmaxs = [-1.0, -2.0, -3.0], [1.0, 2.0, 3.0]
+
+    provider = HistogramProvider()
+    parser = argparse.ArgumentParser()
+    provider.add_arguments(parser)
+    provider.set_arguments(parser.parse_args([
+        "--nbins", "10",
+        "--hmin", *map(str, hmins),
+        "--hmax", *map(str, hmaxs),
+        "--per-feature",
+    ]))
+
+    client_input = provider.client_input_data()
+    assert client_input["per_feature"] is True
+    np.testing.assert_equal(decode_array(client_input["hmins"]), hmins)
+
+    for part in np.array_split(global_data, 2):
+        histograms = [
+            np.histogram(column, bins=10, range=(hmin, hmax))
+            for column, hmin, hmax in zip(part.T, hmins, hmaxs)
+        ]
+        provider.add_client_data({
+            "counts": _numpy_to_scalar(np.stack([h[0] for h in histograms])),
+            "bins": _numpy_to_scalar(np.stack([h[1] for h in histograms])),
+        })
+    provider.aggregate()
+
+    for i, (hmin, hmax) in enumerate(zip(hmins, hmaxs)):
+        _counts, _bins = np.histogram(global_data[:, i], bins=10, range=(hmin, hmax))
+        np.testing.assert_equal(provider._result.counts[i], _counts)
+        np.testing.assert_allclose(provider._result.bins[i], _bins)
+
+    metadata = json.loads(provider.result_metadata_json())
+    assert metadata["outputs"][0]["source"].count("Feature") == 3
+
+
+def test_histogram_sample() -> None:
+    """Counts of sampled clients are scaled to their population."""
+    provider = HistogramProvider()
+    parser = argparse.ArgumentParser()
+    provider.add_arguments(parser)
+    provider.set_arguments(parser.parse_args([
+        "--nbins", "2", "--hmin", "0", "--hmax", "2", "--sample-rows", "10",
+    ]))
+
+    assert provider.client_input_data()["sample_rows"] == 10
+
+    provider.add_client_data({
+        "counts": _numpy_to_scalar(np.array([4, 6])),
+        "bins": _numpy_to_scalar(np.array([0.0, 1.0, 2.0])),
+        "sample_size": 10,
+        "population": 100,
+    })
+    # Clients with fewer rows than the sample size report all of them.
+    provider.add_client_data({
+        "counts": _numpy_to_scalar(np.array([3, 2])),
+        "bins": _numpy_to_scalar(np.array([0.0, 1.0, 2.0])),
+        "sample_size": 5,
+        "population": 5,
+    })
+    provider.aggregate()
+
+    np.testing.assert_allclose(provider._result.counts, [43, 62])
+
+
+def test_merge_histograms_chunks() -> None:
+    data = np.random.default_rng(4242).gamma(shape=2.0, size=200)
+    # Chunks of clients without values and with a single value.
+    chunks = [data[:0], data[:1], data[1:150], data[150:]]
+
+    chunked = None
+    for chunk in chunks:
+        counts, bins = np.histogram(chunk, bins=10, range=(0.0, 10.0))
+        chunked = merge_histograms(chunked, HistogramData(counts, bins))
+    counts, bins = np.histogram(data, bins=10, range=(0.0, 10.0))
+    one_shot = merge_histograms(None, HistogramData(counts, bins))
+
+    assert chunked is not None
+    np.testing.assert_equal(chunked.counts, one_shot.counts)
+    np.testing.assert_equal(chunked.bins, one_shot.bins)
@@ -0,0 +1,84 @@
+import argparse
+import io
+import json
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_server.frequency import FrequencyProvider, top_values
+from flwr_analytics_server.hashing import bucket_values
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def _sketch(values: np.ndarray, width: int, depth: int) -> np.ndarray:
+    sketch = np.zeros((depth, width), dtype=np.int64)
+    for d in range(depth):
+        np.add.at(sketch[d], bucket_values(values, width, seed=d), 1)
+
+    return sketch
+
+
+def _client_data(values: np.ndarray, candidates: list) -> dict:
+    return {
+        "sketch": _numpy_to_scalar(_sketch(values, 64, 3)[np.newaxis]),
+        "rows": _numpy_to_scalar(np.array([len(values)])),
+        "candidates": _numpy_to_scalar(np.array([candidates])),
+    }
+
+
+def test_frequency() -> None:
+    provider = FrequencyProvider()
+    parser = argparse.ArgumentParser()
+    provider.add_arguments(parser)
+    provider.set_arguments(
+        parser.parse_args(
+            [
+                "--top",
+                "2",
+                "--width",
+                "64",
+                "--depth",
+                "3",
+                "--candidates",
+                "2",
+            ]
+        )
+    )
+    assert provider.client_input_data() == {
+        "width": 64,
+        "depth": 3,
+        "candidates": 2,
+    }
+
+    # 3.0 is the most frequent value overall, but only a candidate of the
+    # second client.
+    first = np.array([1.0] * 50 + [2.0] * 30 + [3.0] * 20)
+    second = np.array([3.0] * 60 + [4.0] * 10)
+    provider.add_client_data(_client_data(first, [1.0, 2.0]))
+    provider.add_client_data(_client_data(second, [3.0, np.nan]))
+    provider.aggregate()
+
+    [(values, counts)] = provider._result
+    assert values == [3.0, 1.0]
+    assert counts[0] >= 80 and counts[1] >= 50
+
+    metadata = json.loads(provider.result_metadata_json())
+    assert "### Feature 0, 170 values" in metadata["outputs"][0]["source"]
+
+
+def test_top_values() -> None:
+    values = np.repeat(np.arange(100.0), np.arange(100))
+    sketch = _sketch(values, 1024, 4)
+
+    top, counts = top_values(sketch, [10.0, 99.0, 50.0, 98.0], 3)
+
+    assert top == [99.0, 98.0, 50.0]
+    # Count-min sketches never underestimate.
+    assert counts[0] >= 99 and counts[1] >= 98 and counts[2] >= 50
+    assert top_values(sketch, [], 3) == ([], [])
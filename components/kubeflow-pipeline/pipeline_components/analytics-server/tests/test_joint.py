@@ -0,0 +1,110 @@
+import argparse
+import io
+import json
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_server.codec import decode_array
+from flwr_analytics_server.joint import JointHistogramProvider
+from flwr_analytics_server.range import RangeProvider
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def _provider(args: list) -> JointHistogramProvider:
+    provider = JointHistogramProvider()
+    parser = argparse.ArgumentParser()
+    provider.add_arguments(parser)
+    provider.set_arguments(parser.parse_args(args))
+
+    return provider
+
+
+def test_joint_histogram() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=(1000, 2))
+    provider = _provider(
+        ["--groups", "0,1", "--nbins", "6", "--hmin", "-3", "--hmax", "3"]
+    )
+
+    client_input = provider.client_input_data()
+    np.testing.assert_equal(decode_array(client_input["groups"]), [[0, 1]])
+    np.testing.assert_equal(decode_array(client_input["hmins"]), [[-3, -3]])
+    assert "sparse" not in client_input
+
+    for part in np.array_split(data, 2):
+        counts, xedges, yedges = np.histogram2d(
+            part[:, 0], part[:, 1], bins=6, range=[(-3, 3), (-3, 3)]
+        )
+        provider.add_client_data(
+            {
+                "counts": _numpy_to_scalar(counts[np.newaxis]),
+                "bins": _numpy_to_scalar(np.array([[xedges, yedges]])),
+            }
+        )
+    provider.aggregate()
+
+    expected, _, _ = np.histogram2d(
+        data[:, 0], data[:, 1], bins=6, range=[(-3, 3), (-3, 3)]
+    )
+    np.testing.assert_equal(provider._result[0], expected)
+    metadata = json.loads(provider.result_metadata_json())
+    assert "Feature 1" in metadata["outputs"][0]["source"]
+
+
+def test_joint_histogram_sparse() -> None:
+    rng = np.random.default_rng(4242)
+    data = rng.normal(size=(1000, 3))
+    provider = _provider(
+        [
+            "--groups",
+            "2,0,1",
+            "--nbins",
+            "4",
+            "--sparse",
+            "--range-percentile",
+            "0",
+        ]
+    )
+    assert provider.client_input_data()["sparse"] is True
+
+    # Ranges of the features of all groups are discovered first.
+    preliminary = provider.preliminary()
+    assert isinstance(preliminary, RangeProvider)
+    assert preliminary.features == [0, 1, 2]
+    preliminary.add_client_data(
+        {
+            "minimums": _numpy_to_scalar(np.array([-1.0, -2.0, -3.0])),
+            "maximums": _numpy_to_scalar(np.array([1.0, 2.0, 3.0])),
+        }
+    )
+    preliminary.aggregate()
+    provider.configure(preliminary)
+    hmins = decode_array(provider.client_input_data()["hmins"])
+    np.testing.assert_equal(hmins, [[-3, -1, -2]])
+
+    hrange = [(-3, 3), (-1, 1), (-2, 2)]
+    for part in np.array_split(data, 2):
+        counts, edges = np.histogramdd(
+            part[:, [2, 0, 1]], bins=4, range=hrange
+        )
+        [indices] = np.nonzero(counts.ravel())
+        provider.add_client_data(
+            {
+                "indices": _numpy_to_scalar(indices),
+                "counts": _numpy_to_scalar(counts.ravel()[indices]),
+                "bins": _numpy_to_scalar(np.array([edges])),
+            }
+        )
+    provider.aggregate()
+
+    expected, _ = np.histogramdd(data[:, [2, 0, 1]], bins=4, range=hrange)
+    np.testing.assert_equal(provider._result[0], expected.sum(axis=2))
+    metadata = json.loads(provider.result_metadata_json())
+    assert "marginal" in metadata["outputs"][0]["source"]
@@ -0,0 +1,90 @@
+import argparse
+import io
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_server.fedhist import HistogramProvider
+from flwr_analytics_server.range import RangeProvider
+from flwr_analytics_server.sketch import QuantileSketch, sketch_values
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def test_range() -> None:
+    provider = RangeProvider()
+    provider.add_client_data(
+        {
+            "minimums": _numpy_to_scalar(np.array([1.0, np.inf])),
+            "maximums": _numpy_to_scalar(np.array([2.0, -np.inf])),
+        }
+    )
+    provider.add_client_data(
+        {
+            "minimums": _numpy_to_scalar(np.array([-1.0, np.inf])),
+            "maximums": _numpy_to_scalar(np.array([1.5, -np.inf])),
+        }
+    )
+    provider.aggregate()
+
+    # The second feature has no values.
+    assert provider.ranges() == [(-1.0, 2.0), (0.0, 0.0)]
+    assert provider.total_range() == (-1.0, 2.0)
+
+
+def test_configure_histogram() -> None:
+    histogram = HistogramProvider()
+    args = argparse.Namespace(
+        nbins=10,
+        hmin=[float("nan")],
+        hmax=[float("nan")],
+        per_feature=True,
+        range_percentile=0.0,
+        features=[3, 5],
+        sample_fraction=None,
+        sample_rows=None,
+    )
+    histogram.set_arguments(args)
+
+    preliminary = histogram.preliminary()
+    assert isinstance(preliminary, RangeProvider)
+    preliminary.add_client_data(
+        {
+            "minimums": _numpy_to_scalar(np.array([0.0, -3.0])),
+            "maximums": _numpy_to_scalar(np.array([1.0, 3.0])),
+        }
+    )
+    preliminary.aggregate()
+    histogram.configure(preliminary)
+
+    assert histogram.feature_ranges == [(0.0, 1.0), (-3.0, 3.0)]
+    assert "features" in preliminary.client_input_data()
+    assert "features" in histogram.client_input_data()
+
+
+def test_range_percentile() -> None:
+    data = np.linspace(0, 100, 10_001)
+    sketch = QuantileSketch(k=200, seed=42)
+    sketch.update(data)
+    values = sketch_values([sketch])
+
+    provider = RangeProvider()
+    provider.percentile = 1.0
+    provider.add_client_data(
+        {
+            "k": values["k"],
+            **{
+                key: _numpy_to_scalar(values[key])
+                for key in ["items", "sizes", "minimums", "maximums"]
+            },
+        }
+    )
+    provider.aggregate()
+
+    np.testing.assert_allclose(provider.ranges(), [(1.0, 99.0)], atol=1.0)
+    assert provider.client_input_data() == {"k": 200}
@@ -0,0 +1,128 @@
+import argparse
+import io
+import json
+
+import numpy as np
+import pytest
+from flwr.common import Properties, Scalar
+
+from flwr_analytics_server.batch import BatchProvider
+from flwr_analytics_server.correlation import (
+    CorrelationProvider,
+    pack_triangle,
+)
+from flwr_analytics_server.regression import RegressionProvider
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def _client_data(data: np.ndarray) -> Properties:
+    return {
+        "features": data.shape[1],
+        "entries": data.shape[0],
+        "sums": _numpy_to_scalar(np.sum(data, axis=0)),
+        "variances": _numpy_to_scalar(np.var(data, axis=0)),
+        "multiply_sums": _numpy_to_scalar(pack_triangle(data.T @ data)),
+    }
+
+
+def _provider(args: list) -> RegressionProvider:
+    provider = RegressionProvider()
+    parser = argparse.ArgumentParser()
+    provider.add_arguments(parser)
+    provider.set_arguments(parser.parse_args(args))
+
+    return provider
+
+
+def _data() -> np.ndarray:
+    rng = np.random.default_rng(4242)
+    x = rng.normal(loc=10.0, size=(500, 3))
+    y = 5.0 + x @ [2.0, -3.0, 0.5] + rng.normal(scale=0.1, size=500)
+
+    # The target is the second column.
+    return np.column_stack([x[:, 0], y, x[:, 1:]])
+
+
+def test_regression() -> None:
+    data = _data()
+    provider = _provider(["--target", "1"])
+    assert provider.name == "regression"
+    assert provider.client_input_data() == {"packed": True}
+
+    for part in np.array_split(data, 3):
+        provider.add_client_data(_client_data(part))
+    provider.aggregate()
+
+    x = np.column_stack([np.ones(len(data)), data[:, [0, 2, 3]]])
+    expected, *_ = np.linalg.lstsq(x, data[:, 1], rcond=None)
+    result = provider._regression
+    np.testing.assert_allclose(result.intercept, expected[0], rtol=1e-6)
+    np.testing.assert_allclose(result.coefficients, expected[1:], rtol=1e-6)
+    assert result.r_squared > 0.99
+
+    metadata = json.loads(provider.result_metadata_json())
+    source = metadata["outputs"][0]["source"]
+    assert "Feature 1 fitted on 500 rows" in source
+    assert "| 3 |" in source
+
+
+def test_regression_ridge() -> None:
+    data = _data()
+    provider = _provider(["--target", "1", "--ridge", "100"])
+    provider.add_client_data(_client_data(data))
+    provider.aggregate()
+
+    centered = data - data.mean(axis=0)
+    x, y = centered[:, [0, 2, 3]], centered[:, 1]
+    expected = np.linalg.solve(x.T @ x + 100 * np.eye(3), x.T @ y)
+    np.testing.assert_allclose(
+        provider._regression.coefficients, expected, rtol=1e-6
+    )
+
+
+def test_regression_features() -> None:
+    data = _data()
+    provider = _provider(["--target", "1", "--features", "1", "0"])
+    provider.add_client_data(_client_data(data[:, [1, 0]]))
+    provider.aggregate()
+
+    assert provider._labels == ["0"]
+    expected = np.polyfit(data[:, 0], data[:, 1], 1)
+    np.testing.assert_allclose(
+        provider._regression.coefficients, expected[:1], rtol=1e-6
+    )
+
+
+def test_regression_batch() -> None:
+    data = _data()
+    correlation = CorrelationProvider()
+    regression = _provider(["--target", "1"])
+    provider = BatchProvider([correlation, regression])
+
+    properties = _client_data(data)
+    provider.add_client_data(
+        {
+            f"{name}/{key}": value
+            for name in ["correlation", "regression"]
+            for key, value in properties.items()
+        }
+    )
+    provider.aggregate()
+
+    assert correlation._accumulator is not None
+    assert correlation._accumulator.num_entries == 500
+    assert regression._regression.r_squared > 0.99
+
+
+def test_regression_arguments() -> None:
+    # Sampled fits would come without intervals of the coefficients.
+    with pytest.raises(SystemExit):
+        _provider(["--target", "1", "--sample-fraction", "0.1"])
+    with pytest.raises(SystemExit):
+        _provider(["--target", "1", "--confidence", "0.9"])
@@ -0,0 +1,372 @@
+import io
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
+from flwr.common import (
+    Code,
+    DisconnectRes,
+    GetPropertiesIns,
+    GetPropertiesRes,
+    Properties,
+    ReconnectIns,
+    Scalar,
+    Status,
+)
+
+from flwr_analytics_server.codec import CODEC_VERSION, encode_array
+from flwr_analytics_server.fanout import FanOut
+from flwr_analytics_server.fedhist import HistogramProvider
+from flwr_analytics_server.server import AnalyticsServer
+from flwr_analytics_server.window import WindowProvider
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+class FakeClientProxy:
+    def __init__(
+        self,
+        cid: str,
+        properties: Properties,
+        release: Optional[threading.Event] = None,
+    ) -> None:
+        self.cid = cid
+        self.properties = properties
+        self.release = release
+        self.requests: List[GetPropertiesIns] = []
+
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        self.requests.append(ins)
+        if self.release is not None:
+            self.release.wait()
+        return GetPropertiesRes(
+            status=Status(Code.OK, "OK"), properties=self.properties
+        )
+
+    def reconnect(
+        self, ins: ReconnectIns, timeout: Optional[float]
+    ) -> DisconnectRes:
+        return DisconnectRes(reason="")
+
+
+class FakeClientManager:
+    def __init__(self, clients: List[FakeClientProxy]) -> None:
+        self.clients = clients
+
+    def wait_for(self, num_clients: int, timeout: int) -> bool:
+        return len(self.clients) >= num_clients
+
+    def all(self) -> Dict[str, FakeClientProxy]:
+        return {c.cid: c for c in self.clients}
+
+
+def _histogram_properties(data: np.ndarray) -> Properties:
+    counts, bins = np.histogram(data, bins=4, range=(0, 1))
+    return {
+        "counts": _numpy_to_scalar(counts),
+        "bins": _numpy_to_scalar(bins),
+    }
+
+
+class RecordingHistogramProvider(HistogramProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.added = threading.Event()
+
+    def add_client_data(self, properties: Properties) -> None:
+        super().add_client_data(properties)
+        self.added.set()
+
+
+def test_aggregate_before_all_clients_answered() -> None:
+    data = np.linspace(0, 1, 100)
+    release = threading.Event()
+    provider = RecordingHistogramProvider()
+    slow_client = FakeClientProxy("slow", _histogram_properties(data), release)
+    fast_client = FakeClientProxy("fast", _histogram_properties(data))
+
+    aggregated_early: List[bool] = []
+
+    # The slow client only answers once the fast one has been aggregated.
+    def release_slow_client() -> None:
+        aggregated_early.append(provider.added.wait(timeout=5))
+        release.set()
+
+    releaser = threading.Thread(target=release_slow_client)
+    releaser.start()
+
+    server = AnalyticsServer(
+        client_manager=FakeClientManager([slow_client, fast_client]),
+        min_available_clients=2,
+        provider=provider,
+    )
+    server.fit(num_rounds=1, timeout=None)
+    releaser.join()
+
+    assert aggregated_early == [True]
+    np.testing.assert_equal(
+        provider._result.counts, 2 * np.histogram(data, 4, (0, 1))[0]
+    )
+    assert fast_client.requests[0].config["provider"] == "histogram"
+
+
+def test_request_codec() -> None:
+    data = np.linspace(0, 1, 100)
+    counts, bins = np.histogram(data, bins=4, range=(0, 1))
+    client = FakeClientProxy(
+        "client",
+        {
+            "counts": encode_array(counts, compression="zlib"),
+            "bins": encode_array(bins),
+        },
+    )
+    provider = HistogramProvider()
+
+    server = AnalyticsServer(
+        client_manager=FakeClientManager([client]),
+        min_available_clients=1,
+        provider=provider,
+        compression="zlib",
+        float32=True,
+    )
+    server.fit(num_rounds=1, timeout=None)
+
+    config = client.requests[0].config
+    assert config["codec"] == CODEC_VERSION
+    assert config["codec_compression"] == "zlib"
+    assert config["codec_float32"] is True
+    np.testing.assert_equal(provider._result.counts, counts)
+    np.testing.assert_equal(provider._result.bins, bins)
+
+
+class DataClientProxy(FakeClientProxy):
+    """Client answering range and histogram requests about its 'data'."""
+
+    def __init__(self, cid: str, data: np.ndarray) -> None:
+        super().__init__(cid, {})
+        self.data = data
+
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        self.requests.append(ins)
+        if ins.config["provider"] == "range":
+            properties = {
+                "minimums": _numpy_to_scalar(self.data.min(keepdims=True)),
+                "maximums": _numpy_to_scalar(self.data.max(keepdims=True)),
+            }
+        else:
+            counts, bins = np.histogram(
+                self.data,
+                bins=int(ins.config["nbins"]),
+                range=(float(ins.config["hmin"]), float(ins.config["hmax"])),
+            )
+            properties = {
+                "counts": _numpy_to_scalar(counts),
+                "bins": _numpy_to_scalar(bins),
+            }
+        return GetPropertiesRes(
+            status=Status(Code.OK, "OK"), properties=properties
+        )
+
+
+def test_auto_range() -> None:
+    clients = [
+        DataClientProxy("low", np.linspace(-5, 1, 50)),
+        DataClientProxy("high", np.linspace(0, 7, 50)),
+    ]
+    provider = HistogramProvider()
+    provider.nbins = 4
+    provider.auto_range = True
+
+    server = AnalyticsServer(
+        client_manager=FakeClientManager(clients),
+        min_available_clients=2,
+        provider=provider,
+    )
+    server.fit(num_rounds=1, timeout=None)
+
+    assert [ins.config["provider"] for ins in clients[0].requests] == [
+        "range",
+        "histogram",
+    ]
+    assert clients[0].requests[1].config["hmin"] == -5.0
+    assert clients[0].requests[1].config["hmax"] == 7.0
+    np.testing.assert_equal(provider._result.bins, [-5, -2, 1, 4, 7])
+    assert provider._result.counts.sum() == 100
+    assert sorted(server.participating_clients) == ["high", "low"]
+
+
+class FailingClientProxy(FakeClientProxy):
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        raise RuntimeError("connection lost")
+
+
+def test_drop_stragglers() -> None:
+    data = np.linspace(0, 1, 100)
+    release = threading.Event()
+    provider = HistogramProvider()
+    clients = [
+        FakeClientProxy("fast", _histogram_properties(data)),
+        FakeClientProxy("straggler", _histogram_properties(data), release),
+        FailingClientProxy("failing", _histogram_properties(data)),
+    ]
+
+    server = AnalyticsServer(
+        client_manager=FakeClientManager(clients),
+        min_available_clients=3,
+        provider=provider,
+        request_timeout=0.5,
+        min_quorum=0.3,
+    )
+    try:
+        server.fit(num_rounds=1, timeout=None)
+    finally:
+        release.set()
+
+    assert server.participating_clients == ["fast"]
+    assert sorted(server.dropped_clients) == ["failing", "straggler"]
+    np.testing.assert_equal(
+        provider._result.counts, np.histogram(data, 4, (0, 1))[0]
+    )
+
+    metadata = json.loads(
+        server.result_metadata_json('{"version": 1, "outputs": []}')
+    )
+    assert "`straggler`" in metadata["outputs"][0]["source"]
+
+
+def test_quorum_not_reached() -> None:
+    data = np.linspace(0, 1, 100)
+    server = AnalyticsServer(
+        client_manager=FakeClientManager(
+            [
+                FakeClientProxy("ok", _histogram_properties(data)),
+                FailingClientProxy("failing", _histogram_properties(data)),
+            ]
+        ),
+        min_available_clients=2,
+        provider=HistogramProvider(),
+        min_quorum=1.0,
+    )
+
+    with pytest.raises(RuntimeError):
+        server.fit(num_rounds=1, timeout=None)
+
+
+class ErrorStatusClientProxy(FakeClientProxy):
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        return GetPropertiesRes(
+            status=Status(Code.GET_PROPERTIES_NOT_IMPLEMENTED, "Unsupported"),
+            properties={},
+        )
+
+
+def test_drop_clients_answering_errors() -> None:
+    data = np.linspace(0, 1, 100)
+    provider = HistogramProvider()
+    clients = [
+        FakeClientProxy("ok", _histogram_properties(data)),
+        ErrorStatusClientProxy("unsupported", {}),
+        FakeClientProxy("invalid", {"counts": b"invalid"}),
+    ]
+
+    server = AnalyticsServer(
+        client_manager=FakeClientManager(clients),
+        min_available_clients=3,
+        provider=provider,
+        min_quorum=0.3,
+    )
+    server.fit(num_rounds=1, timeout=None)
+
+    assert server.participating_clients == ["ok"]
+    assert sorted(server.dropped_clients) == ["invalid", "unsupported"]
+    np.testing.assert_equal(
+        provider._result.counts, np.histogram(data, 4, (0, 1))[0]
+    )
+
+
+class SlowClientProxy(FakeClientProxy):
+    def get_properties(
+        self, ins: GetPropertiesIns, timeout: Optional[float]
+    ) -> GetPropertiesRes:
+        time.sleep(0.6)
+        return super().get_properties(ins, timeout)
+
+
+def test_deadline_starts_with_the_call() -> None:
+    data = np.linspace(0, 1, 100)
+    provider = HistogramProvider()
+    clients = [
+        SlowClientProxy(f"c{i}", _histogram_properties(data)) for i in range(6)
+    ]
+    fanout = FanOut(max_concurrency=2)
+
+    # Queued calls take 1.8s in total, but every call takes less than 1s.
+    server = AnalyticsServer(
+        client_manager=FakeClientManager(clients),
+        min_available_clients=6,
+        provider=provider,
+        request_timeout=1.0,
+        min_quorum=1.0,
+        fanout=fanout,
+    )
+    try:
+        server.fit(num_rounds=1, timeout=None)
+    finally:
+        fanout.shutdown()
+
+    assert sorted(server.participating_clients) == [f"c{i}" for i in range(6)]
+    assert server.dropped_clients == []
+    np.testing.assert_equal(
+        provider._result.counts, 6 * np.histogram(data, 4, (0, 1))[0]
+    )
+
+
+def test_drop_clients_without_buckets() -> None:
+    data = np.linspace(0, 1, 100)
+    properties = _histogram_properties(data)
+    histogram = HistogramProvider()
+    histogram.nbins = 4
+    histogram.hrange = (0.0, 1.0)
+    provider = WindowProvider(
+        histogram, window_seconds=3600, bucket_seconds=3600, window_end=3600
+    )
+    clients = [
+        FakeClientProxy(
+            "windowed",
+            {
+                "buckets": _numpy_to_scalar(np.array([0.0])),
+                **{f"0/{key}": value for key, value in properties.items()},
+            },
+        ),
+        # Clients ignoring the window answer with all of their rows.
+        FakeClientProxy("unwindowed", properties),
+    ]
+
+    server = AnalyticsServer(
+        client_manager=FakeClientManager(clients),
+        min_available_clients=2,
+        provider=provider,
+    )
+    server.fit(num_rounds=1, timeout=None)
+
+    assert server.participating_clients == ["windowed"]
+    assert server.dropped_clients == ["unwindowed"]
+    np.testing.assert_equal(
+        histogram._result.counts, np.histogram(data, 4, (0, 1))[0]
+    )
@@ -0,0 +1,112 @@
+import io
+
+import numpy as np
+from flwr.common import Scalar
+
+from flwr_analytics_server.batch import BatchProvider
+from flwr_analytics_server.fedhist import HistogramProvider
+from flwr_analytics_server.joint import JointHistogramProvider
+from flwr_analytics_server.window import WindowProvider
+
+
+def _numpy_to_scalar(input: np.ndarray) -> Scalar:
+    buf = io.BytesIO()
+    np.save(buf, input)
+
+    return buf.getvalue()
+
+
+def test_window_provider() -> None:
+    histogram = HistogramProvider()
+    histogram.nbins = 2
+    histogram.hrange = (0.0, 1.0)
+    provider = WindowProvider(
+        histogram, window_seconds=7200, bucket_seconds=3600, window_end=1e4
+    )
+
+    config = provider.client_input_data()
+    assert config["window_seconds"] == 7200
+    assert config["nbins"] == 2
+
+    bins = _numpy_to_scalar(np.array([0.0, 0.5, 1.0]))
+    provider.add_client_data(
+        {
+            # The first bucket is older than the window.
+            "buckets": _numpy_to_scalar(np.array([0.0, 3600.0, 7200.0])),
+            "0/counts": _numpy_to_scalar(np.array([100, 100])),
+            "0/bins": bins,
+            "1/counts": _numpy_to_scalar(np.array([1, 2])),
+            "1/bins": bins,
+            "2/counts": _numpy_to_scalar(np.array([3, 0])),
+            "2/bins": bins,
+        }
+    )
+    provider.add_client_data(
+        {
+            "buckets": _numpy_to_scalar(np.array([7200.0])),
+            "0/counts": _numpy_to_scalar(np.array([0, 5])),
+            "0/bins": bins,
+        }
+    )
+    provider.aggregate()
+
+    np.testing.assert_equal(histogram._result.counts, [4, 7])
+    assert "2 buckets" in provider.result_metadata_json()
+
+
+def _range_properties(minimums: list, maximums: list) -> dict:
+    return {
+        "buckets": _numpy_to_scalar(np.array([3600.0])),
+        "0/minimums": _numpy_to_scalar(np.array(minimums)),
+        "0/maximums": _numpy_to_scalar(np.array(maximums)),
+    }
+
+
+def test_window_preliminary() -> None:
+    histogram = HistogramProvider()
+    histogram.nbins = 2
+    histogram.auto_range = True
+    provider = WindowProvider(
+        histogram, window_seconds=3600, bucket_seconds=3600
+    )
+
+    # Ranges are those of the rows of the window.
+    preliminary = provider.preliminary()
+    assert isinstance(preliminary, WindowProvider)
+    config = preliminary.client_input_data()
+    assert config["window_seconds"] == 3600
+
+    preliminary.window_end = 7200
+    preliminary.add_client_data(_range_properties([1.0], [3.0]))
+    preliminary.aggregate()
+    provider.configure(preliminary)
+
+    assert histogram.hrange == (1.0, 3.0)
+    assert provider.window_end == 7200
+
+
+def test_batched_window_preliminaries() -> None:
+    histogram = HistogramProvider()
+    histogram.auto_range = True
+    histogram.per_feature = True
+    histogram.features = [0]
+    joint = JointHistogramProvider()
+    joint.auto_range = True
+    joint.groups = [[0, 1]]
+    windows = [
+        WindowProvider(p, window_seconds=3600, bucket_seconds=3600)
+        for p in [histogram, joint]
+    ]
+    batch = BatchProvider(windows)
+
+    preliminary = batch.preliminary()
+    assert isinstance(preliminary, WindowProvider)
+
+    preliminary.window_end = 7200
+    preliminary.add_client_data(_range_properties([1.0, 0.0], [3.0, 5.0]))
+    preliminary.aggregate()
+    batch.configure(preliminary)
+
+    assert histogram.feature_ranges == [(1.0, 3.0)]
+    assert joint.axis_ranges == [(1.0, 3.0), (0.0, 5.0)]
+    assert [w.window_end for w in windows] == [7200, 7200]
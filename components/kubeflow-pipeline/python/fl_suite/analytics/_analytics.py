@@ -23,17 +23,32 @@ from kfp.dsl import ContainerOp
 from .._version import __version__
 
 
+DataSource = Union[np.ndarray, Iterable[np.ndarray]]
+
+# Defaults of the round options of the analytics server. The round starts once the minimal
+# number of clients connected or after the connection timeout. Clients that don't answer
+# within the request timeout are dropped. The round fails unless at least the minimal quorum
+# fraction of the minimal number of clients answered. A request timeout of 0 waits for all
+# clients, like the analytics server does by default.
+DEFAULT_CONNECTION_TIMEOUT = 86400.0
+DEFAULT_REQUEST_TIMEOUT = 0.0
+DEFAULT_MIN_QUORUM = 0.0
+
+
 def data(
     packages: Optional[Iterable[str]] = None,
-) -> Callable[[Callable[[], np.ndarray]], Callable[[str, bool], ContainerOp]]:
+) -> Callable[[Callable[[], DataSource]], Callable[[str, bool], ContainerOp]]:
     """Decorator for an analytics data provider.
 
     The data provided by this function is used to calculate federated correlation.
-    On the client, certain properties of this data is extracted and sent to the server."""
+    On the client, certain properties of this data is extracted and sent to the server.
+    The function either returns the whole dataset as an array or an iterable of row chunks,
+    e.g. a generator. Chunks are streamed on every request, which keeps the memory usage of
+    the client bounded for datasets larger than its memory."""
     if packages is None:
         packages = []
 
-    def _wrapped(func: Callable[[], np.ndarray]) -> Callable[[str, bool], ContainerOp]:
+    def _wrapped(func: Callable[[], DataSource]) -> Callable[[str, bool], ContainerOp]:
         func_code = textwrap.dedent(inspect.getsource(func))
 
         func_code_lines = func_code.split("\n")
@@ -45,10 +60,7 @@ def data(
         )
 
         func_code = textwrap.dedent("\n".join(func_code_lines[1:]))
-        func_code = (
-            "import numpy as np\n\n"
-            f"def data() -> np.ndarray:\n{textwrap.indent(func_code, '    ')}"
-        )
+        func_code = f"import numpy as np\n\ndef data():\n{textwrap.indent(func_code, '    ')}"
 
         @wraps(func)
         def _inner(registry: str, verify_registry_tls: bool) -> ContainerOp:
@@ -129,6 +141,9 @@ def analytics_server_spec(
 
     inputs = [
         InputSpec("min_available_clients", type="Integer"),
+        InputSpec("connection_timeout", type="Float"),
+        InputSpec("request_timeout", type="Float"),
+        InputSpec("min_quorum", type="Float"),
     ]
 
     command = [
@@ -137,6 +152,12 @@ def analytics_server_spec(
         "flwr_analytics_server",
         "--min-available-clients",
         InputValuePlaceholder("min_available_clients"),
+        "--connection-timeout",
+        InputValuePlaceholder("connection_timeout"),
+        "--request-timeout",
+        InputValuePlaceholder("request_timeout"),
+        "--min-quorum",
+        InputValuePlaceholder("min_quorum"),
         "--metadata-output-path",
         OutputPathPlaceholder("MLPipeline_ui_metadata"),
         subcommand,
@@ -1,3 +1,4 @@
+import math
 from typing import Callable, Optional, Tuple
 
 from kfp import Client
@@ -13,21 +14,36 @@ from ..pipelines import (
     create_image_tag,
     setup_kubernetes_resources,
 )
-from ._analytics import Parameter, analytics_server_spec
+from ._analytics import (
+    DEFAULT_CONNECTION_TIMEOUT,
+    DEFAULT_MIN_QUORUM,
+    DEFAULT_REQUEST_TIMEOUT,
+    Parameter,
+    analytics_server_spec,
+)
 
 
 # pylint: disable-next=too-many-arguments
 def boxplot(
     data_func: Callable[[str, bool], ContainerOp],
     nbins: int,
-    hrange: Tuple[float, float],
+    hrange: Optional[Tuple[float, float]] = None,
     min_available_clients: int = 2,
+    connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    min_quorum: float = DEFAULT_MIN_QUORUM,
     host: Optional[str] = None,
     experiment_name: Optional[str] = None,
     registry: str = "ghcr.io/katulu-io/fl-suite",
     verify_registry_tls: bool = True,
+    method: str = "sketch",
 ) -> None:
-    """Run distributed boxplot of data provided by multiple clients."""
+    """Run distributed boxplot of data provided by multiple clients.
+
+    With the "sketch" method, the quartiles of every feature are estimated from mergeable
+    quantile sketches and 'nbins' and 'hrange' are not used. With the "histogram" method,
+    a single box of all values is estimated from a histogram with 'nbins' bins in 'hrange'.
+    Without 'hrange', the range of the histogram is collected from the clients first."""
     analytics_server = f"{registry}/analytics-server:{__version__}"
 
     client = Client(host)
@@ -40,9 +56,13 @@ def boxplot(
         ),
         arguments={
             "min_available_clients": min_available_clients,
+            "connection_timeout": connection_timeout,
+            "request_timeout": request_timeout,
+            "min_quorum": min_quorum,
             "nbins": nbins,
-            "hmin": hrange[0],
-            "hmax": hrange[1],
+            "hmin": hrange[0] if hrange is not None else math.nan,
+            "hmax": hrange[1] if hrange is not None else math.nan,
+            "method": method,
         },
         experiment_name=experiment_name,
     )
@@ -56,14 +76,23 @@ def boxplot(
 def boxplot_server(
     server_image: str,
     min_available_clients: int,
+    connection_timeout: float,
+    request_timeout: float,
+    min_quorum: float,
     nbins: int,
     hrange: Tuple[float, float],
+    method: str,
 ) -> ContainerOp:
     """Component to run a Flower server for federated boxplot."""
     spec = analytics_server_spec(
         server_image=server_image,
         subcommand="boxplot",
         parameters=[
+            Parameter(
+                InputSpec("method", type="String"),
+                "--method",
+                InputValuePlaceholder("method"),
+            ),
             Parameter(
                 InputSpec("nbins", type="Integer"),
                 "--nbins",
@@ -85,6 +114,10 @@ def boxplot_server(
     # pylint: disable-next=not-callable
     analytics_server_op: ContainerOp = component(
         min_available_clients,
+        connection_timeout,
+        request_timeout,
+        min_quorum,
+        method,
         nbins,
         hrange[0],
         hrange[1],
@@ -106,9 +139,13 @@ def boxplot_pipeline(
     @pipeline(name="boxplot")
     def h_pipeline(
         min_available_clients: int,
+        connection_timeout: float,
+        request_timeout: float,
+        min_quorum: float,
         nbins: int,
         hmin: float,
         hmax: float,
+        method: str,
         image_tag: str = create_image_tag("boxplot-client"),
     ) -> None:
         with ExitHandler(cleanup_kubernetes_resources()):
@@ -122,7 +159,14 @@ def boxplot_pipeline(
 
             setup_kubernetes_resources_op = setup_kubernetes_resources()
             analytics_server_op = boxplot_server(
-                fl_server_image, min_available_clients, nbins, (hmin, hmax)
+                fl_server_image,
+                min_available_clients,
+                connection_timeout,
+                request_timeout,
+                min_quorum,
+                nbins,
+                (hmin, hmax),
+                method,
             )
             analytics_server_op.after(setup_kubernetes_resources_op)
 
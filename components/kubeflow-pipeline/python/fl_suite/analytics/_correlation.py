@@ -12,13 +12,21 @@ from ..pipelines import (
     create_image_tag,
     setup_kubernetes_resources,
 )
-from ._analytics import analytics_server_spec
+from ._analytics import (
+    DEFAULT_CONNECTION_TIMEOUT,
+    DEFAULT_MIN_QUORUM,
+    DEFAULT_REQUEST_TIMEOUT,
+    analytics_server_spec,
+)
 
 
 # pylint: disable-next=too-many-arguments
 def correlate(
     data_func: Callable[[str, bool], ContainerOp],
     min_available_clients: int = 2,
+    connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    min_quorum: float = DEFAULT_MIN_QUORUM,
     host: Optional[str] = None,
     experiment_name: Optional[str] = None,
     registry: str = "ghcr.io/katulu-io/fl-suite",
@@ -37,6 +45,9 @@ def correlate(
         ),
         arguments={
             "min_available_clients": min_available_clients,
+            "connection_timeout": connection_timeout,
+            "request_timeout": request_timeout,
+            "min_quorum": min_quorum,
         },
         experiment_name=experiment_name,
     )
@@ -50,6 +61,9 @@ def correlate(
 def correlation_server(
     server_image: str,
     min_available_clients: int,
+    connection_timeout: float,
+    request_timeout: float,
+    min_quorum: float,
 ) -> ContainerOp:
     """Component to run a Flower server for federated correlation."""
     spec = analytics_server_spec(
@@ -60,6 +74,9 @@ def correlation_server(
     # pylint: disable-next=not-callable
     analytics_server_op: ContainerOp = component(
         min_available_clients,
+        connection_timeout,
+        request_timeout,
+        min_quorum,
     )
     analytics_server_op.enable_caching = False
     add_envoy_proxy(analytics_server_op)
@@ -78,6 +95,9 @@ def correlation_pipeline(
     @pipeline()
     def correlation(
         min_available_clients: int,
+        connection_timeout: float,
+        request_timeout: float,
+        min_quorum: float,
         image_tag: str = create_image_tag("correlation-client"),
     ) -> None:
         with ExitHandler(cleanup_kubernetes_resources()):
@@ -93,6 +113,9 @@ def correlation_pipeline(
             analytics_server_op = correlation_server(
                 fl_server_image,
                 min_available_clients,
+                connection_timeout,
+                request_timeout,
+                min_quorum,
             )
             analytics_server_op.after(setup_kubernetes_resources_op)
 
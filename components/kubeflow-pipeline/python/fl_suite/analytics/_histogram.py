@@ -1,3 +1,4 @@
+import math
 from typing import Callable, Optional, Tuple
 
 from kfp import Client
@@ -13,21 +14,36 @@ from ..pipelines import (
     create_image_tag,
     setup_kubernetes_resources,
 )
-from ._analytics import Parameter, analytics_server_spec
+from ._analytics import (
+    DEFAULT_CONNECTION_TIMEOUT,
+    DEFAULT_MIN_QUORUM,
+    DEFAULT_REQUEST_TIMEOUT,
+    Parameter,
+    analytics_server_spec,
+)
 
 
 # pylint: disable-next=too-many-arguments
 def histogram(
     data_func: Callable[[str, bool], ContainerOp],
     nbins: int,
-    hrange: Tuple[float, float],
+    hrange: Optional[Tuple[float, float]] = None,
     min_available_clients: int = 2,
+    connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    min_quorum: float = DEFAULT_MIN_QUORUM,
     host: Optional[str] = None,
     experiment_name: Optional[str] = None,
     registry: str = "ghcr.io/katulu-io/fl-suite",
     verify_registry_tls: bool = True,
+    per_feature: bool = False,
 ) -> None:
-    """Run distributed histogram of data provided by multiple clients."""
+    """Run distributed histogram of data provided by multiple clients.
+
+    By default, a single histogram of all values is computed. With 'per_feature', every
+    feature, i.e. every column of the data, gets its own histogram in 'hrange'. Without
+    'hrange', a preliminary round collects the minimum and maximum of every feature from the
+    clients and the bins span the data, per feature with 'per_feature'."""
     analytics_server = f"{registry}/analytics-server:{__version__}"
 
     client = Client(host)
@@ -40,9 +56,13 @@ def histogram(
         ),
         arguments={
             "min_available_clients": min_available_clients,
+            "connection_timeout": connection_timeout,
+            "request_timeout": request_timeout,
+            "min_quorum": min_quorum,
             "nbins": nbins,
-            "hmin": hrange[0],
-            "hmax": hrange[1],
+            "hmin": hrange[0] if hrange is not None else math.nan,
+            "hmax": hrange[1] if hrange is not None else math.nan,
+            "per_feature": per_feature,
         },
         experiment_name=experiment_name,
     )
@@ -56,8 +76,12 @@ def histogram(
 def histogram_server(
     server_image: str,
     min_available_clients: int,
+    connection_timeout: float,
+    request_timeout: float,
+    min_quorum: float,
     nbins: int,
     hrange: Tuple[float, float],
+    per_feature: bool = False,
 ) -> ContainerOp:
     """Component to run a Flower server for federated histogram."""
     spec = analytics_server_spec(
@@ -79,15 +103,24 @@ def histogram_server(
                 "--hmax",
                 InputValuePlaceholder("hmax"),
             ),
+            Parameter(
+                InputSpec("per_feature", type="Boolean"),
+                "--per-feature",
+                InputValuePlaceholder("per_feature"),
+            ),
         ],
     )
     component = load_component(component_spec=spec)
     # pylint: disable-next=not-callable
     analytics_server_op: ContainerOp = component(
         min_available_clients,
+        connection_timeout,
+        request_timeout,
+        min_quorum,
         nbins,
         hrange[0],
         hrange[1],
+        per_feature,
     )
     analytics_server_op.enable_caching = False
     add_envoy_proxy(analytics_server_op)
@@ -106,9 +139,13 @@ def histogram_pipeline(
     @pipeline(name="histogram")
     def h_pipeline(
         min_available_clients: int,
+        connection_timeout: float,
+        request_timeout: float,
+        min_quorum: float,
         nbins: int,
         hmin: float,
         hmax: float,
+        per_feature: bool = False,
         image_tag: str = create_image_tag("histogram-client"),
     ) -> None:
         with ExitHandler(cleanup_kubernetes_resources()):
@@ -122,7 +159,14 @@ def histogram_pipeline(
 
             setup_kubernetes_resources_op = setup_kubernetes_resources()
             analytics_server_op = histogram_server(
-                fl_server_image, min_available_clients, nbins, (hmin, hmax)
+                fl_server_image,
+                min_available_clients,
+                connection_timeout,
+                request_timeout,
+                min_quorum,
+                nbins,
+                (hmin, hmax),
+                per_feature,
             )
             analytics_server_op.after(setup_kubernetes_resources_op)
 
@@ -165,7 +165,12 @@ def test_correlation_pipeline():
     assert_task_is_setup(
         dag,
         "flower-server",
-        parameters={"min_available_clients": "{{inputs.parameters.min_available_clients}}"},
+        parameters={
+            "connection_timeout": "{{inputs.parameters.connection_timeout}}",
+            "min_available_clients": "{{inputs.parameters.min_available_clients}}",
+            "min_quorum": "{{inputs.parameters.min_quorum}}",
+            "request_timeout": "{{inputs.parameters.request_timeout}}",
+        },
         dependencies=["setup-flower-server-infrastructure"],
     )
     assert_task_is_setup(dag, "setup-flower-server-infrastructure")